@@ -5,7 +5,7 @@ Centralized configuration management using Pydantic Settings
 from functools import lru_cache
 from typing import Literal, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field
+from pydantic import Field, model_validator
 
 
 class Settings(BaseSettings):
@@ -64,20 +64,73 @@ class Settings(BaseSettings):
     embedding_model: str = "BAAI/bge-small-zh-v1.5"  # Lightweight model for low-memory servers (~100MB)
     openai_embedding_model: str = "text-embedding-3-small"
     ollama_embedding_model: str = "bge-m3"
+    ollama_embedding_batch_size: int = 32  # Texts per /api/embed request
+    ollama_embedding_concurrency: int = 4  # Max concurrent embedding requests
+    
+    # Embedding Cache (content-addressed, keyed by model + normalized text hash)
+    embedding_cache_enabled: bool = True
+    embedding_cache_memory_size: int = 10000
+    embedding_cache_path: Optional[str] = "./data/embedding_cache.db"  # Empty = memory only
+    
+    # Embedding Micro-Batching (coalesces concurrent query embeddings)
+    embedding_micro_batch_enabled: bool = True
+    embedding_micro_batch_max_size: int = 32
+    embedding_micro_batch_max_wait_ms: float = 5.0
+    
+    # Local Embedding Inference (dedicated executor)
+    embedding_inference_workers: int = 1
+    embedding_torch_threads: int = 0  # 0 = CPU cores / inference workers
+    embedding_inference_process: bool = False  # Run the model in worker processes (GIL isolation)
     
     # Vector Store
     chroma_persist_directory: str = "./data/chroma"
     chroma_collection_name: str = "knowledge_base"
+    chroma_host: Optional[str] = None  # Chroma server (client/server mode); required by the arq backend
+    chroma_port: int = 8000
+    
+    # Keyword Index (BM25 for hybrid search)
+    bm25_index_path: Optional[str] = "./data/bm25_index.db"  # Empty = disabled
+    hybrid_rrf_k: int = 60
+    
+    # Retrieval Result Cache (cleared on every index write; off with the arq queue backend)
+    query_cache_enabled: bool = True
+    query_cache_max_size: int = 1000
+    query_cache_ttl_seconds: float = 300.0
+    query_cache_similarity_threshold: float = 0.0  # >0 also serves near-duplicate queries (e.g. 0.97)
+    
+    # Vector store executor (blocking Chroma calls run off the event loop)
+    vector_store_workers: int = 4
     
     # Document Processing
     chunk_size: int = 500
     chunk_overlap: int = 50
     max_file_size_mb: int = 50
+    incremental_indexing: bool = True  # Re-embed only chunks whose content changed
+    indexing_embed_batch_size: int = 64  # Chunks embedded and stored per batch
     
     # Semantic Chunking (embedding-based)
     semantic_chunking_enabled: bool = True
-    semantic_similarity_threshold: float = 0.5  # Cosine similarity cutoff
+    semantic_similarity_threshold: float = 0.5  # Breakpoint percentile / 100 (lower = more splits)
     semantic_min_chunk_size: int = 100
+    semantic_section_concurrency: int = 4  # Section batches chunked concurrently
+    semantic_sentences_per_call: int = 256  # Max sentences per embedding call
+    
+    # Parent-child (small-to-big) retrieval: embed small children, prompt with parents
+    parent_child_retrieval: bool = False
+    parent_chunk_size: int = 2000
+    child_chunk_size: int = 400
+    
+    # Chat History (newest messages, trimmed to a token budget)
+    max_conversation_history: int = 10
+    history_token_budget: int = 2000
+    
+    # Indexing Queue (background summary/tagging/chunking/embedding)
+    indexing_queue_backend: Literal["inline", "asyncio", "arq"] = "asyncio"
+    indexing_concurrency: int = 2
+    indexing_queue_max_size: int = 100  # Backpressure: enqueue blocks, then rejects
+    indexing_enqueue_timeout: float = 5.0
+    indexing_queue_name: str = "arq:indexing"
+    indexing_outbox_sweep_interval: float = 30.0  # Seconds between re-enqueueing dropped outbox jobs (0 = off)
     
     # Vault (Obsidian-style local .md file storage)
     vault_path: str = "./vault"
@@ -98,6 +151,16 @@ class Settings(BaseSettings):
     enable_auto_tagging: bool = True
     enable_summarization: bool = True
     
+    @model_validator(mode="after")
+    def check_indexing_backend(self) -> "Settings":
+        """The arq worker is a separate process; embedded Chroma is single-process only"""
+        if self.indexing_queue_backend == "arq" and not self.chroma_host:
+            raise ValueError(
+                "INDEXING_QUEUE_BACKEND=arq requires a Chroma server (set CHROMA_HOST); "
+                "the embedded store can't be shared between the API and worker processes"
+            )
+        return self
+    
     def get_llm_config(self, provider: Optional[str] = None) -> dict:
         """Get LLM configuration for specified provider"""
         provider = provider or self.default_llm_provider
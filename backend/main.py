@@ -10,6 +10,7 @@ Features:
 - Multi-LLM support (OpenAI, Anthropic, Ollama, etc.)
 - Auto-tagging and summarization
 """
+import asyncio
 import os
 import sys
 from contextlib import asynccontextmanager
@@ -26,6 +27,7 @@ import structlog
 
 from config.settings import get_settings
 from src.infrastructure.database.connection import init_db, get_db_manager
+from src.presentation.api.pagination import NEXT_CURSOR_HEADER
 
 # Configure structured logging
 structlog.configure(
@@ -69,12 +71,43 @@ async def lifespan(app: FastAPI):
     os.makedirs("./data/uploads", exist_ok=True)
     os.makedirs("./data/chroma", exist_ok=True)
     
+    # Build the keyword index for chunks indexed before it existed
+    from src.presentation.api.dependencies import get_vector_store
+    await get_vector_store().sync_keyword_index()
+    
+    # Start background indexing and recover jobs left over from the last run
+    from src.presentation.api.dependencies import (
+        get_indexing_queue, run_outbox_sweeper, sweep_indexing_outbox
+    )
+    indexing_queue = get_indexing_queue()
+    outbox_sweeper = None
+    if indexing_queue:
+        await indexing_queue.start()
+        recovered = await sweep_indexing_outbox(indexing_queue)
+        logger.info("indexing_jobs_recovered", count=recovered)
+        
+        # Jobs beyond the queue's capacity wait in the outbox until it has room
+        if settings.indexing_outbox_sweep_interval > 0:
+            outbox_sweeper = asyncio.create_task(
+                run_outbox_sweeper(indexing_queue, settings.indexing_outbox_sweep_interval)
+            )
+    
     yield
     
     # Shutdown
     logger.info("application_shutting_down")
     
-    # Shutdown thread/process pools for document processing
+    if outbox_sweeper:
+        outbox_sweeper.cancel()
+        await asyncio.gather(outbox_sweeper, return_exceptions=True)
+    if indexing_queue:
+        await indexing_queue.stop()
+    
+    # Shutdown embedding inference and thread/process pools for document processing
+    from src.presentation.api.dependencies import get_embedding_service, get_vector_store
+    get_embedding_service().shutdown()
+    get_vector_store().shutdown()
+    
     from src.infrastructure.document_processing.processor import shutdown_executors
     shutdown_executors()
     
@@ -104,6 +137,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],  # Readable by cross-origin frontends
     )
     
     # Import and register routes
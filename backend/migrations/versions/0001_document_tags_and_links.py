@@ -0,0 +1,118 @@
+"""Move document tags and links into indexed association tables
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+
+Databases before this revision were built by Base.metadata.create_all, and
+the app still creates missing tables on startup, so each step checks what
+already exists. The tags and outgoing_links JSON columns stay (they keep
+list order); incoming_links is dropped because backlinks are now derived
+from document_links.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+documents = sa.table(
+    "documents",
+    sa.column("id", sa.String),
+    sa.column("title", sa.String),
+    sa.column("tags", sa.JSON),
+    sa.column("outgoing_links", sa.JSON),
+    sa.column("incoming_links", sa.JSON),
+)
+document_tags = sa.table("document_tags", sa.column("document_id"), sa.column("tag"))
+document_links = sa.table("document_links", sa.column("source_id"), sa.column("target_title"))
+
+
+def _insert_rows(table: sa.TableClause, rows: list) -> None:
+    for i in range(0, len(rows), BATCH_SIZE):
+        op.get_bind().execute(table.insert(), rows[i:i + BATCH_SIZE])
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+    
+    if "document_tags" not in tables:
+        op.create_table(
+            "document_tags",
+            sa.Column(
+                "document_id", sa.String(36),
+                sa.ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True,
+            ),
+            sa.Column("tag", sa.String(100), primary_key=True),
+        )
+        op.create_index("idx_document_tags_tag", "document_tags", ["tag", "document_id"])
+    
+    if "document_links" not in tables:
+        op.create_table(
+            "document_links",
+            sa.Column(
+                "source_id", sa.String(36),
+                sa.ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True,
+            ),
+            sa.Column("target_title", sa.String(500), primary_key=True),
+        )
+        op.create_index(
+            "idx_document_links_target", "document_links", ["target_title", "source_id"]
+        )
+    
+    # Backfill from the JSON columns (rows written since startup are rebuilt too)
+    bind.execute(document_tags.delete())
+    bind.execute(document_links.delete())
+    tag_rows, link_rows = [], []
+    result = bind.execute(
+        sa.select(documents.c.id, documents.c.tags, documents.c.outgoing_links)
+    )
+    for doc_id, tags, links in result:
+        tag_rows.extend({"document_id": doc_id, "tag": t} for t in dict.fromkeys(tags or []))
+        link_rows.extend(
+            {"source_id": doc_id, "target_title": t} for t in dict.fromkeys(links or [])
+        )
+    _insert_rows(document_tags, tag_rows)
+    _insert_rows(document_links, link_rows)
+    
+    columns = {c["name"] for c in inspector.get_columns("documents")}
+    if "incoming_links" in columns:
+        with op.batch_alter_table("documents") as batch_op:
+            batch_op.drop_column("incoming_links")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("documents") as batch_op:
+        batch_op.add_column(sa.Column("incoming_links", sa.JSON, nullable=True))
+    
+    bind = op.get_bind()
+    incoming = {}
+    result = bind.execute(
+        sa.select(documents.c.id, document_links.c.source_id)
+        .select_from(documents.join(
+            document_links, document_links.c.target_title == documents.c.title
+        ))
+        .where(document_links.c.source_id != documents.c.id)
+    )
+    for doc_id, source_id in result:
+        incoming.setdefault(doc_id, []).append(source_id)
+    
+    if incoming:
+        bind.execute(
+            documents.update()
+            .where(documents.c.id == sa.bindparam("doc_id"))
+            .values(incoming_links=sa.bindparam("links")),
+            [{"doc_id": k, "links": v} for k, v in incoming.items()],
+        )
+    
+    op.drop_index("idx_document_links_target", table_name="document_links")
+    op.drop_table("document_links")
+    op.drop_index("idx_document_tags_tag", table_name="document_tags")
+    op.drop_table("document_tags")
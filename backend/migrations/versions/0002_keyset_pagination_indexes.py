@@ -0,0 +1,53 @@
+"""Composite indexes for keyset pagination
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+
+create_all only builds indexes with new tables, so existing databases get
+them here. idx_document_user_id and idx_message_conversation_id keep their
+names but gain the sort columns.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("idx_document_updated", "documents", ["updated_at", "id"]),
+    ("idx_document_user_id", "documents", ["user_id", "updated_at", "id"]),
+    ("idx_conversation_updated", "conversations", ["updated_at", "id"]),
+    ("idx_conversation_user_updated", "conversations", ["user_id", "updated_at", "id"]),
+    ("idx_message_conversation_id", "messages", ["conversation_id", "created_at", "id"]),
+]
+
+PREVIOUS = {
+    "idx_document_user_id": ["user_id"],
+    "idx_message_conversation_id": ["conversation_id"],
+}
+
+
+def _ensure_index(name: str, table: str, columns: list) -> None:
+    existing = {i["name"]: i["column_names"] for i in sa.inspect(op.get_bind()).get_indexes(table)}
+    if existing.get(name) == columns:
+        return
+    if name in existing:
+        op.drop_index(name, table_name=table)
+    op.create_index(name, table, columns)
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        _ensure_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in INDEXES:
+        if name in PREVIOUS:
+            _ensure_index(name, table, PREVIOUS[name])
+        else:
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark list vs NumPy array embeddings for a bulk reindex.
+
+Simulates re-embedding N chunks through the embedding cache (as the indexing
+pipeline does) and reports wall time and peak Python memory for
+embed_texts (lists of floats) vs embed_texts_array (float32 matrix).
+With --chroma the vectors are also written to a temporary Chroma collection.
+
+Usage:
+    python scripts/benchmark_embedding_arrays.py --chunks 10000 --dim 1024
+"""
+
+import argparse
+import asyncio
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.infrastructure.embedding.service import EmbeddingService
+from src.infrastructure.embedding.cache import CachedEmbeddingService
+
+
+class RandomEmbeddingService(EmbeddingService):
+    """Model stand-in returning a float32 matrix, like LocalEmbeddingService"""
+    
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.rng = np.random.default_rng(0)
+    
+    async def embed_text(self, text):
+        return (await self.embed_texts([text]))[0]
+    
+    async def embed_texts(self, texts):
+        return (await self.embed_texts_array(texts)).tolist()
+    
+    async def embed_texts_array(self, texts):
+        return self.rng.random((len(texts), self.dim), dtype=np.float32)
+    
+    def get_dimension(self):
+        return self.dim
+
+
+async def run(mode: str, chunks: int, dim: int, batch: int, chroma: bool) -> None:
+    texts = [f"chunk {i} " + "lorem ipsum " * 20 for i in range(chunks)]
+    service = CachedEmbeddingService(RandomEmbeddingService(dim), model="bench", memory_size=chunks)
+    store_dir = tempfile.mkdtemp() if chroma else None
+    store = None
+    if chroma:
+        from src.infrastructure.vector_store.chroma_store import ChromaVectorStore
+        store = ChromaVectorStore(store_dir, f"bench_{mode}")
+    
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    
+    for i in range(0, chunks, batch):
+        batch_texts = texts[i:i + batch]
+        if mode == "list":
+            embeddings = await service.embed_texts(batch_texts)
+        else:
+            embeddings = await service.embed_texts_array(batch_texts)
+        if store is not None:
+            await store.add_documents(
+                ids=[f"c{i + j}" for j in range(len(batch_texts))],
+                embeddings=embeddings,
+                documents=batch_texts,
+            )
+    
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    print(f"{mode:>5}: {elapsed:7.2f}s  peak {peak / 1024 / 1024:8.1f} MiB")
+    if store_dir:
+        shutil.rmtree(store_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chunks", type=int, default=10000)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--chroma", action="store_true", help="Also write vectors to Chroma")
+    args = parser.parse_args()
+    
+    print(f"Re-embedding {args.chunks} chunks, dim={args.dim}, batch={args.batch}")
+    for mode in ("list", "array"):
+        asyncio.run(run(mode, args.chunks, args.dim, args.batch, args.chroma))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark SemanticDocumentProcessor.chunk_text_async on a many-section note.
+
+Builds a Markdown document with --sections headers and chunks it against a
+simulated embedding backend: each call costs --call-ms plus --text-ms per
+sentence, with at most --backend-slots calls served at once (like Ollama
+with OLLAMA_NUM_PARALLEL, or several local inference workers).
+
+Compares one section at a time (the old serial loop) against concurrent
+section batches.
+
+Usage:
+    python scripts/benchmark_semantic_chunking.py --sections 100 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.infrastructure.document_processing.processor import SemanticDocumentProcessor
+
+
+def build_document(sections: int, sentences: int) -> str:
+    parts = []
+    for i in range(sections):
+        parts.append(f"## Section {i}\n")
+        parts.append(" ".join(
+            f"Sentence {j} of section {i} talks about topic {(i + j // 4) % 7}."
+            for j in range(sentences)
+        ))
+        parts.append("\n\n")
+    return "".join(parts)
+
+
+def make_backend(call_ms: float, text_ms: float, slots: int, dim: int = 64):
+    semaphore = asyncio.Semaphore(slots)
+    rng = np.random.default_rng(0)
+    stats = {"calls": 0}
+    
+    async def embed(texts):
+        async with semaphore:
+            stats["calls"] += 1
+            await asyncio.sleep((call_ms + text_ms * len(texts)) / 1000)
+            return rng.random((len(texts), dim), dtype=np.float32)
+    
+    return embed, stats
+
+
+async def run(name: str, text: str, args, concurrency: int, per_call: int) -> None:
+    embed, stats = make_backend(args.call_ms, args.text_ms, args.backend_slots)
+    processor = SemanticDocumentProcessor(
+        embedding_function=embed,
+        section_concurrency=concurrency,
+        sentences_per_call=per_call,
+    )
+    
+    start = time.perf_counter()
+    chunks = await processor.chunk_text_async(text)
+    elapsed = time.perf_counter() - start
+    
+    assert [c.chunk_index for c in chunks] == list(range(len(chunks)))
+    print(f"{name:>22}: {elapsed:6.2f}s  {stats['calls']:4d} calls  {len(chunks)} chunks")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sections", type=int, default=100)
+    parser.add_argument("--sentences", type=int, default=20, help="Sentences per section")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--sentences-per-call", type=int, default=256)
+    parser.add_argument("--call-ms", type=float, default=20.0, help="Fixed cost per embedding call")
+    parser.add_argument("--text-ms", type=float, default=0.5, help="Cost per sentence embedded")
+    parser.add_argument("--backend-slots", type=int, default=4, help="Calls the backend serves at once")
+    args = parser.parse_args()
+    
+    text = build_document(args.sections, args.sentences)
+    # A section fills a batch by itself when sentences_per_call <= its sentence count
+    per_section = 1
+    
+    print(f"{args.sections} sections x {args.sentences} sentences, {len(text)} chars")
+    asyncio.run(run("serial sections", text, args, 1, per_section))
+    asyncio.run(run("concurrent sections", text, args, args.concurrency, per_section))
+    asyncio.run(run("concurrent batches", text, args, args.concurrency, args.sentences_per_call))
+
+
+if __name__ == "__main__":
+    main()
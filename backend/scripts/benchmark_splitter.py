@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark the span-based recursive splitter against the string-based one.
+
+Loads every Markdown file under --corpus (default: this repository), repeats
+the corpus up to --size-mb and chunks it with:
+- legacy: the previous string-building _recursive_split, locating each
+  chunk with text.find(chunk[:50]) as chunk_text used to
+- spans: split_spans, slicing content from exact offsets
+
+Repeating a corpus flatters legacy (find() stops at the first copy), so
+the number of chunks whose offset doesn't point at their content is
+reported alongside the timings.
+
+Usage:
+    python scripts/benchmark_splitter.py --corpus ./vault --size-mb 5
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.infrastructure.document_processing.processor import DEFAULT_SEPARATORS, split_spans
+
+
+def legacy_recursive_split(text, separators, chunk_size):
+    """The string-building splitter, kept here as the baseline"""
+    if len(text) <= chunk_size:
+        return [text] if text.strip() else []
+    
+    separator = separators[-1]
+    for sep in separators:
+        if sep in text:
+            separator = sep
+            break
+    
+    if separator:
+        splits = text.split(separator)
+    else:
+        splits = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+    
+    chunks = []
+    current_chunk = ""
+    for split in splits:
+        if not split.strip():
+            continue
+        test_chunk = current_chunk + separator + split if current_chunk else split
+        if len(test_chunk) <= chunk_size:
+            current_chunk = test_chunk
+        else:
+            if current_chunk:
+                chunks.append(current_chunk)
+            if len(split) > chunk_size and len(separators) > 1:
+                sub_chunks = legacy_recursive_split(split, separators[1:], chunk_size)
+                chunks.extend(sub_chunks[:-1])
+                current_chunk = sub_chunks[-1] if sub_chunks else ""
+            else:
+                current_chunk = split
+    if current_chunk:
+        chunks.append(current_chunk)
+    return chunks
+
+
+def run_legacy(text, chunk_size):
+    chunks = legacy_recursive_split(text, list(DEFAULT_SEPARATORS), chunk_size)
+    return [(text.find(chunk[:50]), chunk) for chunk in chunks]
+
+
+def run_spans(text, chunk_size):
+    return [(start, text[start:end]) for start, end in split_spans(text, chunk_size)]
+
+
+def count_mislocated(text, chunks):
+    return sum(1 for start, chunk in chunks if text[start:start + len(chunk)] != chunk)
+
+
+def load_corpus(root: str, size_mb: float) -> str:
+    paths = sorted(glob.glob(os.path.join(root, "**", "*.md"), recursive=True))
+    paths = [p for p in paths if "node_modules" not in p]
+    corpus = "\n\n".join(open(p, encoding="utf-8", errors="ignore").read() for p in paths)
+    if not corpus.strip():
+        raise SystemExit(f"No Markdown found under {root}")
+    
+    target = int(size_mb * 1024 * 1024)
+    repeats = max(1, target // len(corpus))
+    print(f"Corpus: {len(paths)} files, {len(corpus)} chars x {repeats}")
+    return "\n\n".join([corpus] * repeats)
+
+
+def main():
+    default_root = os.path.join(os.path.dirname(__file__), "..", "..")
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", default=default_root, help="Directory of .md files")
+    parser.add_argument("--size-mb", type=float, default=5.0)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    
+    text = load_corpus(args.corpus, args.size_mb)
+    
+    for name, fn in (("legacy", run_legacy), ("spans", run_spans)):
+        best = float("inf")
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            chunks = fn(text, args.chunk_size)
+            best = min(best, time.perf_counter() - start)
+        print(
+            f"{name:>6}: {best:7.3f}s  {len(chunks)} chunks, "
+            f"{count_mislocated(text, chunks)} mislocated"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,8 @@
 Application Use Cases - Chat and RAG
 Business logic for conversational AI with knowledge retrieval
 """
-from typing import List, Optional, Dict, Any, AsyncIterator
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
 import uuid
 import structlog
@@ -12,14 +13,23 @@ from src.infrastructure.database.repositories import (
     SQLAlchemyConversationRepository,
     SQLAlchemyMessageRepository,
     SQLAlchemyDocumentRepository,
+    SQLAlchemyChunkRepository,
 )
 from src.infrastructure.embedding.service import EmbeddingService
 from src.infrastructure.vector_store.chroma_store import ChromaVectorStore
+from src.infrastructure.vector_store.query_cache import QueryResultCache
 from src.infrastructure.llm.service import LLMService, LLMMessage
 
 logger = structlog.get_logger()
 
 
+@dataclass
+class ChatResult:
+    """Result of a non-streaming chat turn"""
+    message: Message                                             # Saved assistant message
+    context: List[Dict[str, Any]] = field(default_factory=list)  # Chunks the answer used
+
+
 class ChatUseCase:
     """
     Chat and RAG use cases
@@ -28,9 +38,17 @@ class ChatUseCase:
     - Conversation management
     - RAG-based question answering
     - Streaming responses
-    - Context retrieval
+    - Context retrieval (optionally small-to-big: child hits expand to parents)
+    
+    Instances are request-scoped, so retrievals are memoized per instance:
+    repeating a search within one request reuses the first result. The
+    optional query_cache is shared across requests.
     """
     
+    # Children fetched per requested result in parent-child mode, since
+    # several hits often share a parent
+    PARENT_OVERSAMPLING = 3
+    
     def __init__(
         self,
         conversation_repo: SQLAlchemyConversationRepository,
@@ -43,6 +61,10 @@ class ChatUseCase:
         enable_hybrid_search: bool = True,
         max_context_chunks: int = 5,
         max_conversation_history: int = 10,
+        history_token_budget: int = 2000,
+        chunk_repo: Optional[SQLAlchemyChunkRepository] = None,
+        parent_child_retrieval: bool = False,
+        query_cache: Optional[QueryResultCache] = None,
     ):
         self.conversation_repo = conversation_repo
         self.message_repo = message_repo
@@ -54,6 +76,11 @@ class ChatUseCase:
         self.enable_hybrid_search = enable_hybrid_search
         self.max_context_chunks = max_context_chunks
         self.max_conversation_history = max_conversation_history
+        self.history_token_budget = history_token_budget
+        self.chunk_repo = chunk_repo
+        self.parent_child_retrieval = parent_child_retrieval and chunk_repo is not None
+        self.query_cache = query_cache
+        self._retrieval_memo: Dict[Tuple[str, int, str], List[Dict[str, Any]]] = {}
     
     async def create_conversation(
         self,
@@ -77,12 +104,14 @@ class ChatUseCase:
         user_id: Optional[str] = None,
         skip: int = 0,
         limit: int = 20,
+        after: Optional[Tuple[datetime, str]] = None,
     ) -> List[Conversation]:
         """List conversations"""
         return await self.conversation_repo.get_all(
             user_id=user_id,
             skip=skip,
             limit=limit,
+            after=after,
         )
     
     async def delete_conversation(self, conv_id: str) -> bool:
@@ -93,9 +122,10 @@ class ChatUseCase:
         self,
         conv_id: str,
         limit: int = 50,
+        after: Optional[Tuple[datetime, str]] = None,
     ) -> List[Message]:
         """Get messages in a conversation"""
-        return await self.message_repo.get_by_conversation(conv_id, limit)
+        return await self.message_repo.get_by_conversation(conv_id, limit, after=after)
     
     async def retrieve_context(
         self,
@@ -114,31 +144,132 @@ class ChatUseCase:
         Returns:
             List of relevant chunks with metadata
         """
+        key = QueryResultCache.make_key(query, top_k, filters)
+        if key in self._retrieval_memo:
+            return list(self._retrieval_memo[key])
+        
+        cache = self.query_cache
+        generation = cache.generation if cache is not None else 0
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                self._retrieval_memo[key] = cached
+                return list(cached)
+        
         # Generate query embedding
         query_embedding = await self.embedding_service.embed_text(query)
         
+        if cache is not None:
+            cached = cache.get_similar(key, query_embedding)
+            if cached is not None:
+                self._retrieval_memo[key] = cached
+                return list(cached)
+        
+        search_k = top_k * self.PARENT_OVERSAMPLING if self.parent_child_retrieval else top_k
+        
         # Search vector store
         if self.enable_hybrid_search:
             results = await self.vector_store.hybrid_search(
                 query=query,
                 query_embedding=query_embedding,
-                top_k=top_k,
+                top_k=search_k,
                 filters=filters,
             )
         else:
             results = await self.vector_store.search(
                 query_embedding=query_embedding,
-                top_k=top_k,
+                top_k=search_k,
                 filters=filters,
             )
         
+        if self.parent_child_retrieval:
+            results = await self._expand_to_parents(results, top_k)
+        
         logger.info(
             "context_retrieved",
             query_preview=query[:50],
             results_count=len(results),
         )
         
-        return results
+        if cache is not None:
+            cache.put(key, results, query_embedding, generation)
+        self._retrieval_memo[key] = results
+        return list(results)
+    
+    async def _expand_to_parents(
+        self,
+        results: List[Dict[str, Any]],
+        top_k: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Replace child hits with their parent chunks
+        
+        Parents are loaded in one query and de-duplicated, keeping the best
+        child's rank and score. Hits without a (stored) parent pass through.
+        """
+        parent_ids = list(dict.fromkeys(
+            r["metadata"]["parent_id"] for r in results if r.get("metadata", {}).get("parent_id")
+        ))
+        if not parent_ids:
+            return results[:top_k]
+        parents = {c.id: c for c in await self.chunk_repo.get_by_ids(parent_ids)}
+        
+        expanded = []
+        seen = set()
+        for result in results:
+            metadata = result.get("metadata") or {}
+            parent = parents.get(metadata.get("parent_id"))
+            if parent is not None:
+                result = {
+                    **result,
+                    "id": parent.id,
+                    "content": parent.content,
+                    "metadata": {
+                        **metadata,
+                        "chunk_index": parent.chunk_index,
+                        "matched_chunk_id": result["id"],
+                    },
+                }
+            if result["id"] in seen:
+                continue
+            seen.add(result["id"])
+            expanded.append(result)
+            if len(expanded) == top_k:
+                break
+        
+        return expanded
+    
+    async def _load_history(
+        self,
+        conversation_id: str,
+        current_message_id: str,
+        model: Optional[str] = None,
+    ) -> List[Message]:
+        """
+        Newest prior messages that fit history_token_budget, oldest first
+        
+        Excludes the just-saved user message; a single message larger than
+        the budget is dropped rather than truncated.
+        """
+        recent = await self.message_repo.get_recent(
+            conversation_id,
+            limit=self.max_conversation_history + 1,
+        )
+        
+        kept: List[Message] = []
+        tokens = 0
+        for m in reversed(recent):
+            if m.id == current_message_id:
+                continue
+            tokens += self.llm_service.count_tokens(m.content, model)
+            if tokens > self.history_token_budget or len(kept) >= self.max_conversation_history:
+                break
+            kept.append(m)
+        kept.reverse()
+        
+        if len(kept) < len(recent) - 1:
+            logger.debug("chat_history_trimmed", conv_id=conversation_id, kept=len(kept))
+        return kept
     
     async def chat(
         self,
@@ -146,7 +277,7 @@ class ChatUseCase:
         user_message: str,
         use_rag: bool = True,
         model: Optional[str] = None,
-    ) -> Message:
+    ) -> ChatResult:
         """
         Send a message and get a response (non-streaming)
         
@@ -157,7 +288,7 @@ class ChatUseCase:
             model: Optional model override
         
         Returns:
-            Assistant's response message
+            The saved assistant message and the context chunks it was given
         """
         # Verify conversation exists
         conversation = await self.conversation_repo.get_by_id(conversation_id)
@@ -174,18 +305,11 @@ class ChatUseCase:
         await self.message_repo.create(user_msg)
         
         # Get conversation history
-        history = await self.message_repo.get_by_conversation(
-            conversation_id,
-            limit=self.max_conversation_history,
-        )
-        
-        # Convert to LLM messages
-        llm_history = [
-            LLMMessage(role=m.role, content=m.content)
-            for m in history[:-1]  # Exclude the just-added user message
-        ]
+        history = await self._load_history(conversation_id, user_msg.id, model)
+        llm_history = [LLMMessage(role=m.role, content=m.content) for m in history]
         
         # Retrieve context if RAG enabled
+        results = []
         retrieved_chunks = []
         context_texts = []
         if use_rag:
@@ -227,7 +351,7 @@ class ChatUseCase:
         await self.message_repo.create(assistant_msg)
         
         # Update conversation title if it's the first exchange
-        if len(history) <= 1 and conversation.title == "New Conversation":
+        if not history and conversation.title == "New Conversation":
             # Generate title from first message
             conversation.title = user_message[:50] + ("..." if len(user_message) > 50 else "")
             conversation.updated_at = datetime.utcnow()
@@ -239,7 +363,7 @@ class ChatUseCase:
             chunks_used=len(retrieved_chunks),
         )
         
-        return assistant_msg
+        return ChatResult(message=assistant_msg, context=results)
     
     async def chat_stream(
         self,
@@ -269,10 +393,7 @@ class ChatUseCase:
         await self.message_repo.create(user_msg)
         
         # Get conversation history
-        history = await self.message_repo.get_by_conversation(
-            conversation_id,
-            limit=self.max_conversation_history,
-        )
+        history = await self._load_history(conversation_id, user_msg.id, model)
         
         # Retrieve context if RAG enabled
         retrieved_chunks = []
@@ -323,7 +444,7 @@ Guidelines:
         messages.append(LLMMessage(role="system", content=system_prompt))
         
         # Add history
-        for m in history[:-1]:
+        for m in history:
             messages.append(LLMMessage(role=m.role, content=m.content))
         
         # Add current message
@@ -381,16 +502,15 @@ Guidelines:
         results = await self.retrieve_context(query, top_k=top_k)
         
         if include_documents:
-            # Enrich with document info
+            # Enrich with document info (one projected query, content not loaded)
+            doc_ids = list(dict.fromkeys(
+                r["metadata"]["document_id"] for r in results
+                if (r.get("metadata") or {}).get("document_id")
+            ))
+            docs = await self.document_repo.get_fields_by_ids(doc_ids, ("id", "title", "tags"))
             for result in results:
-                doc_id = result.get("metadata", {}).get("document_id")
-                if doc_id:
-                    doc = await self.document_repo.get_by_id(doc_id)
-                    if doc:
-                        result["document"] = {
-                            "id": doc.id,
-                            "title": doc.title,
-                            "tags": doc.tags,
-                        }
+                doc = docs.get((result.get("metadata") or {}).get("document_id"))
+                if doc:
+                    result["document"] = {**doc, "tags": doc["tags"] or []}
         
         return results
@@ -2,26 +2,62 @@
 Application Use Cases - Document Management
 Business logic orchestration for document operations
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime
+import hashlib
 import uuid
 import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.domain.entities.document import Document, DocumentChunk, DocumentType, DocumentStatus
+from src.domain.entities.document import (
+    Document, DocumentChunk, DocumentStatus, DocumentSummary, DocumentType
+)
 from src.infrastructure.database.repositories import (
     SQLAlchemyDocumentRepository,
     SQLAlchemyChunkRepository,
     SQLAlchemyTagRepository,
+    SQLAlchemyIndexingJobRepository,
 )
 from src.infrastructure.embedding.service import EmbeddingService
 from src.infrastructure.vector_store.chroma_store import ChromaVectorStore
-from src.infrastructure.document_processing.processor import DocumentProcessor
+from src.infrastructure.vector_store.query_cache import QueryResultCache
+from src.infrastructure.document_processing.processor import DocumentProcessor, TextChunk
 from src.infrastructure.llm.service import LLMService
 from src.infrastructure.vault.service import VaultService
+from src.infrastructure.task_queue.indexing_queue import IndexingQueue, IndexingQueueFullError
 
 logger = structlog.get_logger()
 
 
+def chunk_content_hash(content: str) -> str:
+    """Content hash used to match chunks across re-indexing"""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ChunkDiff:
+    """Result of diffing a new chunk set against stored chunks"""
+    kept: List[DocumentChunk] = field(default_factory=list)     # Unchanged content, existing IDs
+    moved: List[DocumentChunk] = field(default_factory=list)    # Kept chunks with new positions
+    added: List[DocumentChunk] = field(default_factory=list)    # New content, new IDs
+    removed: List[DocumentChunk] = field(default_factory=list)  # Stored chunks no longer present
+
+
+@dataclass
+class IndexPlan:
+    """Chunk changes computed (and new vectors stored) before any DB write"""
+    diff: ChunkDiff = field(default_factory=ChunkDiff)
+    parent_diff: ChunkDiff = field(default_factory=ChunkDiff)
+    parents: int = 0
+    empty: bool = False  # No chunks: drop everything stored for the document
+    embedded_ids: List[str] = field(default_factory=list)      # Vectors added by this run
+    stale_vector_ids: List[str] = field(default_factory=list)  # Vectors to drop (reused parents)
+    to_refresh: List[DocumentChunk] = field(default_factory=list)
+    metadatas: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
 class DocumentUseCase:
     """
     Document management use cases
@@ -29,6 +65,7 @@ class DocumentUseCase:
     Handles:
     - Document CRUD operations
     - Document indexing (chunking, embedding, vector storage)
+    - Background indexing via an outbox table and IndexingQueue
     - Link management (bi-directional wiki links)
     - Auto-tagging and summarization
     """
@@ -45,6 +82,15 @@ class DocumentUseCase:
         vault_service: Optional[VaultService] = None,
         enable_auto_tagging: bool = True,
         enable_summarization: bool = True,
+        indexing_job_repo: Optional[SQLAlchemyIndexingJobRepository] = None,
+        indexing_queue: Optional[IndexingQueue] = None,
+        incremental_indexing: bool = True,
+        embed_batch_size: int = 64,
+        parent_child_chunking: bool = False,
+        parent_chunk_size: int = 2000,
+        child_chunk_size: int = 400,
+        query_cache: Optional[QueryResultCache] = None,
+        session: Optional[AsyncSession] = None,
     ):
         self.document_repo = document_repo
         self.chunk_repo = chunk_repo
@@ -56,6 +102,20 @@ class DocumentUseCase:
         self.vault_service = vault_service
         self.enable_auto_tagging = enable_auto_tagging
         self.enable_summarization = enable_summarization
+        self.indexing_job_repo = indexing_job_repo
+        self.indexing_queue = indexing_queue
+        self.incremental_indexing = incremental_indexing
+        self.embed_batch_size = max(1, embed_batch_size)
+        self.parent_child_chunking = parent_child_chunking
+        self.parent_chunk_size = parent_chunk_size
+        self.child_chunk_size = child_chunk_size
+        self.query_cache = query_cache
+        self.session = session  # Committed between stages of background indexing jobs
+        
+        # Documents to hand to the indexing queue once the session is committed
+        self.pending_index_jobs: List[str] = []
+        # Set by vector store writes; invalidate_query_cache() runs after commit
+        self.query_cache_stale = False
     
     async def create_document(
         self,
@@ -75,11 +135,14 @@ class DocumentUseCase:
             doc_type: Type of document
             tags: Initial tags
             user_id: Owner user ID
-            auto_index: Whether to index immediately
+            auto_index: Whether to index (in the background when a queue is configured)
         
         Returns:
             Created Document entity
         """
+        if auto_index:
+            self._check_queue_capacity()
+        
         # Extract wiki links
         outgoing_links = self.document_processor.extract_wiki_links(content)
         
@@ -104,21 +167,12 @@ class DocumentUseCase:
         document = await self.document_repo.create(document)
         
         # Update tag counts
-        for tag in all_tags:
-            existing_tag = await self.tag_repo.get_by_name(tag)
-            if existing_tag:
-                await self.tag_repo.update_count(tag, 1)
-            else:
-                from src.domain.entities.document import Tag
-                new_tag = Tag(name=tag.lower(), document_count=1)
-                await self.tag_repo.create(new_tag)
-        
-        # Update bi-directional links
-        await self._update_incoming_links(document)
+        if all_tags:
+            await self.tag_repo.update_counts({tag: 1 for tag in all_tags})
         
         # Index if requested
         if auto_index:
-            await self.index_document(document.id)
+            await self.schedule_indexing(document.id)
         
         # Save to vault as .md file (Obsidian-style)
         if self.vault_service:
@@ -147,6 +201,9 @@ class DocumentUseCase:
         if not document:
             raise ValueError(f"Document {doc_id} not found")
         
+        if reindex and content is not None:
+            self._check_queue_capacity()
+        
         # Store old tags for count update
         old_tags = set(document.tags)
         
@@ -171,23 +228,14 @@ class DocumentUseCase:
         
         # Update tag counts
         new_tags = set(document.tags)
-        for tag in old_tags - new_tags:
-            await self.tag_repo.update_count(tag, -1)
-        for tag in new_tags - old_tags:
-            existing = await self.tag_repo.get_by_name(tag)
-            if existing:
-                await self.tag_repo.update_count(tag, 1)
-            else:
-                from src.domain.entities.document import Tag
-                new_tag = Tag(name=tag.lower(), document_count=1)
-                await self.tag_repo.create(new_tag)
-        
-        # Update links
-        await self._update_incoming_links(document)
+        tag_deltas = {tag: -1 for tag in old_tags - new_tags}
+        tag_deltas.update({tag: 1 for tag in new_tags - old_tags})
+        if tag_deltas:
+            await self.tag_repo.update_counts(tag_deltas)
         
         # Reindex if content changed
         if reindex and content is not None:
-            await self.index_document(doc_id)
+            await self.schedule_indexing(doc_id)
         
         # Update vault .md file (Obsidian-style)
         if self.vault_service:
@@ -210,15 +258,20 @@ class DocumentUseCase:
             return False
         
         # Update tag counts
-        for tag in document.tags:
-            await self.tag_repo.update_count(tag, -1)
+        if document.tags:
+            await self.tag_repo.update_counts({tag: -1 for tag in document.tags})
         
         # Remove from vector store
         await self.vector_store.delete_by_document(doc_id)
+        self.query_cache_stale = True
         
         # Delete chunks
         await self.chunk_repo.delete_by_document(doc_id)
         
+        # Drop any pending indexing job
+        if self.indexing_job_repo:
+            await self.indexing_job_repo.complete(doc_id, datetime.utcnow())
+        
         # Delete document
         await self.document_repo.delete(doc_id)
         
@@ -242,38 +295,196 @@ class DocumentUseCase:
         user_id: Optional[str] = None,
         skip: int = 0,
         limit: int = 50,
-    ) -> List[Document]:
-        """List all documents with pagination"""
-        return await self.document_repo.get_all(
+        after: Optional[Tuple[datetime, str]] = None,
+    ) -> List[DocumentSummary]:
+        """
+        List all documents with pagination (after = keyset of the last document seen)
+        Returns summaries without content; get_document loads the body
+        """
+        return await self.document_repo.get_summaries(
             user_id=user_id,
             skip=skip,
             limit=limit,
+            after=after,
         )
     
     async def search_documents(
         self,
         query: str,
         limit: int = 10,
-    ) -> List[Document]:
+    ) -> List[DocumentSummary]:
         """Search documents by title"""
-        return await self.document_repo.search_by_title(query, limit)
+        return await self.document_repo.search_summaries(query, limit)
     
     async def get_documents_by_tag(
         self,
         tag: str,
         limit: int = 50,
-    ) -> List[Document]:
+    ) -> List[DocumentSummary]:
         """Get documents by tag"""
-        return await self.document_repo.get_by_tag(tag, limit)
+        return await self.document_repo.get_summaries_by_tag(tag, limit)
+    
+    async def schedule_indexing(self, doc_id: str) -> None:
+        """
+        Index a document, or defer it to the indexing queue
+        
+        With a queue configured, an outbox job is written in the current
+        transaction and the document ID is held in pending_index_jobs until
+        dispatch_pending_indexing() is called after commit.
+        """
+        if self.indexing_queue is None or self.indexing_job_repo is None:
+            await self.index_document(doc_id)
+            return
+        
+        await self.indexing_job_repo.add(doc_id)
+        if doc_id not in self.pending_index_jobs:
+            self.pending_index_jobs.append(doc_id)
+    
+    async def dispatch_pending_indexing(self) -> None:
+        """Hand deferred indexing jobs to the queue (call after commit)"""
+        doc_ids, self.pending_index_jobs = self.pending_index_jobs, []
+        if not doc_ids or self.indexing_queue is None:
+            return
+        
+        # Jobs that don't fit stay in the outbox for the periodic outbox sweep
+        await self.indexing_queue.enqueue_many(doc_ids)
+    
+    async def process_indexing_job(self, doc_id: str) -> bool:
+        """
+        Run a queued indexing job and clear its outbox entry
+        
+        Runs as short transactions on self.session, so none stays open
+        across the LLM and embedding calls:
+        1. mark the document PROCESSING and commit
+        2. summarize, tag, chunk and embed (vectors only, no DB writes)
+        3. write chunks, final status and the outbox delete in one commit
+        
+        Failures are recorded on the document (status FAILED) rather than
+        raised.
+        """
+        started_at = datetime.utcnow()
+        plan: Optional[IndexPlan] = None
+        try:
+            document = await self.document_repo.get_by_id(doc_id)
+            if not document:
+                logger.warning("index_document_not_found", doc_id=doc_id)
+                await self._complete_job(doc_id, started_at)
+                return False
+            
+            document.status = DocumentStatus.PROCESSING
+            await self.document_repo.update(document)
+            existing_chunks = await self.chunk_repo.get_by_document(doc_id)
+            await self._commit()
+            
+            summary, auto_tags = await self._enrich(document)
+            self._apply_enrichment(document, summary, auto_tags)
+            plan = await self._plan_index(document, existing_chunks)
+            
+            # Re-read: the document may have been edited or deleted meanwhile
+            # (an edit queues a newer job, which complete() leaves in place)
+            current = await self.document_repo.get_by_id(doc_id)
+            if not current:
+                logger.info("index_document_deleted", doc_id=doc_id)
+                await self.vector_store.delete_by_document(doc_id)
+                await self._complete_job(doc_id, started_at)
+                return False
+            
+            self._apply_enrichment(current, summary, auto_tags)
+            await self._apply_index(current, plan)
+            await self._complete_job(doc_id, started_at)
+            return True
+        
+        except Exception as e:
+            logger.error("document_indexing_failed", doc_id=doc_id, error=str(e), exc_info=True)
+            try:
+                await self._record_failure(doc_id, started_at, plan)
+            except Exception as record_error:
+                # The outbox entry survives, so the outbox sweep retries the job
+                logger.error(
+                    "indexing_failure_not_recorded",
+                    doc_id=doc_id,
+                    error=str(record_error),
+                    exc_info=True,
+                )
+                await self._rollback()
+            return False
+        finally:
+            # Stages above have committed, so retrievals now see the new index
+            self.query_cache_stale = True
+            self.invalidate_query_cache()
+    
+    async def _record_failure(
+        self,
+        doc_id: str,
+        started_at: datetime,
+        plan: Optional["IndexPlan"],
+    ) -> None:
+        """Mark a failed job's document FAILED in a fresh transaction"""
+        await self._rollback()
+        if plan and plan.embedded_ids:
+            # Their chunk rows were never committed
+            await self.vector_store.delete_by_ids(plan.embedded_ids)
+        document = await self.document_repo.get_by_id(doc_id)
+        if document:
+            document.mark_failed()
+            await self.document_repo.update(document)
+        await self._complete_job(doc_id, started_at)
+    
+    async def _complete_job(self, doc_id: str, started_at: datetime) -> None:
+        """Delete the job's outbox entry and commit"""
+        if self.indexing_job_repo:
+            await self.indexing_job_repo.complete(doc_id, started_at)
+        await self._commit()
+    
+    async def _commit(self) -> None:
+        """Commit an indexing stage (no-op without a session)"""
+        if self.session is not None:
+            await self.session.commit()
+            # Later stages re-read rows that other sessions may have changed
+            self.session.expire_all()
+    
+    async def _rollback(self) -> None:
+        """Abandon the current indexing stage (no-op without a session)"""
+        if self.session is not None:
+            await self.session.rollback()
+    
+    async def get_indexing_status(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Get indexing status of a document"""
+        document = await self.document_repo.get_by_id(doc_id)
+        if not document:
+            return None
+        
+        queued = False
+        if self.indexing_job_repo:
+            queued = await self.indexing_job_repo.exists(doc_id)
+        
+        return {
+            "id": document.id,
+            "status": document.status.value,
+            "queued": queued,
+            "indexed_at": document.indexed_at,
+        }
+    
+    def _check_queue_capacity(self) -> None:
+        """Reject new indexing work early when the queue is saturated"""
+        if self.indexing_queue is not None and self.indexing_queue.is_full():
+            raise IndexingQueueFullError("Indexing queue is full, retry later")
     
     async def index_document(self, doc_id: str) -> bool:
         """
         Index a document: chunk, embed, and store in vector DB
         
         This is the core RAG preparation step.
-        Uses delayed deletion strategy to prevent race conditions:
-        1. Generate new chunks and embeddings first
-        2. Then atomically delete old + insert new
+        In incremental mode the new chunk set is diffed against the stored
+        chunks by content hash, so only added chunks are embedded and only
+        added/removed chunks touch the database and the vector index;
+        unchanged chunks keep their IDs.
+        New chunks are embedded and stored in batches of embed_batch_size
+        (bounded memory) before anything is deleted.
+        With parent_child_chunking, parents and children are diffed
+        separately and only children (tagged with parent_id) are embedded.
+        
+        Runs in the caller's transaction; queued jobs use process_indexing_job.
         """
         document = await self.document_repo.get_by_id(doc_id)
         if not document:
@@ -284,115 +495,285 @@ class DocumentUseCase:
             document.status = DocumentStatus.PROCESSING
             await self.document_repo.update(document)
             
-            # Generate summary if enabled
-            if self.enable_summarization and self.llm_service and len(document.content) > 200:
-                try:
-                    document.summary = await self.llm_service.generate_summary(
-                        document.content[:4000],  # Limit context
-                        max_length=150,
-                    )
-                except Exception as e:
-                    logger.warning("summary_generation_failed", doc_id=doc_id, error=str(e))
-            
-            # Auto-generate tags if enabled
-            if self.enable_auto_tagging and self.llm_service and len(document.tags) < 3:
-                try:
-                    auto_tags = await self.llm_service.generate_tags(
-                        document.content[:2000],
-                        max_tags=5,
-                    )
-                    document.tags = list(set(document.tags + auto_tags))
-                except Exception as e:
-                    logger.warning("auto_tagging_failed", doc_id=doc_id, error=str(e))
+            summary, auto_tags = await self._enrich(document)
+            self._apply_enrichment(document, summary, auto_tags)
+            existing_chunks = await self.chunk_repo.get_by_document(doc_id)
+            plan = await self._plan_index(document, existing_chunks)
+            await self._apply_index(document, plan)
+            return True
             
-            # Step 1: Generate new chunks (before deleting old ones)
-            if hasattr(self.document_processor, 'chunk_text_async'):
-                text_chunks = await self.document_processor.chunk_text_async(document.content)
+        except Exception as e:
+            logger.error("document_indexing_failed", doc_id=doc_id, error=str(e))
+            document.mark_failed()
+            await self.document_repo.update(document)
+            raise
+        finally:
+            # Any path past this point may have written to the vector store;
+            # the caller clears the cache once its transaction commits
+            self.query_cache_stale = True
+    
+    async def _enrich(self, document: Document) -> Tuple[Optional[str], List[str]]:
+        """Generate a summary and auto tags (failures are logged and skipped)"""
+        summary = None
+        auto_tags: List[str] = []
+        
+        # Generate summary if enabled
+        if self.enable_summarization and self.llm_service and len(document.content) > 200:
+            try:
+                summary = await self.llm_service.generate_summary(
+                    document.content[:4000],  # Limit context
+                    max_length=150,
+                )
+            except Exception as e:
+                logger.warning("summary_generation_failed", doc_id=document.id, error=str(e))
+        
+        # Auto-generate tags if enabled
+        if self.enable_auto_tagging and self.llm_service and len(document.tags) < 3:
+            try:
+                auto_tags = await self.llm_service.generate_tags(
+                    document.content[:2000],
+                    max_tags=5,
+                )
+            except Exception as e:
+                logger.warning("auto_tagging_failed", doc_id=document.id, error=str(e))
+        
+        return summary, auto_tags
+    
+    @staticmethod
+    def _apply_enrichment(document: Document, summary: Optional[str], auto_tags: List[str]) -> None:
+        if summary is not None:
+            document.summary = summary
+        if auto_tags:
+            document.tags = list(set(document.tags + auto_tags))
+    
+    async def _plan_index(
+        self,
+        document: Document,
+        existing_chunks: List[DocumentChunk],
+    ) -> "IndexPlan":
+        """
+        Chunk, diff and embed a document without touching the database
+        
+        New vectors are written to the vector store; chunk rows are left
+        to _apply_index.
+        """
+        doc_id = document.id
+        
+        # Step 1: Generate new chunks (before deleting old ones)
+        parent_chunks: List[TextChunk] = []
+        if self.parent_child_chunking:
+            # Small-to-big: only children are embedded; parents are
+            # stored in document_chunks and returned as prompt context
+            parent_chunks, text_chunks = self.document_processor.chunk_with_parents(
+                document.content,
+                parent_chunk_size=self.parent_chunk_size,
+                child_chunk_size=self.child_chunk_size,
+                child_overlap=self.document_processor.chunk_overlap,
+            )
+        elif hasattr(self.document_processor, 'chunk_text_async'):
+            text_chunks = await self.document_processor.chunk_text_async(document.content)
+        else:
+            text_chunks = self.document_processor.chunk_text(document.content)
+        
+        if not text_chunks:
+            # No content to index, just clean up old chunks
+            return IndexPlan(empty=True)
+        
+        # Step 2: Diff against stored chunks
+        # (rows with a parent are children; all others are top-level)
+        existing_children = [c for c in existing_chunks if c.parent_chunk_id]
+        existing_top = [c for c in existing_chunks if not c.parent_chunk_id]
+        if not self.incremental_indexing:
+            # Full replacement: nothing is kept, every stored chunk is removed
+            existing_children, existing_top = [], []
+        
+        parent_diff = ChunkDiff()
+        if parent_chunks:
+            parent_diff = self._diff_chunks(doc_id, existing_top, parent_chunks)
+            parent_ids = {c.chunk_index: c.id for c in parent_diff.kept + parent_diff.added}
+            diff = self._diff_chunks(doc_id, existing_children, text_chunks, parent_ids)
+        else:
+            diff = self._diff_chunks(doc_id, existing_top, text_chunks)
+            diff.removed.extend(existing_children)
+        if not self.incremental_indexing:
+            diff.removed = list(existing_chunks)
+        
+        metadatas = {
+            c.id: self._chunk_metadata(document, c)
+            for c in diff.kept + diff.added
+        }
+        
+        # Kept chunks whose vector is missing are re-added; stale metadata is refreshed
+        stored = {}
+        if diff.kept or parent_diff.kept:
+            stored = {
+                r["id"]: r["metadata"]
+                for r in await self.vector_store.get_by_ids(
+                    [c.id for c in diff.kept + parent_diff.kept]
+                )
+            }
+        # Parents aren't searchable: drop vectors left over from flat indexing
+        stale_vector_ids = [c.id for c in parent_diff.kept if c.id in stored]
+        to_embed = diff.added + [c for c in diff.kept if c.id not in stored]
+        to_refresh = [
+            c for c in diff.kept
+            if c.id in stored and stored[c.id] != metadatas[c.id]
+        ]
+        
+        # Step 3: Embed and store new content in batches (before deleting old)
+        stored_ids: List[str] = []
+        try:
+            for start in range(0, len(to_embed), self.embed_batch_size):
+                batch = to_embed[start:start + self.embed_batch_size]
+                embeddings = await self.embedding_service.embed_texts_array(
+                    [c.content for c in batch]
+                )
+                await self.vector_store.add_documents(
+                    ids=[c.id for c in batch],
+                    embeddings=embeddings,
+                    documents=[c.content for c in batch],
+                    metadatas=[metadatas[c.id] for c in batch],
+                )
+                stored_ids.extend(c.id for c in batch)
+        except Exception:
+            # Don't leave vectors behind for chunks that won't be saved
+            if stored_ids:
+                await self.vector_store.delete_by_ids(stored_ids)
+            raise
+        
+        return IndexPlan(
+            diff=diff,
+            parent_diff=parent_diff,
+            parents=len(parent_chunks),
+            embedded_ids=stored_ids,
+            stale_vector_ids=stale_vector_ids,
+            to_refresh=to_refresh,
+            metadatas=metadatas,
+        )
+    
+    async def _apply_index(self, document: Document, plan: "IndexPlan") -> None:
+        """Write a plan's chunk rows, drop removed vectors and mark the document indexed"""
+        doc_id = document.id
+        diff, parent_diff = plan.diff, plan.parent_diff
+        
+        if plan.empty:
+            await self.chunk_repo.delete_by_document(doc_id)
+            await self.vector_store.delete_by_document(doc_id)
+            document.mark_indexed()
+            await self.document_repo.update(document)
+            return
+        
+        # Step 4: Apply the diff - delete removed, insert added, update moved
+        removed_ids = [c.id for c in diff.removed + parent_diff.removed]
+        if removed_ids:
+            await self.chunk_repo.delete_by_ids(removed_ids)
+        if removed_ids or plan.stale_vector_ids:
+            await self.vector_store.delete_by_ids(removed_ids + plan.stale_vector_ids)
+        
+        added = parent_diff.added + diff.added
+        if added:
+            await self.chunk_repo.create_many(added)
+        moved = parent_diff.moved + diff.moved
+        if moved:
+            await self.chunk_repo.update_positions(moved)
+        
+        if plan.to_refresh:
+            await self.vector_store.update_metadata(
+                ids=[c.id for c in plan.to_refresh],
+                metadatas=[plan.metadatas[c.id] for c in plan.to_refresh],
+            )
+        
+        # Mark as indexed
+        document.mark_indexed()
+        await self.document_repo.update(document)
+        
+        logger.info(
+            "document_indexed",
+            doc_id=doc_id,
+            chunks=len(diff.kept) + len(diff.added),
+            parents=plan.parents,
+            added=len(diff.added),
+            removed=len(diff.removed),
+            unchanged=len(diff.kept),
+            embedded=len(plan.embedded_ids),
+            tags=document.tags,
+        )
+    
+    def invalidate_query_cache(self) -> None:
+        """
+        Drop cached retrieval results after an index write (call after commit)
+        
+        Bumping earlier would let a retrieval that misses the uncommitted
+        rows (e.g. new parent chunks) be cached under the new generation.
+        """
+        if self.query_cache_stale and self.query_cache is not None:
+            self.query_cache.bump()
+        self.query_cache_stale = False
+    
+    def _diff_chunks(
+        self,
+        doc_id: str,
+        existing_chunks: List[DocumentChunk],
+        text_chunks: List[TextChunk],
+        parent_ids: Optional[Dict[int, str]] = None,
+    ) -> "ChunkDiff":
+        """
+        Match new text chunks to stored chunks by content hash
+        
+        Identical content is matched in order (duplicates pair up one to one);
+        matched chunks keep their ID and get updated positions.
+        parent_ids maps a child's metadata["parent_index"] to its parent's ID.
+        """
+        available: Dict[str, List[DocumentChunk]] = defaultdict(list)
+        for chunk in existing_chunks:
+            available[chunk_content_hash(chunk.content)].append(chunk)
+        
+        diff = ChunkDiff()
+        for tc in text_chunks:
+            parent_id = parent_ids[tc.metadata["parent_index"]] if parent_ids else None
+            candidates = available.get(chunk_content_hash(tc.content))
+            if candidates:
+                chunk = candidates.pop(0)
+                if (chunk.chunk_index, chunk.start_char, chunk.end_char, chunk.parent_chunk_id) != (
+                    tc.chunk_index, tc.start_char, tc.end_char, parent_id
+                ):
+                    chunk.chunk_index = tc.chunk_index
+                    chunk.start_char = tc.start_char
+                    chunk.end_char = tc.end_char
+                    chunk.parent_chunk_id = parent_id
+                    diff.moved.append(chunk)
+                diff.kept.append(chunk)
             else:
-                text_chunks = self.document_processor.chunk_text(document.content)
-            
-            if not text_chunks:
-                # No content to index, just clean up old chunks
-                await self.chunk_repo.delete_by_document(doc_id)
-                await self.vector_store.delete_by_document(doc_id)
-                document.mark_indexed()
-                await self.document_repo.update(document)
-                return True
-            
-            # Step 2: Create new chunk entities
-            new_chunks = []
-            for tc in text_chunks:
-                chunk = DocumentChunk(
+                diff.added.append(DocumentChunk(
                     id=str(uuid.uuid4()),
                     document_id=doc_id,
                     content=tc.content,
                     chunk_index=tc.chunk_index,
                     start_char=tc.start_char,
                     end_char=tc.end_char,
-                )
-                new_chunks.append(chunk)
-            
-            # Step 3: Generate embeddings for new chunks (before deleting old)
-            chunk_texts = [c.content for c in new_chunks]
-            embeddings = await self.embedding_service.embed_texts(chunk_texts)
-            
-            # Prepare metadata
-            metadatas = [
-                {
-                    "document_id": doc_id,
-                    "document_title": document.title,
-                    "chunk_index": c.chunk_index,
-                    "tags": ",".join(document.tags),
-                }
-                for c in new_chunks
-            ]
-            
-            # Step 4: Atomic replacement - delete old + insert new
-            # Delete old chunks and vectors (now that new ones are ready)
-            await self.chunk_repo.delete_by_document(doc_id)
-            await self.vector_store.delete_by_document(doc_id)
-            
-            # Insert new chunks to database
-            await self.chunk_repo.create_many(new_chunks)
-            
-            # Insert new vectors to ChromaDB
-            await self.vector_store.add_documents(
-                ids=[c.id for c in new_chunks],
-                embeddings=embeddings,
-                documents=chunk_texts,
-                metadatas=metadatas,
-            )
-            
-            # Mark as indexed
-            document.mark_indexed()
-            await self.document_repo.update(document)
-            
-            logger.info(
-                "document_indexed",
-                doc_id=doc_id,
-                chunks=len(new_chunks),
-                tags=document.tags,
-            )
-            return True
-            
-        except Exception as e:
-            logger.error("document_indexing_failed", doc_id=doc_id, error=str(e))
-            document.mark_failed()
-            await self.document_repo.update(document)
-            raise
+                    parent_chunk_id=parent_id,
+                ))
+        
+        diff.removed = [c for chunks in available.values() for c in chunks]
+        return diff
+    
+    @staticmethod
+    def _chunk_metadata(document: Document, chunk: DocumentChunk) -> Dict[str, Any]:
+        """Vector store metadata for a chunk"""
+        metadata = {
+            "document_id": document.id,
+            "document_title": document.title,
+            "chunk_index": chunk.chunk_index,
+            "tags": ",".join(document.tags),
+        }
+        if chunk.parent_chunk_id:
+            metadata["parent_id"] = chunk.parent_chunk_id
+        return metadata
     
     async def get_linked_documents(self, doc_id: str) -> Dict[str, List[Document]]:
         """Get documents linked to/from this document"""
         return await self.document_repo.get_linked_documents(doc_id)
     
-    async def _update_incoming_links(self, document: Document) -> None:
-        """Update incoming links for all documents linked from this one"""
-        for link_title in document.outgoing_links:
-            linked_doc = await self.document_repo.get_by_title(link_title)
-            if linked_doc:
-                linked_doc.add_incoming_link(document.id)
-                await self.document_repo.update(linked_doc)
-    
     async def get_stats(self, user_id: Optional[str] = None) -> Dict[str, Any]:
         """Get document statistics"""
         total_docs = await self.document_repo.count(user_id)
@@ -97,6 +97,29 @@ class Document:
             self.incoming_links.append(doc_id)
 
 
+@dataclass
+class DocumentSummary:
+    """
+    Read model for document lists
+    Every Document field except content, which list queries never load
+    """
+    id: str
+    title: str = ""
+    doc_type: DocumentType = DocumentType.MARKDOWN
+    status: DocumentStatus = DocumentStatus.PENDING
+    file_path: Optional[str] = None
+    file_size: int = 0
+    word_count: int = 0
+    outgoing_links: List[str] = field(default_factory=list)
+    incoming_links: List[str] = field(default_factory=list)
+    tags: List[str] = field(default_factory=list)
+    summary: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    updated_at: datetime = field(default_factory=datetime.utcnow)
+    indexed_at: Optional[datetime] = None
+    user_id: Optional[str] = None
+
+
 @dataclass
 class DocumentChunk:
     """
@@ -3,9 +3,11 @@ Repository Interfaces - Abstract base classes for data access
 Following the Repository Pattern for clean architecture
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from src.domain.entities.document import (
     Document, 
+    DocumentSummary,
     DocumentChunk, 
     Conversation, 
     Message,
@@ -32,14 +34,49 @@ class DocumentRepository(ABC):
         """Get document by title (for wiki-links)"""
         pass
     
+    @abstractmethod
+    async def get_by_ids(self, doc_ids: List[str]) -> List[Document]:
+        """Get documents by ID in one query (missing IDs are skipped)"""
+        pass
+    
+    @abstractmethod
+    async def get_by_titles(self, titles: List[str]) -> List[Document]:
+        """Get documents by title in one query (for wiki-links)"""
+        pass
+    
+    @abstractmethod
+    async def get_fields_by_ids(
+        self, doc_ids: List[str], fields: Sequence[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get only the named columns for documents in one query, keyed by ID
+        (use instead of get_by_ids when the full content isn't needed)
+        """
+        pass
+    
     @abstractmethod
     async def get_all(
         self, 
         user_id: Optional[str] = None,
         skip: int = 0, 
-        limit: int = 100
+        limit: int = 100,
+        after: Optional[Tuple[datetime, str]] = None,
     ) -> List[Document]:
-        """Get all documents with pagination"""
+        """
+        Get documents, newest update first
+        Pass the (updated_at, id) of the last row seen as after for keyset paging
+        """
+        pass
+    
+    @abstractmethod
+    async def get_summaries(
+        self,
+        user_id: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, str]] = None,
+    ) -> List[DocumentSummary]:
+        """Same as get_all without loading content"""
         pass
     
     @abstractmethod
@@ -57,6 +94,16 @@ class DocumentRepository(ABC):
         """Full-text search by title"""
         pass
     
+    @abstractmethod
+    async def search_summaries(self, query: str, limit: int = 10) -> List[DocumentSummary]:
+        """Same as search_by_title without loading content"""
+        pass
+    
+    @abstractmethod
+    async def get_summaries_by_tag(self, tag: str, limit: int = 100) -> List[DocumentSummary]:
+        """Same as get_by_tag without loading content"""
+        pass
+    
     @abstractmethod
     async def get_by_tag(self, tag: str, limit: int = 100) -> List[Document]:
         """Get documents by tag"""
@@ -86,10 +133,49 @@ class ChunkRepository(ABC):
         """Get all chunks for a document"""
         pass
     
+    @abstractmethod
+    async def get_by_ids(self, chunk_ids: List[str]) -> List[DocumentChunk]:
+        """Get chunks by ID in one query (missing IDs are skipped)"""
+        pass
+    
     @abstractmethod
     async def delete_by_document(self, doc_id: str) -> int:
         """Delete all chunks for a document"""
         pass
+    
+    @abstractmethod
+    async def delete_by_ids(self, chunk_ids: List[str]) -> int:
+        """Delete chunks by ID"""
+        pass
+    
+    @abstractmethod
+    async def update_positions(self, chunks: List[DocumentChunk]) -> None:
+        """Update chunk_index/start_char/end_char/parent_chunk_id of existing chunks"""
+        pass
+
+
+class IndexingJobRepository(ABC):
+    """Abstract repository for pending indexing jobs (outbox)"""
+    
+    @abstractmethod
+    async def add(self, doc_id: str) -> None:
+        """Record (or refresh) a pending indexing job for a document"""
+        pass
+    
+    @abstractmethod
+    async def complete(self, doc_id: str, started_at: datetime) -> None:
+        """Remove a job unless it was re-enqueued after started_at"""
+        pass
+    
+    @abstractmethod
+    async def exists(self, doc_id: str) -> bool:
+        """Check whether a document has a pending indexing job"""
+        pass
+    
+    @abstractmethod
+    async def get_pending(self, limit: int = 1000) -> List[str]:
+        """Get document IDs with pending jobs, oldest first"""
+        pass
 
 
 class ConversationRepository(ABC):
@@ -110,9 +196,10 @@ class ConversationRepository(ABC):
         self, 
         user_id: Optional[str] = None,
         skip: int = 0, 
-        limit: int = 50
+        limit: int = 50,
+        after: Optional[Tuple[datetime, str]] = None,
     ) -> List[Conversation]:
-        """Get all conversations"""
+        """Get conversations, newest update first (after = last (updated_at, id) seen)"""
         pass
     
     @abstractmethod
@@ -133,9 +220,15 @@ class MessageRepository(ABC):
     async def get_by_conversation(
         self, 
         conv_id: str,
-        limit: int = 50
+        limit: int = 50,
+        after: Optional[Tuple[datetime, str]] = None,
     ) -> List[Message]:
-        """Get messages for a conversation"""
+        """Get messages for a conversation, oldest first (after = last (created_at, id) seen)"""
+        pass
+    
+    @abstractmethod
+    async def get_recent(self, conv_id: str, limit: int = 10) -> List[Message]:
+        """Get the newest messages of a conversation, in chronological order"""
         pass
     
     @abstractmethod
@@ -171,6 +264,11 @@ class TagRepository(ABC):
     async def update_count(self, name: str, delta: int) -> None:
         """Update document count for a tag"""
         pass
+    
+    @abstractmethod
+    async def update_counts(self, deltas: Dict[str, int]) -> None:
+        """Apply count deltas for many tags at once, creating tags on increment"""
+        pass
 
 
 class UserRepository(ABC):
@@ -6,6 +6,7 @@ import os
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -15,6 +16,16 @@ from sqlalchemy.pool import StaticPool
 
 from src.infrastructure.database.models import Base
 
+SQLITE_BUSY_TIMEOUT_MS = 5000  # How long a writer waits for the SQLite write lock
+
+
+def _configure_sqlite_connection(dbapi_connection, connection_record) -> None:
+    """WAL lets readers run alongside a writer; busy_timeout queues writers"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
 
 class DatabaseManager:
     """
@@ -36,8 +47,13 @@ class DatabaseManager:
         connect_args = {}
         poolclass = None
         
-        if "sqlite" in database_url:
+        is_sqlite = "sqlite" in database_url
+        in_memory = is_sqlite and (":memory:" in database_url or database_url.endswith("://"))
+        
+        if is_sqlite:
             connect_args = {"check_same_thread": False}
+        if in_memory:
+            # An in-memory database only exists on its one connection
             poolclass = StaticPool
         
         self.engine = create_async_engine(
@@ -47,6 +63,11 @@ class DatabaseManager:
             poolclass=poolclass,
         )
         
+        # File-backed SQLite gets a real pool, so each session has its own
+        # connection and transaction (background indexing runs beside requests)
+        if is_sqlite and not in_memory:
+            event.listen(self.engine.sync_engine, "connect", _configure_sqlite_connection)
+        
         # Create session factory
         self.async_session_factory = async_sessionmaker(
             bind=self.engine,
@@ -48,9 +48,9 @@ class DocumentModel(Base):
     file_size = Column(Integer, default=0)
     word_count = Column(Integer, default=0)
     
-    # JSON fields for lists
+    # JSON fields keep list order; document_tags and document_links are
+    # the indexed copies used for lookups (incoming links are derived)
     outgoing_links = Column(JSON, default=list)
-    incoming_links = Column(JSON, default=list)
     tags = Column(JSON, default=list)
     
     # AI-generated
@@ -71,8 +71,10 @@ class DocumentModel(Base):
     # Indexes for search
     __table_args__ = (
         Index("idx_document_title_search", "title"),
-        Index("idx_document_user_id", "user_id"),
+        Index("idx_document_user_id", "user_id", "updated_at", "id"),
         Index("idx_document_status", "status"),
+        # Keyset pagination on (updated_at, id)
+        Index("idx_document_updated", "updated_at", "id"),
     )
 
 
@@ -100,6 +102,44 @@ class DocumentChunkModel(Base):
     )
 
 
+class DocumentTagModel(Base):
+    """Document-tag association (indexed copy of DocumentModel.tags)"""
+    __tablename__ = "document_tags"
+    
+    document_id = Column(String(36), ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String(100), primary_key=True)
+    
+    __table_args__ = (
+        Index("idx_document_tags_tag", "tag", "document_id"),
+    )
+
+
+class DocumentLinkModel(Base):
+    """
+    Wiki-link from a document to a title (indexed copy of outgoing_links)
+    Targets are titles so links to notes that don't exist yet resolve once created
+    """
+    __tablename__ = "document_links"
+    
+    source_id = Column(String(36), ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True)
+    target_title = Column(String(500), primary_key=True)
+    
+    __table_args__ = (
+        Index("idx_document_links_target", "target_title", "source_id"),
+    )
+
+
+class IndexingJobModel(Base):
+    """
+    Pending indexing job (transactional outbox)
+    Written in the same transaction as the document so queued work survives restarts
+    """
+    __tablename__ = "indexing_jobs"
+    
+    document_id = Column(String(36), ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True)
+    enqueued_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 class ConversationModel(Base):
     """Conversation database model"""
     __tablename__ = "conversations"
@@ -114,6 +154,12 @@ class ConversationModel(Base):
     # Relationships
     messages = relationship("MessageModel", back_populates="conversation", cascade="all, delete-orphan")
     user = relationship("UserModel", back_populates="conversations")
+    
+    # Keyset pagination on (updated_at, id)
+    __table_args__ = (
+        Index("idx_conversation_updated", "updated_at", "id"),
+        Index("idx_conversation_user_updated", "user_id", "updated_at", "id"),
+    )
 
 
 class MessageModel(Base):
@@ -135,7 +181,7 @@ class MessageModel(Base):
     conversation = relationship("ConversationModel", back_populates="messages")
     
     __table_args__ = (
-        Index("idx_message_conversation_id", "conversation_id"),
+        Index("idx_message_conversation_id", "conversation_id", "created_at", "id"),
     )
 
 
@@ -2,26 +2,33 @@
 Repository Implementations
 Concrete implementations of repository interfaces using SQLAlchemy
 """
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict, Sequence, Tuple
 from datetime import datetime
 
-from sqlalchemy import select, delete, func, or_
+from sqlalchemy import select, insert, delete, update, func, or_, case, tuple_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
 from src.domain.entities.document import (
-    Document, DocumentType, DocumentStatus,
+    Document, DocumentSummary, DocumentType, DocumentStatus,
     DocumentChunk, Conversation, Message, Tag, User
 )
 from src.domain.repositories.interfaces import (
-    DocumentRepository, ChunkRepository, ConversationRepository,
-    MessageRepository, TagRepository, UserRepository
+    DocumentRepository, ChunkRepository, IndexingJobRepository,
+    ConversationRepository, MessageRepository, TagRepository, UserRepository
 )
 from src.infrastructure.database.models import (
-    DocumentModel, DocumentChunkModel, ConversationModel,
-    MessageModel, TagModel, UserModel,
+    DocumentModel, DocumentChunkModel, DocumentTagModel, DocumentLinkModel,
+    IndexingJobModel, ConversationModel, MessageModel, TagModel, UserModel,
     DocumentTypeEnum, DocumentStatusEnum
 )
 
+# List queries skip the content column; touching it on such a row raises
+# instead of lazy-loading (which async sessions can't do implicitly)
+_DEFER_CONTENT = defer(DocumentModel.content, raiseload=True)
+
 
 class SQLAlchemyDocumentRepository(DocumentRepository):
     """SQLAlchemy implementation of DocumentRepository"""
@@ -29,7 +36,9 @@ class SQLAlchemyDocumentRepository(DocumentRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
     
-    def _to_entity(self, model: DocumentModel) -> Document:
+    def _to_entity(
+        self, model: DocumentModel, incoming_links: Optional[List[str]] = None
+    ) -> Document:
         """Convert ORM model to domain entity"""
         return Document(
             id=model.id,
@@ -41,7 +50,7 @@ class SQLAlchemyDocumentRepository(DocumentRepository):
             file_size=model.file_size,
             word_count=model.word_count,
             outgoing_links=model.outgoing_links or [],
-            incoming_links=model.incoming_links or [],
+            incoming_links=incoming_links or [],
             tags=model.tags or [],
             summary=model.summary,
             created_at=model.created_at,
@@ -62,7 +71,6 @@ class SQLAlchemyDocumentRepository(DocumentRepository):
             file_size=entity.file_size,
             word_count=entity.word_count,
             outgoing_links=entity.outgoing_links,
-            incoming_links=entity.incoming_links,
             tags=entity.tags,
             summary=entity.summary,
             created_at=entity.created_at,
@@ -71,39 +79,178 @@ class SQLAlchemyDocumentRepository(DocumentRepository):
             user_id=entity.user_id,
         )
     
+    def _to_summary(self, model: DocumentModel, incoming_links: List[str]) -> DocumentSummary:
+        """Convert ORM model to list read model (never touches content)"""
+        return DocumentSummary(
+            id=model.id,
+            title=model.title,
+            doc_type=DocumentType(model.doc_type.value),
+            status=DocumentStatus(model.status.value),
+            file_path=model.file_path,
+            file_size=model.file_size,
+            word_count=model.word_count,
+            outgoing_links=model.outgoing_links or [],
+            incoming_links=incoming_links,
+            tags=model.tags or [],
+            summary=model.summary,
+            created_at=model.created_at,
+            updated_at=model.updated_at,
+            indexed_at=model.indexed_at,
+            user_id=model.user_id,
+        )
+    
+    async def _incoming_links(self, models: List[DocumentModel]) -> Dict[str, List[str]]:
+        """Derive incoming links for a batch of models with one indexed query"""
+        result = await self.session.execute(
+            select(DocumentLinkModel.target_title, DocumentLinkModel.source_id)
+            .where(DocumentLinkModel.target_title.in_({m.title for m in models}))
+            .order_by(DocumentLinkModel.target_title, DocumentLinkModel.source_id)
+        )
+        incoming: Dict[str, List[str]] = {}
+        for title, source_id in result.all():
+            incoming.setdefault(title, []).append(source_id)
+        return incoming
+    
+    async def _to_entities(self, models: List[DocumentModel]) -> List[Document]:
+        """Convert ORM models, deriving incoming links with one indexed query"""
+        if not models:
+            return []
+        incoming = await self._incoming_links(models)
+        return [
+            self._to_entity(m, [s for s in incoming.get(m.title, []) if s != m.id])
+            for m in models
+        ]
+    
+    async def _to_summaries(self, models: List[DocumentModel]) -> List[DocumentSummary]:
+        if not models:
+            return []
+        incoming = await self._incoming_links(models)
+        return [
+            self._to_summary(m, [s for s in incoming.get(m.title, []) if s != m.id])
+            for m in models
+        ]
+    
+    async def _sync_associations(
+        self, doc_id: str, tags: List[str], outgoing_links: List[str], replace: bool = True
+    ) -> None:
+        """Rewrite the document_tags and document_links rows for one document"""
+        if replace:
+            await self.session.execute(
+                delete(DocumentTagModel).where(DocumentTagModel.document_id == doc_id)
+            )
+            await self.session.execute(
+                delete(DocumentLinkModel).where(DocumentLinkModel.source_id == doc_id)
+            )
+        
+        tag_rows = [{"document_id": doc_id, "tag": t} for t in dict.fromkeys(tags or [])]
+        link_rows = [
+            {"source_id": doc_id, "target_title": t}
+            for t in dict.fromkeys(outgoing_links or [])
+        ]
+        if tag_rows:
+            await self.session.execute(insert(DocumentTagModel), tag_rows)
+        if link_rows:
+            await self.session.execute(insert(DocumentLinkModel), link_rows)
+    
     async def create(self, document: Document) -> Document:
         model = self._to_model(document)
         self.session.add(model)
         await self.session.flush()
-        return self._to_entity(model)
+        await self._sync_associations(
+            model.id, document.tags, document.outgoing_links, replace=False
+        )
+        return (await self._to_entities([model]))[0]
     
     async def get_by_id(self, doc_id: str) -> Optional[Document]:
         result = await self.session.execute(
             select(DocumentModel).where(DocumentModel.id == doc_id)
         )
         model = result.scalar_one_or_none()
-        return self._to_entity(model) if model else None
+        return (await self._to_entities([model]))[0] if model else None
     
     async def get_by_title(self, title: str) -> Optional[Document]:
         result = await self.session.execute(
             select(DocumentModel).where(DocumentModel.title == title)
         )
         model = result.scalar_one_or_none()
-        return self._to_entity(model) if model else None
+        return (await self._to_entities([model]))[0] if model else None
+    
+    async def get_by_ids(self, doc_ids: List[str]) -> List[Document]:
+        if not doc_ids:
+            return []
+        result = await self.session.execute(
+            select(DocumentModel).where(DocumentModel.id.in_(set(doc_ids)))
+        )
+        return await self._to_entities(result.scalars().all())
+    
+    async def get_fields_by_ids(
+        self, doc_ids: List[str], fields: Sequence[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        columns = DocumentModel.__table__.columns
+        unknown = [f for f in fields if f not in columns]
+        if unknown:
+            raise ValueError(f"Unknown document fields: {', '.join(unknown)}")
+        if not doc_ids:
+            return {}
+        
+        names = list(dict.fromkeys(["id", *fields]))
+        result = await self.session.execute(
+            select(*(columns[n] for n in names)).where(DocumentModel.id.in_(set(doc_ids)))
+        )
+        return {
+            row.id: {n: row._mapping[n] for n in names if n in fields}
+            for row in result
+        }
+    
+    async def get_by_titles(self, titles: List[str]) -> List[Document]:
+        if not titles:
+            return []
+        result = await self.session.execute(
+            select(DocumentModel).where(DocumentModel.title.in_(set(titles)))
+        )
+        return await self._to_entities(result.scalars().all())
+    
+    def _list_query(
+        self,
+        user_id: Optional[str],
+        skip: int,
+        limit: int,
+        after: Optional[Tuple[datetime, str]],
+    ):
+        query = select(DocumentModel)
+        if user_id:
+            query = query.where(DocumentModel.user_id == user_id)
+        if after:
+            # Keyset seek on (updated_at, id), served by idx_document_updated
+            query = query.where(tuple_(DocumentModel.updated_at, DocumentModel.id) < after)
+        query = (
+            query.order_by(DocumentModel.updated_at.desc(), DocumentModel.id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return query
     
     async def get_all(
         self, 
         user_id: Optional[str] = None,
         skip: int = 0, 
-        limit: int = 100
+        limit: int = 100,
+        after: Optional[Tuple[datetime, str]] = None,
     ) -> List[Document]:
-        query = select(DocumentModel).offset(skip).limit(limit)
-        if user_id:
-            query = query.where(DocumentModel.user_id == user_id)
-        query = query.order_by(DocumentModel.updated_at.desc())
-        
-        result = await self.session.execute(query)
-        return [self._to_entity(m) for m in result.scalars().all()]
+        result = await self.session.execute(self._list_query(user_id, skip, limit, after))
+        return await self._to_entities(result.scalars().all())
+    
+    async def get_summaries(
+        self,
+        user_id: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, str]] = None,
+    ) -> List[DocumentSummary]:
+        result = await self.session.execute(
+            self._list_query(user_id, skip, limit, after).options(_DEFER_CONTENT)
+        )
+        return await self._to_summaries(result.scalars().all())
     
     async def update(self, document: Document) -> Document:
         result = await self.session.execute(
@@ -113,6 +260,11 @@ class SQLAlchemyDocumentRepository(DocumentRepository):
         if not model:
             raise ValueError(f"Document {document.id} not found")
         
+        associations_changed = (
+            (model.tags or []) != document.tags
+            or (model.outgoing_links or []) != document.outgoing_links
+        )
+        
         model.title = document.title
         model.content = document.content
         model.doc_type = DocumentTypeEnum(document.doc_type.value)
@@ -121,55 +273,88 @@ class SQLAlchemyDocumentRepository(DocumentRepository):
         model.file_size = document.file_size
         model.word_count = document.word_count
         model.outgoing_links = document.outgoing_links
-        model.incoming_links = document.incoming_links
         model.tags = document.tags
         model.summary = document.summary
         model.updated_at = datetime.utcnow()
         model.indexed_at = document.indexed_at
         
         await self.session.flush()
-        return self._to_entity(model)
+        if associations_changed:
+            await self._sync_associations(model.id, document.tags, document.outgoing_links)
+        return (await self._to_entities([model]))[0]
     
     async def delete(self, doc_id: str) -> bool:
+        # SQLite doesn't enforce ON DELETE CASCADE unless foreign keys are enabled
+        await self._sync_associations(doc_id, [], [])
         result = await self.session.execute(
             delete(DocumentModel).where(DocumentModel.id == doc_id)
         )
         return result.rowcount > 0
     
-    async def search_by_title(self, query: str, limit: int = 10) -> List[Document]:
-        result = await self.session.execute(
+    def _title_search_query(self, query: str, limit: int):
+        return select(DocumentModel).where(DocumentModel.title.ilike(f"%{query}%")).limit(limit)
+    
+    def _tag_query(self, tag: str, limit: int):
+        return (
             select(DocumentModel)
-            .where(DocumentModel.title.ilike(f"%{query}%"))
+            .join(DocumentTagModel, DocumentTagModel.document_id == DocumentModel.id)
+            .where(DocumentTagModel.tag == tag)
             .limit(limit)
         )
-        return [self._to_entity(m) for m in result.scalars().all()]
     
-    async def get_by_tag(self, tag: str, limit: int = 100) -> List[Document]:
-        # SQLite JSON query - for production consider PostgreSQL with proper JSON support
+    async def search_by_title(self, query: str, limit: int = 10) -> List[Document]:
+        result = await self.session.execute(self._title_search_query(query, limit))
+        return await self._to_entities(result.scalars().all())
+    
+    async def search_summaries(self, query: str, limit: int = 10) -> List[DocumentSummary]:
         result = await self.session.execute(
-            select(DocumentModel)
-            .where(DocumentModel.tags.contains([tag]))
-            .limit(limit)
+            self._title_search_query(query, limit).options(_DEFER_CONTENT)
         )
-        return [self._to_entity(m) for m in result.scalars().all()]
+        return await self._to_summaries(result.scalars().all())
+    
+    async def get_by_tag(self, tag: str, limit: int = 100) -> List[Document]:
+        result = await self.session.execute(self._tag_query(tag, limit))
+        return await self._to_entities(result.scalars().all())
+    
+    async def get_summaries_by_tag(self, tag: str, limit: int = 100) -> List[DocumentSummary]:
+        result = await self.session.execute(self._tag_query(tag, limit).options(_DEFER_CONTENT))
+        return await self._to_summaries(result.scalars().all())
     
     async def get_linked_documents(self, doc_id: str) -> Dict[str, List[Document]]:
         doc = await self.get_by_id(doc_id)
         if not doc:
             return {"outgoing": [], "incoming": []}
         
-        outgoing = []
-        incoming = []
+        # Outgoing links hold wiki-link titles, incoming links hold document IDs;
+        # resolve both with a single query instead of one lookup per link
+        outgoing_keys = set(doc.outgoing_links)
+        incoming_ids = set(doc.incoming_links)
+        if not outgoing_keys and not incoming_ids:
+            return {"outgoing": [], "incoming": []}
         
-        for link_id in doc.outgoing_links:
-            linked = await self.get_by_id(link_id)
-            if linked:
-                outgoing.append(linked)
+        result = await self.session.execute(
+            select(DocumentModel).where(
+                or_(
+                    DocumentModel.title.in_(outgoing_keys),
+                    DocumentModel.id.in_(outgoing_keys | incoming_ids),
+                )
+            )
+        )
+        linked = await self._to_entities(result.scalars().all())
+        by_id = {d.id: d for d in linked}
+        by_title: Dict[str, Document] = {}
+        for d in linked:
+            by_title.setdefault(d.title, d)
+        
+        outgoing = []
+        seen = set()
+        for link in doc.outgoing_links:
+            target = by_title.get(link) or by_id.get(link)
+            if target and target.id not in seen:
+                seen.add(target.id)
+                outgoing.append(target)
         
-        for link_id in doc.incoming_links:
-            linked = await self.get_by_id(link_id)
-            if linked:
-                incoming.append(linked)
+        incoming = [by_id[i] for i in doc.incoming_links if i in by_id]
         
         return {"outgoing": outgoing, "incoming": incoming}
     
@@ -225,11 +410,82 @@ class SQLAlchemyChunkRepository(ChunkRepository):
         )
         return [self._to_entity(m) for m in result.scalars().all()]
     
+    async def get_by_ids(self, chunk_ids: List[str]) -> List[DocumentChunk]:
+        if not chunk_ids:
+            return []
+        result = await self.session.execute(
+            select(DocumentChunkModel).where(DocumentChunkModel.id.in_(chunk_ids))
+        )
+        return [self._to_entity(m) for m in result.scalars().all()]
+    
     async def delete_by_document(self, doc_id: str) -> int:
         result = await self.session.execute(
             delete(DocumentChunkModel).where(DocumentChunkModel.document_id == doc_id)
         )
         return result.rowcount
+    
+    async def delete_by_ids(self, chunk_ids: List[str]) -> int:
+        if not chunk_ids:
+            return 0
+        result = await self.session.execute(
+            delete(DocumentChunkModel).where(DocumentChunkModel.id.in_(chunk_ids))
+        )
+        return result.rowcount
+    
+    async def update_positions(self, chunks: List[DocumentChunk]) -> None:
+        if not chunks:
+            return
+        # Bulk UPDATE by primary key (executemany)
+        await self.session.execute(
+            update(DocumentChunkModel),
+            [
+                {
+                    "id": c.id,
+                    "chunk_index": c.chunk_index,
+                    "start_char": c.start_char,
+                    "end_char": c.end_char,
+                    "parent_chunk_id": c.parent_chunk_id,
+                }
+                for c in chunks
+            ],
+        )
+
+
+class SQLAlchemyIndexingJobRepository(IndexingJobRepository):
+    """SQLAlchemy implementation of IndexingJobRepository"""
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def add(self, doc_id: str) -> None:
+        model = await self.session.get(IndexingJobModel, doc_id)
+        if model:
+            model.enqueued_at = datetime.utcnow()
+        else:
+            self.session.add(IndexingJobModel(document_id=doc_id, enqueued_at=datetime.utcnow()))
+        await self.session.flush()
+    
+    async def complete(self, doc_id: str, started_at: datetime) -> None:
+        await self.session.execute(
+            delete(IndexingJobModel).where(
+                IndexingJobModel.document_id == doc_id,
+                IndexingJobModel.enqueued_at <= started_at,
+            )
+        )
+    
+    async def exists(self, doc_id: str) -> bool:
+        result = await self.session.execute(
+            select(IndexingJobModel.document_id).where(IndexingJobModel.document_id == doc_id)
+        )
+        return result.scalar_one_or_none() is not None
+    
+    async def get_pending(self, limit: int = 1000) -> List[str]:
+        result = await self.session.execute(
+            select(IndexingJobModel.document_id)
+            .order_by(IndexingJobModel.enqueued_at.asc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
 
 
 class SQLAlchemyConversationRepository(ConversationRepository):
@@ -270,12 +526,21 @@ class SQLAlchemyConversationRepository(ConversationRepository):
         self, 
         user_id: Optional[str] = None,
         skip: int = 0, 
-        limit: int = 50
+        limit: int = 50,
+        after: Optional[Tuple[datetime, str]] = None,
     ) -> List[Conversation]:
-        query = select(ConversationModel).offset(skip).limit(limit)
+        query = select(ConversationModel)
         if user_id:
             query = query.where(ConversationModel.user_id == user_id)
-        query = query.order_by(ConversationModel.updated_at.desc())
+        if after:
+            query = query.where(
+                tuple_(ConversationModel.updated_at, ConversationModel.id) < after
+            )
+        query = (
+            query.order_by(ConversationModel.updated_at.desc(), ConversationModel.id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
         
         result = await self.session.execute(query)
         return [self._to_entity(m) for m in result.scalars().all()]
@@ -323,15 +588,26 @@ class SQLAlchemyMessageRepository(MessageRepository):
     async def get_by_conversation(
         self, 
         conv_id: str,
-        limit: int = 50
+        limit: int = 50,
+        after: Optional[Tuple[datetime, str]] = None,
     ) -> List[Message]:
+        query = select(MessageModel).where(MessageModel.conversation_id == conv_id)
+        if after:
+            query = query.where(tuple_(MessageModel.created_at, MessageModel.id) > after)
+        result = await self.session.execute(
+            query.order_by(MessageModel.created_at.asc(), MessageModel.id.asc()).limit(limit)
+        )
+        return [self._to_entity(m) for m in result.scalars().all()]
+    
+    async def get_recent(self, conv_id: str, limit: int = 10) -> List[Message]:
+        # Reads backwards along idx_message_conversation_id, then restores order
         result = await self.session.execute(
             select(MessageModel)
             .where(MessageModel.conversation_id == conv_id)
-            .order_by(MessageModel.created_at.asc())
+            .order_by(MessageModel.created_at.desc(), MessageModel.id.desc())
             .limit(limit)
         )
-        return [self._to_entity(m) for m in result.scalars().all()]
+        return [self._to_entity(m) for m in reversed(result.scalars().all())]
     
     async def delete_by_conversation(self, conv_id: str) -> int:
         result = await self.session.execute(
@@ -396,6 +672,52 @@ class SQLAlchemyTagRepository(TagRepository):
         if model:
             model.document_count = max(0, model.document_count + delta)
             await self.session.flush()
+    
+    async def update_counts(self, deltas: Dict[str, int]) -> None:
+        """
+        Bulk tag count maintenance
+        
+        Increments are one INSERT ... ON CONFLICT (name) DO UPDATE (SQLite and
+        PostgreSQL share the syntax); decrements are one UPDATE and never
+        create tags or drop counts below zero.
+        """
+        merged: Dict[str, int] = {}
+        for name, delta in deltas.items():
+            merged[name.lower()] = merged.get(name.lower(), 0) + delta
+        increments = {name: d for name, d in merged.items() if d > 0}
+        decrements = {name: d for name, d in merged.items() if d < 0}
+        
+        if increments:
+            dialect_insert = (
+                postgresql_insert
+                if self.session.get_bind().dialect.name == "postgresql"
+                else sqlite_insert
+            )
+            stmt = dialect_insert(TagModel).values([
+                {
+                    "id": tag.id,
+                    "name": tag.name,
+                    "color": tag.color,
+                    "document_count": tag.document_count,
+                    "created_at": tag.created_at,
+                }
+                for tag in (Tag(name=name, document_count=d) for name, d in increments.items())
+            ])
+            await self.session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[TagModel.name],
+                    set_={"document_count": TagModel.document_count + stmt.excluded.document_count},
+                )
+            )
+        
+        if decrements:
+            new_count = TagModel.document_count + case(decrements, value=TagModel.name, else_=0)
+            await self.session.execute(
+                update(TagModel)
+                .where(TagModel.name.in_(list(decrements)))
+                .values(document_count=case((new_count < 0, 0), else_=new_count))
+                .execution_options(synchronize_session=False)
+            )
 
 
 class SQLAlchemyUserRepository(UserRepository):
@@ -4,10 +4,11 @@ Handles document parsing, chunking, and link extraction
 """
 import re
 import asyncio
-from typing import List, Tuple, Optional, Dict, Any, Callable
+from typing import List, Tuple, Optional, Dict, Any, AsyncIterator, Callable, Iterator, Sequence
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from functools import partial
+import numpy as np
 import structlog
 
 logger = structlog.get_logger()
@@ -17,6 +18,7 @@ logger = structlog.get_logger()
 # ProcessPool: For pure Python CPU-intensive work
 _thread_executor: Optional[ThreadPoolExecutor] = None
 _process_executor: Optional[ProcessPoolExecutor] = None
+_process_workers = 0
 
 def get_thread_executor(max_workers: int = 4) -> ThreadPoolExecutor:
     """Get or create thread pool executor"""
@@ -28,21 +30,27 @@ def get_thread_executor(max_workers: int = 4) -> ThreadPoolExecutor:
 
 def get_process_executor(max_workers: int = 2) -> ProcessPoolExecutor:
     """Get or create process pool executor"""
-    global _process_executor
+    global _process_executor, _process_workers
     if _process_executor is None:
         _process_executor = ProcessPoolExecutor(max_workers=max_workers)
+        _process_workers = max_workers
         logger.info("process_pool_created", max_workers=max_workers)
     return _process_executor
 
+def get_process_workers() -> int:
+    """Worker count of the process pool (0 until it is created)"""
+    return _process_workers
+
 def shutdown_executors():
     """Shutdown executors gracefully (call on app shutdown)"""
-    global _thread_executor, _process_executor
+    global _thread_executor, _process_executor, _process_workers
     if _thread_executor:
         _thread_executor.shutdown(wait=True)
         _thread_executor = None
     if _process_executor:
         _process_executor.shutdown(wait=True)
         _process_executor = None
+        _process_workers = 0
     logger.info("executors_shutdown")
 
 
@@ -56,6 +64,104 @@ class TextChunk:
     metadata: Dict[str, Any] = None
 
 
+_NON_WHITESPACE = re.compile(r"\S")
+
+# Separators in order of preference ("" = character-level split)
+DEFAULT_SEPARATORS: Tuple[str, ...] = ("\n\n", "\n", ". ", "。", "! ", "? ", "; ", ", ", " ", "")
+
+
+def split_spans(
+    text: str,
+    chunk_size: int,
+    separators: Sequence[str] = DEFAULT_SEPARATORS,
+    start: int = 0,
+    end: Optional[int] = None,
+) -> List[Tuple[int, int]]:
+    """
+    Recursive character splitting over offsets into text
+    
+    Splits text[start:end] on the first separator present, merges adjacent
+    pieces up to chunk_size and recurses into oversized pieces with the next
+    separator. Only oversized spans are ever searched again, separators are
+    addressed by level instead of re-slicing the list, and no substrings are
+    built: callers slice text with the returned spans.
+    
+    Returns:
+        List of (start_char, end_char) spans; whitespace-only pieces are dropped
+    """
+    if end is None:
+        end = len(text)
+    spans: List[Tuple[int, int]] = []
+    has_text = _NON_WHITESPACE.search
+    find = text.find
+    last_level = len(separators) - 1
+    
+    def split(span_start: int, span_end: int, level: int) -> None:
+        if span_end - span_start <= chunk_size:
+            if has_text(text, span_start, span_end):
+                spans.append((span_start, span_end))
+            return
+        
+        # First separator present in this span ("" always applies)
+        while level < last_level and find(separators[level], span_start, span_end) == -1:
+            level += 1
+        separator = separators[level]
+        
+        # Current merged span, extended while it fits chunk_size
+        current_start = current_end = -1
+        
+        if not separator:
+            # Character-level split as last resort
+            for piece_start in range(span_start, span_end, chunk_size):
+                piece_end = min(piece_start + chunk_size, span_end)
+                if has_text(text, piece_start, piece_end):
+                    spans.append((piece_start, piece_end))
+            return
+        
+        step = len(separator)
+        pos = span_start
+        while pos <= span_end:
+            index = find(separator, pos, span_end)
+            piece_start = pos
+            if index == -1:
+                piece_end = span_end
+                pos = span_end + 1
+            else:
+                piece_end = index
+                pos = index + step
+            
+            if not has_text(text, piece_start, piece_end):
+                continue
+            
+            if current_start >= 0 and piece_end - current_start <= chunk_size:
+                current_end = piece_end
+                continue
+            if current_start < 0 and piece_end - piece_start <= chunk_size:
+                current_start, current_end = piece_start, piece_end
+                continue
+            
+            if current_start >= 0:
+                spans.append((current_start, current_end))
+            
+            if piece_end - piece_start > chunk_size and level < last_level:
+                # Recurse with the next separator; its last span stays open
+                # so following pieces can still merge into it
+                mark = len(spans)
+                split(piece_start, piece_end, level + 1)
+                if len(spans) > mark:
+                    current_start, current_end = spans.pop()
+                else:
+                    current_start = -1
+            else:
+                current_start, current_end = piece_start, piece_end
+        
+        if current_start >= 0:
+            spans.append((current_start, current_end))
+    
+    split(start, end, 0)
+    return spans
+
+
 class DocumentProcessor:
     """
     Document processing utilities
@@ -96,7 +202,8 @@ class DocumentProcessor:
             List of TextChunk objects
         """
         chunk_size = chunk_size or self.chunk_size
-        chunk_overlap = chunk_overlap or self.chunk_overlap
+        if chunk_overlap is None:
+            chunk_overlap = self.chunk_overlap
         
         if not text or len(text) < self.min_chunk_size:
             if text:
@@ -108,91 +215,60 @@ class DocumentProcessor:
                 )]
             return []
         
-        # Separators in order of preference
-        separators = ["\n\n", "\n", ". ", "。", "! ", "? ", "; ", ", ", " ", ""]
+        # Chunk each Markdown section separately so chunks never straddle headers
+        result = []
+        for start, end, title, _ in MarkdownPreprocessor.iter_header_spans(text):
+            result.extend(self._chunk_span(text, start, end, chunk_size, chunk_overlap, title))
         
-        chunks = self._recursive_split(text, separators, chunk_size)
+        for i, chunk in enumerate(result):
+            chunk.chunk_index = i
         
-        # Create overlapping chunks
-        result = []
-        for i, chunk in enumerate(chunks):
-            # Add overlap from previous chunk
+        return result
+    
+    def _chunk_span(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        chunk_size: int,
+        chunk_overlap: int,
+        section_title: str = "",
+    ) -> List[TextChunk]:
+        """
+        Recursively chunk text[start:end], keeping overlap inside the span
+        
+        Offsets are exact, so content is always text[start_char:end_char].
+        chunk_index is relative to the span; callers renumber.
+        """
+        spans = self._recursive_split(text, DEFAULT_SEPARATORS, chunk_size, start, end)
+        
+        chunks = []
+        for i, (start_char, end_char) in enumerate(spans):
+            # Extend start back into the previous chunk's tail for overlap
             if i > 0 and chunk_overlap > 0:
-                prev_chunk = chunks[i - 1]
-                overlap_text = prev_chunk[-chunk_overlap:] if len(prev_chunk) > chunk_overlap else prev_chunk
-                chunk = overlap_text + chunk
+                prev_start, prev_end = spans[i - 1]
+                start_char = min(start_char, max(prev_start, prev_end - chunk_overlap))
             
-            # Find position in original text
-            start_char = text.find(chunk[:50])  # Use first 50 chars to find position
-            if start_char == -1:
-                start_char = 0
-            end_char = start_char + len(chunk)
-            
-            result.append(TextChunk(
-                content=chunk,
+            chunks.append(TextChunk(
+                content=text[start_char:end_char],
                 start_char=start_char,
                 end_char=end_char,
                 chunk_index=i,
+                metadata={"section_title": section_title},
             ))
         
-        return result
+        return chunks
     
     def _recursive_split(
         self,
         text: str,
-        separators: List[str],
+        separators: Sequence[str],
         chunk_size: int,
-    ) -> List[str]:
-        """Recursively split text using separators"""
-        if len(text) <= chunk_size:
-            return [text] if text.strip() else []
-        
-        # Find the best separator to use
-        separator = separators[-1]  # Default to empty string
-        for sep in separators:
-            if sep in text:
-                separator = sep
-                break
-        
-        # Split by separator
-        if separator:
-            splits = text.split(separator)
-        else:
-            # Character-level split as last resort
-            splits = [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
-        
-        # Merge small splits
-        chunks = []
-        current_chunk = ""
-        
-        for split in splits:
-            if not split.strip():
-                continue
-            
-            test_chunk = current_chunk + separator + split if current_chunk else split
-            
-            if len(test_chunk) <= chunk_size:
-                current_chunk = test_chunk
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk)
-                
-                # If split itself is too large, recurse
-                if len(split) > chunk_size and len(separators) > 1:
-                    sub_chunks = self._recursive_split(
-                        split,
-                        separators[1:],  # Try next separator
-                        chunk_size,
-                    )
-                    chunks.extend(sub_chunks[:-1])
-                    current_chunk = sub_chunks[-1] if sub_chunks else ""
-                else:
-                    current_chunk = split
-        
-        if current_chunk:
-            chunks.append(current_chunk)
-        
-        return chunks
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> List[Tuple[int, int]]:
+        """Recursively split text[start:end]; returns (start_char, end_char) spans"""
+        return split_spans(text, chunk_size, separators, start, end)
     
     def chunk_with_parents(
         self,
@@ -205,32 +281,36 @@ class DocumentProcessor:
         Create parent-child chunk hierarchy
         Good for retrieval: search on small chunks, return larger context
         
+        Both levels use recursive splitting (even on semantic processors) so
+        sizes stay bounded; children are cut from their parent's span and
+        carry metadata["parent_index"].
+        
         Returns:
             Tuple of (parent_chunks, child_chunks)
         """
-        # Create parent chunks
-        parent_chunks = self.chunk_text(
-            text,
-            chunk_size=parent_chunk_size,
-            chunk_overlap=0,  # No overlap for parents
-        )
+        # Create parent chunks per Markdown section (no overlap for parents)
+        parent_chunks = []
+        for start, end, title, _ in MarkdownPreprocessor.iter_header_spans(text):
+            parent_chunks.extend(self._chunk_span(text, start, end, parent_chunk_size, 0, title))
+        for i, parent in enumerate(parent_chunks):
+            parent.chunk_index = i
         
-        # Create child chunks within each parent
+        # Create child chunks within each parent (offsets are already absolute)
         child_chunks = []
         for parent in parent_chunks:
-            children = self.chunk_text(
-                parent.content,
-                chunk_size=child_chunk_size,
-                chunk_overlap=child_overlap,
+            children = self._chunk_span(
+                text,
+                parent.start_char,
+                parent.end_char,
+                child_chunk_size,
+                child_overlap,
+                parent.metadata["section_title"],
             )
-            
-            # Adjust positions relative to original text
             for child in children:
-                child.start_char += parent.start_char
-                child.end_char = child.start_char + len(child.content)
-                child.metadata = {"parent_index": parent.chunk_index}
-            
+                child.metadata["parent_index"] = parent.chunk_index
             child_chunks.extend(children)
+        for i, child in enumerate(child_chunks):
+            child.chunk_index = i
         
         return parent_chunks, child_chunks
     
@@ -341,8 +421,14 @@ class DocumentProcessor:
 class FileParser:
     """
     File content parser for different formats
+    
+    iter_pages() parses PDF/DOCX files page by page in the process pool,
+    so parser objects never live in the server process and the event loop
+    is never blocked by parsing.
     """
     
+    PAGES_PER_TASK = 16
+    
     @staticmethod
     def parse_text(content: str) -> str:
         """Parse plain text (no-op)"""
@@ -369,6 +455,79 @@ class FileParser:
             logger.error("pdf_parse_error", path=file_path, error=str(e))
             raise
     
+    @staticmethod
+    def count_pdf_pages(file_path: str) -> int:
+        """Number of pages in a PDF file"""
+        from pypdf import PdfReader
+        return len(PdfReader(file_path).pages)
+    
+    @staticmethod
+    def parse_pdf_pages(file_path: str, start: int, end: int) -> List[str]:
+        """Extract text of pages [start, end) of a PDF file"""
+        from pypdf import PdfReader
+        reader = PdfReader(file_path)
+        return [reader.pages[i].extract_text() or "" for i in range(start, min(end, len(reader.pages)))]
+    
+    @staticmethod
+    def parse_docx_paragraphs(file_path: str) -> List[str]:
+        """Extract non-empty paragraphs of a DOCX file"""
+        from docx import Document
+        return [p.text for p in Document(file_path).paragraphs if p.text.strip()]
+    
+    @staticmethod
+    async def iter_pages(file_path: str, file_type: str) -> AsyncIterator[str]:
+        """
+        Parse a PDF or DOCX file in the process pool, yielding text in order
+        
+        PDF page ranges are parsed concurrently (up to one task per pool
+        worker ahead); DOCX files yield one paragraph at a time.
+        """
+        loop = asyncio.get_running_loop()
+        executor = get_process_executor()
+        
+        try:
+            if file_type == "docx":
+                for paragraph in await loop.run_in_executor(
+                    executor, FileParser.parse_docx_paragraphs, file_path
+                ):
+                    yield paragraph
+                return
+            
+            if file_type != "pdf":
+                raise ValueError(f"Unsupported paged file type: {file_type}")
+            
+            page_count = await loop.run_in_executor(executor, FileParser.count_pdf_pages, file_path)
+            ranges = [
+                (start, start + FileParser.PAGES_PER_TASK)
+                for start in range(0, page_count, FileParser.PAGES_PER_TASK)
+            ]
+            ahead = max(1, get_process_workers())
+            pending = [
+                loop.run_in_executor(executor, FileParser.parse_pdf_pages, file_path, start, end)
+                for start, end in ranges[:ahead]
+            ]
+            next_range = len(pending)
+            while pending:
+                pages = await pending.pop(0)
+                if next_range < len(ranges):
+                    start, end = ranges[next_range]
+                    pending.append(loop.run_in_executor(
+                        executor, FileParser.parse_pdf_pages, file_path, start, end
+                    ))
+                    next_range += 1
+                for page in pages:
+                    if page:
+                        yield page
+        except Exception as e:
+            logger.error(f"{file_type}_parse_error", path=file_path, error=str(e))
+            raise
+    
+    @staticmethod
+    async def parse_file(file_path: str, file_type: str) -> str:
+        """Parse a PDF or DOCX file off the event loop"""
+        parts = [page async for page in FileParser.iter_pages(file_path, file_type)]
+        return "\n\n".join(parts)
+    
     @staticmethod
     def parse_docx(file_path: str) -> str:
         """Parse DOCX file"""
@@ -398,6 +557,10 @@ class FileParser:
             raise
 
 
+_HEADER_RE = re.compile(r"^(#{1,6})[ \t]+(.+?)[ \t]*$", re.MULTILINE)
+_FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})", re.MULTILINE)
+
+
 class MarkdownPreprocessor:
     """
     Preprocess Markdown by splitting on header boundaries
@@ -405,51 +568,74 @@ class MarkdownPreprocessor:
     """
     
     @staticmethod
-    def split_by_headers(content: str) -> List[Dict[str, Any]]:
+    def fenced_code_ranges(content: str) -> List[Tuple[int, int]]:
         """
-        Split Markdown content by headers (# ## ###)
+        Find fenced code blocks (``` or ~~~)
         
-        Returns:
-            List of sections with title, level, content, start_char
+        A fence closes on a line starting with at least as many of the same
+        character; an unclosed fence runs to the end of the content.
+        """
+        ranges = []
+        opening = None
+        for match in _FENCE_RE.finditer(content):
+            fence = match.group(1)
+            if opening is None:
+                opening = match
+            elif fence[0] == opening.group(1)[0] and len(fence) >= len(opening.group(1)):
+                line_end = content.find("\n", match.end())
+                ranges.append((opening.start(), len(content) if line_end == -1 else line_end))
+                opening = None
+        if opening is not None:
+            ranges.append((opening.start(), len(content)))
+        return ranges
+    
+    @staticmethod
+    def iter_header_spans(content: str) -> Iterator[Tuple[int, int, str, int]]:
         """
-        # Pattern matches # ## ### etc at start of line
-        header_pattern = r'^(#{1,6})\s+(.+)$'
+        Find header sections in one pass over the content
         
-        sections = []
-        lines = content.split('\n')
-        current_section = {
-            "title": "",
-            "level": 0,
-            "content": "",
-            "start_char": 0,
-        }
-        current_char = 0
-        
-        for line in lines:
-            match = re.match(header_pattern, line)
-            
-            if match:
-                # Save previous section if has content
-                if current_section["content"].strip():
-                    sections.append(current_section)
-                
-                # Start new section
-                level = len(match.group(1))
-                title = match.group(2).strip()
-                current_section = {
-                    "title": title,
-                    "level": level,
-                    "content": line + "\n",
-                    "start_char": current_char,
-                }
-            else:
-                current_section["content"] += line + "\n"
+        Headers inside fenced code blocks are ignored, so `# comments` in
+        code don't start sections. Whitespace-only sections are skipped.
+        
+        Yields:
+            (start_char, end_char, title, level) views into content
+        """
+        fences = MarkdownPreprocessor.fenced_code_ranges(content)
+        fence_index = 0
+        start, title, level = 0, "", 0
+        
+        for match in _HEADER_RE.finditer(content):
+            position = match.start()
+            while fence_index < len(fences) and fences[fence_index][1] <= position:
+                fence_index += 1
+            if fence_index < len(fences) and fences[fence_index][0] <= position:
+                continue
             
-            current_char += len(line) + 1  # +1 for newline
+            if _NON_WHITESPACE.search(content, start, position):
+                yield start, position, title, level
+            start, title, level = position, match.group(2), len(match.group(1))
+        
+        if _NON_WHITESPACE.search(content, start):
+            yield start, len(content), title, level
+    
+    @staticmethod
+    def split_by_headers(content: str) -> List[Dict[str, Any]]:
+        """
+        Split Markdown content by headers (# ## ###)
         
-        # Don't forget last section
-        if current_section["content"].strip():
-            sections.append(current_section)
+        Returns:
+            List of sections with title, level, content, start_char, end_char
+        """
+        sections = [
+            {
+                "title": title,
+                "level": level,
+                "content": content[start:end],
+                "start_char": start,
+                "end_char": end,
+            }
+            for start, end, title, level in MarkdownPreprocessor.iter_header_spans(content)
+        ]
         
         # If no headers found, return entire content as one section
         if not sections:
@@ -458,19 +644,65 @@ class MarkdownPreprocessor:
                 "level": 0,
                 "content": content,
                 "start_char": 0,
+                "end_char": len(content),
             })
         
         return sections
 
 
+# Sentence boundaries: whitespace after .?!, after CJK terminators, and line breaks
+_SENTENCE_BREAK_RE = re.compile(r"(?<=[.?!])\s+|(?<=[。！？])\s*|\s*\n\s*")
+
+
+def split_sentences(text: str, start: int = 0, end: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Split text[start:end] into sentences
+    
+    Returns:
+        List of (start_char, end_char) spans; whitespace-only spans are dropped
+    """
+    if end is None:
+        end = len(text)
+    spans = []
+    pos = start
+    for match in _SENTENCE_BREAK_RE.finditer(text, start, end):
+        if _NON_WHITESPACE.search(text, pos, match.start()):
+            spans.append((pos, match.start()))
+        pos = max(pos, match.end())
+    if _NON_WHITESPACE.search(text, pos, end):
+        spans.append((pos, end))
+    return spans
+
+
+def semantic_breakpoints(embeddings: np.ndarray, percentile: float) -> np.ndarray:
+    """
+    Find topic shifts between consecutive sentence embeddings
+    
+    A break follows sentence i when the cosine distance between i and i + 1
+    exceeds the given percentile of all distances in the section.
+    
+    Returns:
+        Sorted indices i of sentences that end a chunk
+    """
+    if len(embeddings) < 2:
+        return np.empty(0, dtype=np.intp)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    unit = embeddings / np.maximum(norms, 1e-12)
+    distances = 1.0 - np.einsum("ij,ij->i", unit[:-1], unit[1:])
+    threshold = np.percentile(distances, percentile)
+    return np.flatnonzero(distances > threshold)
+
+
 class SemanticDocumentProcessor(DocumentProcessor):
     """
     Semantic document chunking using embedding similarity
     
     Strategy:
     1. Preprocess Markdown by splitting on headers
-    2. Within each section, use LangChain SemanticChunker
-    3. Merge small chunks, respect min_chunk_size
+    2. Split each section into sentences and embed every sentence (with its
+       neighbours as context) in one batched call per document
+    3. Break sections where adjacent sentence distance is above the
+       percentile threshold, merging chunks below min_chunk_size
     
     This preserves document structure while ensuring
     semantically coherent chunks for better RAG retrieval.
@@ -483,6 +715,9 @@ class SemanticDocumentProcessor(DocumentProcessor):
         min_chunk_size: int = 100,
         chunk_size: int = 500,
         chunk_overlap: int = 50,
+        buffer_size: int = 1,
+        section_concurrency: int = 4,
+        sentences_per_call: int = 256,
     ):
         super().__init__(
             chunk_size=chunk_size,
@@ -491,7 +726,11 @@ class SemanticDocumentProcessor(DocumentProcessor):
         )
         self.embedding_function = embedding_function
         self.similarity_threshold = similarity_threshold
-        self._semantic_chunker = None
+        # Lower percentile = more aggressive splitting
+        self.breakpoint_percentile = similarity_threshold * 100
+        self.buffer_size = buffer_size
+        self.section_concurrency = max(1, section_concurrency)
+        self.sentences_per_call = max(1, sentences_per_call)
         
         logger.info(
             "semantic_processor_initialized",
@@ -499,65 +738,6 @@ class SemanticDocumentProcessor(DocumentProcessor):
             min_chunk_size=min_chunk_size,
         )
     
-    def _get_semantic_chunker(self):
-        """Lazy initialization of SemanticChunker"""
-        if self._semantic_chunker is None:
-            try:
-                from langchain_text_splitters import SemanticChunker
-                from langchain_core.embeddings import Embeddings
-                
-                # Wrap our embedding function for LangChain compatibility
-                class EmbeddingWrapper(Embeddings):
-                    def __init__(wrapper_self, embed_fn):
-                        wrapper_self.embed_fn = embed_fn
-                    
-                    def embed_documents(wrapper_self, texts: List[str]) -> List[List[float]]:
-                        """Embed documents - sync wrapper for async function"""
-                        import asyncio
-                        try:
-                            loop = asyncio.get_event_loop()
-                            if loop.is_running():
-                                # Already in async context, create new loop
-                                import concurrent.futures
-                                with concurrent.futures.ThreadPoolExecutor() as executor:
-                                    future = executor.submit(
-                                        asyncio.run,
-                                        wrapper_self.embed_fn(texts)
-                                    )
-                                    return future.result()
-                            else:
-                                return loop.run_until_complete(wrapper_self.embed_fn(texts))
-                        except RuntimeError:
-                            return asyncio.run(wrapper_self.embed_fn(texts))
-                    
-                    def embed_query(wrapper_self, text: str) -> List[float]:
-                        """Embed single query"""
-                        results = wrapper_self.embed_documents([text])
-                        return results[0] if results else []
-                
-                embeddings = EmbeddingWrapper(self.embedding_function)
-                
-                # Configure SemanticChunker
-                # breakpoint_threshold_type: "percentile" works well
-                # Lower percentile = more aggressive splitting
-                self._semantic_chunker = SemanticChunker(
-                    embeddings=embeddings,
-                    breakpoint_threshold_type="percentile",
-                    breakpoint_threshold_amount=int(self.similarity_threshold * 100),
-                )
-                
-                logger.info("semantic_chunker_created")
-                
-            except ImportError as e:
-                logger.warning(
-                    "semantic_chunker_import_failed",
-                    error=str(e),
-                    fallback="using recursive character split",
-                )
-                return None
-        
-        return self._semantic_chunker
-    
     def chunk_text(
         self,
         text: str,
@@ -568,10 +748,20 @@ class SemanticDocumentProcessor(DocumentProcessor):
         Semantic chunking with Markdown preprocessing
         
         Flow:
-        1. Split by Markdown headers
-        2. Semantic chunk each section
-        3. Build TextChunk objects with positions
+        1. Split by Markdown headers, then into sentences
+        2. Embed all sentences in one call
+        3. Build TextChunk objects from sentence spans
+        
+        Blocks on the embedding call, so it must not be used from a running
+        event loop; await chunk_text_async there instead.
         """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError("chunk_text blocks the event loop; use chunk_text_async")
+        
         if not text or len(text) < self.min_chunk_size:
             if text:
                 return [TextChunk(
@@ -582,93 +772,23 @@ class SemanticDocumentProcessor(DocumentProcessor):
                 )]
             return []
         
-        # Step 1: Markdown preprocessing
-        sections = MarkdownPreprocessor.split_by_headers(text)
-        logger.debug("markdown_sections_split", count=len(sections))
-        
-        # Step 2: Semantic chunking per section
-        chunker = self._get_semantic_chunker()
-        all_chunks = []
-        chunk_index = 0
+        sections, windows = self._plan_sections(text)
+        try:
+            embeddings = self._embed_sync(windows) if windows else None
+        except Exception as e:
+            logger.warning("semantic_chunk_failed", error=str(e))
+            return super().chunk_text(text, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
         
-        for section in sections:
-            section_content = section["content"]
-            section_start = section["start_char"]
-            
-            # Skip very short sections
-            if len(section_content.strip()) < self.min_chunk_size:
-                if section_content.strip():
-                    all_chunks.append(TextChunk(
-                        content=section_content.strip(),
-                        start_char=section_start,
-                        end_char=section_start + len(section_content),
-                        chunk_index=chunk_index,
-                        metadata={"section_title": section["title"]},
-                    ))
-                    chunk_index += 1
-                continue
-            
-            if chunker:
-                try:
-                    # Use SemanticChunker
-                    semantic_docs = chunker.split_text(section_content)
-                    
-                    for doc_text in semantic_docs:
-                        # Find position in original text
-                        start = text.find(doc_text[:50])
-                        if start == -1:
-                            start = section_start
-                        
-                        all_chunks.append(TextChunk(
-                            content=doc_text,
-                            start_char=start,
-                            end_char=start + len(doc_text),
-                            chunk_index=chunk_index,
-                            metadata={"section_title": section["title"]},
-                        ))
-                        chunk_index += 1
-                    
-                except Exception as e:
-                    logger.warning(
-                        "semantic_chunk_failed",
-                        section=section["title"],
-                        error=str(e),
-                    )
-                    # Fallback to parent's recursive split
-                    fallback_chunks = super().chunk_text(
-                        section_content,
-                        chunk_size=chunk_size,
-                        chunk_overlap=chunk_overlap,
-                    )
-                    for fc in fallback_chunks:
-                        fc.chunk_index = chunk_index
-                        fc.start_char += section_start
-                        fc.end_char = fc.start_char + len(fc.content)
-                        fc.metadata = {"section_title": section["title"]}
-                        all_chunks.append(fc)
-                        chunk_index += 1
-            else:
-                # No SemanticChunker available, use fallback
-                fallback_chunks = super().chunk_text(
-                    section_content,
-                    chunk_size=chunk_size,
-                    chunk_overlap=chunk_overlap,
-                )
-                for fc in fallback_chunks:
-                    fc.chunk_index = chunk_index
-                    fc.start_char += section_start
-                    fc.end_char = fc.start_char + len(fc.content)
-                    fc.metadata = {"section_title": section["title"]}
-                    all_chunks.append(fc)
-                    chunk_index += 1
+        chunks = self._assemble_chunks(text, sections, embeddings)
         
         logger.info(
             "semantic_chunking_complete",
-            total_chunks=len(all_chunks),
+            total_chunks=len(chunks),
             sections=len(sections),
+            sentences_embedded=len(windows),
         )
         
-        return all_chunks
+        return chunks
     
     async def chunk_text_async(
         self,
@@ -677,13 +797,12 @@ class SemanticDocumentProcessor(DocumentProcessor):
         chunk_overlap: Optional[int] = None,
     ) -> List[TextChunk]:
         """
-        Async version of chunk_text using thread pool for embedding computation.
+        Async version of chunk_text
         
-        This method runs CPU-intensive embedding calculations in a thread pool,
-        allowing the event loop to handle other requests.
-        
-        Note: Thread pool is effective because embedding libraries (PyTorch,
-        sentence-transformers) release the GIL during C/CUDA operations.
+        Sections are grouped into batches of at most sentences_per_call
+        sentences; batches are embedded and cut concurrently (bounded by
+        section_concurrency) and reassembled in document order. Sentence
+        splitting and breakpoint search run on the thread pool.
         """
         if not text or len(text) < self.min_chunk_size:
             if text:
@@ -695,117 +814,190 @@ class SemanticDocumentProcessor(DocumentProcessor):
                 )]
             return []
         
-        # Markdown preprocessing is fast (pure Python but simple)
-        sections = MarkdownPreprocessor.split_by_headers(text)
-        logger.debug("markdown_sections_split_async", count=len(sections))
-        
-        # Process sections concurrently using thread pool
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         executor = get_thread_executor()
+        semaphore = asyncio.Semaphore(self.section_concurrency)
         
-        all_chunks = []
-        chunk_index = 0
+        sections, windows = await loop.run_in_executor(executor, self._plan_sections, text)
         
-        # Process each section - embedding computation happens in thread pool
-        for section in sections:
-            section_content = section["content"]
-            section_start = section["start_char"]
-            
-            # Skip very short sections
-            if len(section_content.strip()) < self.min_chunk_size:
-                if section_content.strip():
-                    all_chunks.append(TextChunk(
-                        content=section_content.strip(),
-                        start_char=section_start,
-                        end_char=section_start + len(section_content),
-                        chunk_index=chunk_index,
-                        metadata={"section_title": section["title"]},
-                    ))
-                    chunk_index += 1
-                continue
-            
-            # Run semantic chunking in thread pool
-            try:
-                section_chunks = await loop.run_in_executor(
-                    executor,
-                    self._chunk_section_sync,
-                    section_content,
-                    section["title"],
-                    text,
-                    section_start,
-                )
-                
-                for chunk in section_chunks:
-                    chunk.chunk_index = chunk_index
-                    all_chunks.append(chunk)
-                    chunk_index += 1
-                    
-            except Exception as e:
-                logger.warning(
-                    "async_semantic_chunk_failed",
-                    section=section["title"],
-                    error=str(e),
-                )
-                # Fallback to recursive split
-                fallback_chunks = super().chunk_text(
-                    section_content,
-                    chunk_size=chunk_size,
-                    chunk_overlap=chunk_overlap,
+        async def process(batch: List[Tuple[Any, ...]]) -> List[TextChunk]:
+            async with semaphore:
+                row_start = batch[0][4]
+                row_end = batch[-1][4] + self._sentence_rows(batch[-1])
+                embeddings = None
+                if row_end > row_start:
+                    embeddings = await self._embed(windows[row_start:row_end])
+                return await loop.run_in_executor(
+                    executor, self._assemble_chunks, text, batch, embeddings, row_start
                 )
-                for fc in fallback_chunks:
-                    fc.chunk_index = chunk_index
-                    fc.start_char += section_start
-                    fc.end_char = fc.start_char + len(fc.content)
-                    fc.metadata = {"section_title": section["title"]}
-                    all_chunks.append(fc)
-                    chunk_index += 1
+        
+        batches = self._batch_sections(sections)
+        tasks = [asyncio.ensure_future(process(batch)) for batch in batches]
+        try:
+            results = await asyncio.gather(*tasks)
+        except Exception as e:
+            for task in tasks:
+                task.cancel()
+            logger.warning("async_semantic_chunk_failed", error=str(e))
+            return await loop.run_in_executor(
+                executor,
+                partial(super().chunk_text, text, chunk_size=chunk_size, chunk_overlap=chunk_overlap),
+            )
+        
+        # gather keeps batch order, so chunks come back in document order
+        chunks = [chunk for batch_chunks in results for chunk in batch_chunks]
+        for i, chunk in enumerate(chunks):
+            chunk.chunk_index = i
         
         logger.info(
             "async_semantic_chunking_complete",
-            total_chunks=len(all_chunks),
+            total_chunks=len(chunks),
             sections=len(sections),
+            batches=len(batches),
+            sentences_embedded=len(windows),
         )
         
-        return all_chunks
+        return chunks
+    
+    @staticmethod
+    def _sentence_rows(section: Tuple[Any, ...]) -> int:
+        """Rows a section occupies in the embedding matrix"""
+        sentences = section[3]
+        return len(sentences) if sentences and len(sentences) > 1 else 0
+    
+    def _batch_sections(self, sections: List[Tuple[Any, ...]]) -> List[List[Tuple[Any, ...]]]:
+        """
+        Group consecutive sections into batches of at most sentences_per_call
+        rows (a larger section stays whole: breakpoints are per section)
+        """
+        batches = []
+        current = []
+        rows = 0
+        for section in sections:
+            section_rows = self._sentence_rows(section)
+            if current and rows + section_rows > self.sentences_per_call:
+                batches.append(current)
+                current, rows = [], 0
+            current.append(section)
+            rows += section_rows
+        if current:
+            batches.append(current)
+        return batches
+    
+    def _plan_sections(self, text: str) -> Tuple[List[Tuple[Any, ...]], List[str]]:
+        """
+        Split sections into sentences and collect the texts to embed
+        
+        Returns:
+            (sections, windows): each section is (start, end, title, sentences,
+            first_row), where sentences is None for short sections kept whole
+            and first_row is the section's first row in the embedding matrix
+        """
+        sections = []
+        windows = []
+        
+        for start, end, title, _ in MarkdownPreprocessor.iter_header_spans(text):
+            sentences = None
+            if len(text[start:end].strip()) >= self.min_chunk_size:
+                sentences = split_sentences(text, start, end)
+            
+            first_row = len(windows)
+            if sentences and len(sentences) > 1:
+                # Embed each sentence with its neighbours to smooth out noise
+                last = len(sentences) - 1
+                for i in range(len(sentences)):
+                    window_start = sentences[max(0, i - self.buffer_size)][0]
+                    window_end = sentences[min(last, i + self.buffer_size)][1]
+                    windows.append(text[window_start:window_end])
+            sections.append((start, end, title, sentences, first_row))
+        
+        return sections, windows
     
-    def _chunk_section_sync(
+    def _assemble_chunks(
         self,
-        section_content: str,
-        section_title: str,
-        original_text: str,
-        section_start: int,
+        text: str,
+        sections: List[Tuple[Any, ...]],
+        embeddings: Optional[np.ndarray],
+        row_offset: int = 0,
     ) -> List[TextChunk]:
         """
-        Synchronous helper for chunking a single section.
-        Called from thread pool in async context.
+        Cut each section at its semantic breakpoints
+        
+        row_offset is the embedding matrix row of the first section's first
+        sentence, for when only a batch of sections was embedded.
         """
-        chunker = self._get_semantic_chunker()
         chunks = []
         
-        if chunker:
-            try:
-                semantic_docs = chunker.split_text(section_content)
-                
-                for doc_text in semantic_docs:
-                    start = original_text.find(doc_text[:50])
-                    if start == -1:
-                        start = section_start
-                    
-                    chunks.append(TextChunk(
-                        content=doc_text,
-                        start_char=start,
-                        end_char=start + len(doc_text),
-                        chunk_index=0,  # Will be set by caller
-                        metadata={"section_title": section_title},
-                    ))
-            except Exception:
-                # Will be caught by caller
-                raise
-        else:
-            # Return empty, caller will use fallback
-            raise RuntimeError("SemanticChunker not available")
+        for start, end, title, sentences, first_row in sections:
+            if not sentences:
+                chunks.append(self._stripped_section_chunk(text, start, end, title))
+                continue
+            
+            breakpoints = []
+            if len(sentences) > 1:
+                breakpoints = semantic_breakpoints(
+                    embeddings[first_row - row_offset:first_row - row_offset + len(sentences)],
+                    self.breakpoint_percentile,
+                ).tolist()
+            
+            for chunk_start, chunk_end in self._group_sentences(sentences, breakpoints):
+                chunks.append(TextChunk(
+                    content=text[chunk_start:chunk_end],
+                    start_char=chunk_start,
+                    end_char=chunk_end,
+                    chunk_index=0,
+                    metadata={"section_title": title},
+                ))
+        
+        for i, chunk in enumerate(chunks):
+            chunk.chunk_index = i
         
         return chunks
+    
+    def _group_sentences(
+        self,
+        sentences: List[Tuple[int, int]],
+        breakpoints: List[int],
+    ) -> List[Tuple[int, int]]:
+        """Join sentences between breakpoints, merging groups below min_chunk_size"""
+        last = len(sentences) - 1
+        spans = []
+        first = 0
+        
+        for end_index in breakpoints + [last]:
+            start_char, end_char = sentences[first][0], sentences[end_index][1]
+            if end_char - start_char < self.min_chunk_size and end_index != last:
+                continue  # Too small: carry into the next group
+            spans.append((start_char, end_char))
+            first = end_index + 1
+        
+        # Fold a short tail into the previous chunk
+        if len(spans) > 1 and spans[-1][1] - spans[-1][0] < self.min_chunk_size:
+            tail_end = spans.pop()[1]
+            spans[-1] = (spans[-1][0], tail_end)
+        
+        return spans
+    
+    async def _embed(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(await self.embedding_function(texts), dtype=np.float32)
+    
+    def _embed_sync(self, texts: List[str]) -> np.ndarray:
+        """Run the async embedding function from sync code (one call per document)"""
+        return asyncio.run(self._embed(texts))
+    
+    @staticmethod
+    def _stripped_section_chunk(text: str, start: int, end: int, title: str) -> TextChunk:
+        """Whole section as one chunk, trimmed of surrounding whitespace"""
+        content = text[start:end]
+        stripped = content.strip()
+        start_char = start + len(content) - len(content.lstrip())
+        return TextChunk(
+            content=stripped,
+            start_char=start_char,
+            end_char=start_char + len(stripped),
+            chunk_index=0,
+            metadata={"section_title": title},
+        )
 
 
 def create_document_processor(
@@ -815,6 +1007,8 @@ def create_document_processor(
     similarity_threshold: float = 0.5,
     min_chunk_size: int = 100,
     embedding_function: Any = None,
+    section_concurrency: int = 4,
+    sentences_per_call: int = 256,
 ) -> DocumentProcessor:
     """
     Factory function for document processor
@@ -823,9 +1017,11 @@ def create_document_processor(
         chunk_size: Max characters per chunk
         chunk_overlap: Overlap between chunks
         semantic_enabled: Use embedding-based semantic chunking
-        similarity_threshold: Cosine similarity cutoff (0-1)
+        similarity_threshold: Breakpoint distance percentile as a fraction (0-1)
         min_chunk_size: Minimum chunk size
         embedding_function: Async function to generate embeddings
+        section_concurrency: Section batches chunked concurrently (async path)
+        sentences_per_call: Max sentences per embedding call (async path)
     
     Returns:
         DocumentProcessor or SemanticDocumentProcessor
@@ -838,6 +1034,8 @@ def create_document_processor(
             min_chunk_size=min_chunk_size,
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
+            section_concurrency=section_concurrency,
+            sentences_per_call=sentences_per_call,
         )
     else:
         logger.info("creating_standard_document_processor")
@@ -0,0 +1,114 @@
+"""
+Embedding Micro-Batcher
+Coalesces concurrent single-text embedding calls into batched requests
+
+Concurrent `embed_text` calls (e.g. query embeddings from parallel chat and
+search requests) are collected for up to `max_wait_ms`, or until
+`max_batch_size` texts are pending, then embedded with one `embed_texts`
+call on the wrapped service.
+"""
+from typing import Any, Dict, List, Optional, Set, Tuple
+import asyncio
+
+import numpy as np
+import structlog
+
+from src.infrastructure.embedding.service import EmbeddingService
+
+logger = structlog.get_logger()
+
+
+class MicroBatchingEmbeddingService(EmbeddingService):
+    """
+    Micro-batching decorator for any EmbeddingService
+    
+    `embed_texts` calls are already batched and pass straight through.
+    """
+    
+    def __init__(
+        self,
+        inner: EmbeddingService,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        self.inner = inner
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        
+        self.requests = 0
+        self.batches = 0
+        self.largest_batch = 0
+    
+    async def embed_text(self, text: str) -> List[float]:
+        """Generate embedding for a single text, batched with concurrent callers"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        self.requests += 1
+        
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        
+        return await future
+    
+    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for multiple texts"""
+        return await self.inner.embed_texts(texts)
+    
+    async def embed_texts_array(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings as a float32 matrix"""
+        return await self.inner.embed_texts_array(texts)
+    
+    def get_dimension(self) -> int:
+        return self.inner.get_dimension()
+    
+    def shutdown(self) -> None:
+        self.inner.shutdown()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching counters"""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "requests": self.requests,
+            "batches": self.batches,
+            "avg_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+        }
+    
+    def _flush(self) -> None:
+        """Start a batch with everything pending"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(batch))
+        task = asyncio.create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Embed one batch and resolve each caller's future"""
+        try:
+            embeddings = await self.inner.embed_texts_array([text for text, _ in batch])
+        except Exception as e:
+            logger.error("embedding_batch_failed", size=len(batch), error=str(e))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():  # Caller may have been cancelled
+                future.set_result(embedding.tolist())
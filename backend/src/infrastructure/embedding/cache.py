@@ -0,0 +1,226 @@
+"""
+Embedding Cache
+Content-addressed caching decorator for EmbeddingService
+
+Embeddings are keyed by (model, sha256 of normalized text) and looked up in
+two tiers:
+- in-memory LRU
+- persistent SQLite file (survives restarts, shared by all documents)
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+import asyncio
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+
+import numpy as np
+import structlog
+
+from src.infrastructure.embedding.service import EmbeddingService, as_embedding_array
+
+logger = structlog.get_logger()
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys (NFC, collapsed whitespace)"""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def make_cache_key(model: str, text: str) -> str:
+    """Build a cache key from model name and normalized text hash"""
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{model}:{digest}"
+
+
+class LRUEmbeddingCache:
+    """In-memory LRU tier"""
+    
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._data: "OrderedDict[str, np.ndarray]" = OrderedDict()
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        for key in keys:
+            vector = self._data.get(key)
+            if vector is not None:
+                self._data.move_to_end(key)
+                found[key] = vector
+        return found
+    
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        for key, vector in items.items():
+            self._data[key] = vector
+            self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteEmbeddingCache:
+    """
+    Persistent SQLite tier
+    Vectors are stored as float32 blobs
+    """
+    
+    _BATCH = 500  # Stay under SQLite's bound-parameter limit
+    
+    def __init__(self, path: str = "./data/embedding_cache.db"):
+        self.path = path
+        db_dir = os.path.dirname(path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, dim INTEGER NOT NULL, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+    
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), self._BATCH):
+                batch = keys[i:i + self._BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+    
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        rows = [
+            (key, int(vector.shape[0]), vector.astype(np.float32).tobytes())
+            for key, vector in items.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, dim, vector) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+    
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddingService(EmbeddingService):
+    """
+    Caching decorator for any EmbeddingService
+    
+    Only texts missing from both tiers are sent to the wrapped service,
+    and duplicates within one batch are embedded once.
+    """
+    
+    def __init__(
+        self,
+        inner: EmbeddingService,
+        model: str,
+        memory_size: int = 10000,
+        persistent_path: Optional[str] = None,
+    ):
+        self.inner = inner
+        self.model = model
+        self.memory = LRUEmbeddingCache(max_size=memory_size)
+        self.persistent = SQLiteEmbeddingCache(persistent_path) if persistent_path else None
+        # Own thread for SQLite I/O, so cache reads don't queue behind other
+        # users of the loop's default executor (one is enough: the tier is locked)
+        self._executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-cache")
+            if self.persistent is not None else None
+        )
+        
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+    
+    async def embed_text(self, text: str) -> List[float]:
+        """Generate embedding for a single text"""
+        embeddings = await self.embed_texts([text])
+        return embeddings[0]
+    
+    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for multiple texts, using the cache where possible"""
+        if not texts:
+            return []
+        return (await self.embed_texts_array(texts)).tolist()
+    
+    async def embed_texts_array(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings as a float32 matrix, using the cache where possible"""
+        if not texts:
+            return as_embedding_array([])
+        
+        keys = [make_cache_key(self.model, t) for t in texts]
+        
+        # Unique keys in first-seen order, with a representative text
+        unique: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            unique.setdefault(key, text)
+        
+        found = self.memory.get_many(unique.keys())
+        self.memory_hits += len(found)
+        
+        missing = [k for k in unique if k not in found]
+        if missing and self.persistent is not None:
+            loop = asyncio.get_running_loop()
+            from_disk = await loop.run_in_executor(self._executor, self.persistent.get_many, missing)
+            if from_disk:
+                self.persistent_hits += len(from_disk)
+                self.memory.put_many(from_disk)
+                found.update(from_disk)
+                missing = [k for k in missing if k not in from_disk]
+        
+        if missing:
+            self.misses += len(missing)
+            computed = await self.inner.embed_texts_array([unique[k] for k in missing])
+            # Copy rows: a view would keep the whole batch matrix alive in the LRU
+            new_items = {key: computed[i].copy() for i, key in enumerate(missing)}
+            self.memory.put_many(new_items)
+            if self.persistent is not None:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(self._executor, self.persistent.put_many, new_items)
+            found.update(new_items)
+        
+        return np.stack([found[key] for key in keys])
+    
+    def get_dimension(self) -> int:
+        return self.inner.get_dimension()
+    
+    def shutdown(self) -> None:
+        if self.persistent is not None:
+            self._executor.shutdown(wait=True)
+            self.persistent.close()
+        self.inner.shutdown()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss counters"""
+        lookups = self.memory_hits + self.persistent_hits + self.misses
+        return {
+            "model": self.model,
+            "memory_hits": self.memory_hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_rate": round((lookups - self.misses) / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+        }
@@ -0,0 +1,128 @@
+"""
+Inference Executor
+Dedicated, bounded executor for embedding model inference
+
+Keeps model forward passes off the shared default loop executor so they do
+not compete with other blocking calls, and reports queue depth and latency.
+Runs either on threads or, to isolate the model from the GIL, in separate
+worker processes.
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+import asyncio
+import multiprocessing
+import os
+import time
+
+
+def default_torch_threads(workers: int) -> int:
+    """Split CPU cores between inference workers so they do not oversubscribe"""
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def set_torch_threads(num_threads: int) -> None:
+    """Set torch intra-op threads if torch is installed"""
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(num_threads)
+
+
+def _timed_call(fn: Callable, *args: Any) -> Tuple[float, Any]:
+    """Run fn in the worker and report when it actually started"""
+    return time.time(), fn(*args)
+
+
+class InferenceExecutor:
+    """
+    Bounded executor for model inference
+    
+    Metrics:
+    - in_flight / queue_depth: submitted calls not yet finished / not yet running
+    - avg_queue_wait_ms: time spent waiting for a free worker
+    - avg_latency_ms: total time from submit to result
+    """
+    
+    def __init__(
+        self,
+        max_workers: int = 1,
+        use_process: bool = False,
+        initializer: Optional[Callable] = None,
+        initargs: Tuple = (),
+        name: str = "inference",
+    ):
+        self.max_workers = max(1, max_workers)
+        self.use_process = use_process
+        
+        self._executor: Executor
+        if use_process:
+            # spawn: forking a process that already loaded torch is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=initializer,
+                initargs=initargs,
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=name,
+                initializer=initializer,
+                initargs=initargs,
+            )
+        
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self._wait_total = 0.0
+        self._latency_total = 0.0
+        self._started = 0
+    
+    async def run(self, fn: Callable, *args: Any) -> Any:
+        """Run fn(*args) on the executor"""
+        loop = asyncio.get_running_loop()
+        self.submitted += 1
+        submitted_at = time.time()
+        try:
+            started_at, result = await loop.run_in_executor(
+                self._executor, _timed_call, fn, *args
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.completed += 1
+            self._latency_total += time.time() - submitted_at
+        
+        self._started += 1
+        self._wait_total += max(0.0, started_at - submitted_at)
+        return result
+    
+    def run_sync(self, fn: Callable, *args: Any) -> Any:
+        """Run fn(*args) on the executor and block for the result"""
+        return self._executor.submit(fn, *args).result()
+    
+    @property
+    def in_flight(self) -> int:
+        return self.submitted - self.completed
+    
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.in_flight - self.max_workers)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor queue and latency metrics"""
+        return {
+            "mode": "process" if self.use_process else "thread",
+            "workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_queue_wait_ms": round(self._wait_total / self._started * 1000, 2) if self._started else 0.0,
+            "avg_latency_ms": round(self._latency_total / self.completed * 1000, 2) if self.completed else 0.0,
+        }
+    
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
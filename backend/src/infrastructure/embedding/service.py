@@ -3,16 +3,30 @@ Embedding Service Layer
 Supports multiple embedding providers: local (sentence-transformers), OpenAI, Ollama
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import asyncio
-from functools import lru_cache
+import threading
 
 import structlog
 import numpy as np
 
+from src.infrastructure.embedding.executor import (
+    InferenceExecutor,
+    default_torch_threads,
+    set_torch_threads,
+)
+
 logger = structlog.get_logger()
 
 
+def as_embedding_array(embeddings: Any) -> np.ndarray:
+    """Convert embeddings to a contiguous float32 matrix (no copy if already one)"""
+    array = np.asarray(embeddings, dtype=np.float32)
+    if array.ndim == 1:
+        array = array.reshape(1, -1) if array.size else array.reshape(0, 0)
+    return np.ascontiguousarray(array)
+
+
 class EmbeddingService(ABC):
     """Abstract base class for embedding services"""
     
@@ -30,12 +44,80 @@ class EmbeddingService(ABC):
     def get_dimension(self) -> int:
         """Get embedding dimension"""
         pass
+    
+    async def embed_texts_array(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings as a float32 matrix of shape (len(texts), dimension)"""
+        return as_embedding_array(await self.embed_texts(texts))
+    
+    def shutdown(self) -> None:
+        """Release executors and connections (call on app shutdown)"""
+        pass
+
+
+def _load_local_model(model_name: str, device: str) -> Tuple[Any, str]:
+    """Load a local embedding model, returns (model, model_type)"""
+    # Try FlagEmbedding first for BGE models
+    if "bge" in model_name.lower():
+        try:
+            from FlagEmbedding import FlagModel
+            model = FlagModel(
+                model_name,
+                use_fp16=False,
+            )
+            logger.info("loaded_flag_embedding_model", model=model_name)
+            return model, "flag"
+        except ImportError:
+            pass
+    
+    # Fallback to sentence-transformers
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer(
+        model_name,
+        device=device,
+    )
+    logger.info("loaded_sentence_transformer_model", model=model_name)
+    return model, "sentence_transformer"
+
+
+def _encode_with_model(model: Any, model_type: str, texts: List[str], normalize: bool) -> np.ndarray:
+    """Encode texts with a loaded model into a float32 matrix"""
+    if model_type == "flag":
+        embeddings = model.encode(texts)
+    else:
+        embeddings = model.encode(
+            texts,
+            normalize_embeddings=normalize,
+            show_progress_bar=False,
+        )
+    
+    return as_embedding_array(embeddings)
+
+
+# Model held by each worker process (process inference mode)
+_worker_model: Optional[Tuple[Any, str, bool]] = None
+
+
+def _init_worker_model(model_name: str, device: str, normalize: bool, torch_threads: int) -> None:
+    """Process worker initializer: load the model once per process"""
+    global _worker_model
+    set_torch_threads(torch_threads)
+    model, model_type = _load_local_model(model_name, device)
+    _worker_model = (model, model_type, normalize)
+
+
+def _worker_encode(texts: List[str]) -> np.ndarray:
+    """Encode texts with the worker process model"""
+    model, model_type, normalize = _worker_model
+    return _encode_with_model(model, model_type, texts, normalize)
 
 
 class LocalEmbeddingService(EmbeddingService):
     """
     Local embedding service using sentence-transformers
     Supports BGE-M3, all-MiniLM, and other HuggingFace models
+    
+    Inference runs on a dedicated InferenceExecutor (threads, or worker
+    processes with use_process=True) rather than the default loop executor.
     """
     
     def __init__(
@@ -43,67 +125,57 @@ class LocalEmbeddingService(EmbeddingService):
         model_name: str = "BAAI/bge-m3",
         device: str = "cpu",
         normalize: bool = True,
+        inference_workers: int = 1,
+        torch_threads: int = 0,
+        use_process: bool = False,
     ):
         self.model_name = model_name
         self.device = device
         self.normalize = normalize
+        self.torch_threads = torch_threads or default_torch_threads(inference_workers)
+        self.use_process = use_process
         self._model = None
+        self._model_type = None
         self._dimension = None
+        self._load_lock = threading.Lock()
+        
+        if use_process:
+            self._executor = InferenceExecutor(
+                max_workers=inference_workers,
+                use_process=True,
+                initializer=_init_worker_model,
+                initargs=(model_name, device, normalize, self.torch_threads),
+            )
+        else:
+            self._executor = InferenceExecutor(
+                max_workers=inference_workers,
+                name="embedding-inference",
+            )
     
     def _get_model(self):
         """Lazy load the model"""
-        if self._model is None:
-            try:
-                # Try FlagEmbedding first for BGE models
-                if "bge" in self.model_name.lower():
-                    try:
-                        from FlagEmbedding import FlagModel
-                        self._model = FlagModel(
-                            self.model_name,
-                            use_fp16=False,
-                        )
-                        self._model_type = "flag"
-                        logger.info("loaded_flag_embedding_model", model=self.model_name)
-                    except ImportError:
-                        pass
-                
-                # Fallback to sentence-transformers
-                if self._model is None:
-                    from sentence_transformers import SentenceTransformer
-                    self._model = SentenceTransformer(
-                        self.model_name,
-                        device=self.device,
+        with self._load_lock:
+            if self._model is None:
+                try:
+                    set_torch_threads(self.torch_threads)
+                    self._model, self._model_type = _load_local_model(self.model_name, self.device)
+                    
+                    # Get dimension
+                    test_embedding = _encode_with_model(
+                        self._model, self._model_type, ["test"], self.normalize
                     )
-                    self._model_type = "sentence_transformer"
-                    logger.info("loaded_sentence_transformer_model", model=self.model_name)
+                    self._dimension = len(test_embedding[0])
                 
-                # Get dimension
-                test_embedding = self._encode_sync(["test"])
-                self._dimension = len(test_embedding[0])
-                
-            except Exception as e:
-                logger.error("failed_to_load_embedding_model", model=self.model_name, error=str(e))
-                raise
+                except Exception as e:
+                    logger.error("failed_to_load_embedding_model", model=self.model_name, error=str(e))
+                    raise
         
         return self._model
     
-    def _encode_sync(self, texts: List[str]) -> List[List[float]]:
+    def _encode_sync(self, texts: List[str]) -> np.ndarray:
         """Synchronous encoding"""
         model = self._get_model()
-        
-        if self._model_type == "flag":
-            embeddings = model.encode(texts)
-        else:
-            embeddings = model.encode(
-                texts,
-                normalize_embeddings=self.normalize,
-                show_progress_bar=False,
-            )
-        
-        # Convert to list of lists
-        if isinstance(embeddings, np.ndarray):
-            return embeddings.tolist()
-        return [e.tolist() if hasattr(e, 'tolist') else list(e) for e in embeddings]
+        return _encode_with_model(model, self._model_type, texts, self.normalize)
     
     async def embed_text(self, text: str) -> List[float]:
         """Generate embedding for a single text"""
@@ -112,15 +184,32 @@ class LocalEmbeddingService(EmbeddingService):
     
     async def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for multiple texts"""
-        # Run in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._encode_sync, texts)
+        return (await self.embed_texts_array(texts)).tolist()
+    
+    async def embed_texts_array(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings as a float32 matrix, without boxing to Python floats"""
+        encode = _worker_encode if self.use_process else self._encode_sync
+        return as_embedding_array(await self._executor.run(encode, texts))
     
     def get_dimension(self) -> int:
         """Get embedding dimension"""
         if self._dimension is None:
-            self._get_model()  # This will set _dimension
+            if self.use_process:
+                self._dimension = len(self._executor.run_sync(_worker_encode, ["test"])[0])
+            else:
+                self._get_model()  # This will set _dimension
         return self._dimension
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get inference executor metrics"""
+        return {
+            "model": self.model_name,
+            "torch_threads": self.torch_threads,
+            **self._executor.get_stats(),
+        }
+    
+    def shutdown(self) -> None:
+        self._executor.shutdown()
 
 
 class OpenAIEmbeddingService(EmbeddingService):
@@ -166,41 +255,119 @@ class OllamaEmbeddingService(EmbeddingService):
     """
     Ollama embedding service
     Uses local Ollama server for embeddings
+    
+    Texts are sent in batches to /api/embed. Older servers without that
+    endpoint fall back to /api/embeddings (one prompt per request) with a
+    bounded number of concurrent requests over a pooled client.
     """
     
     def __init__(
         self,
         base_url: str = "http://localhost:11434",
         model: str = "bge-m3",
+        batch_size: int = 32,
+        max_concurrency: int = 4,
     ):
         import httpx
         self.base_url = base_url.rstrip("/")
         self.model = model
-        self.client = httpx.AsyncClient(timeout=120.0)
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.client = httpx.AsyncClient(
+            timeout=120.0,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._batch_supported: Optional[bool] = None
         self._dimension = None
     
     async def embed_text(self, text: str) -> List[float]:
         """Generate embedding for a single text"""
-        response = await self.client.post(
-            f"{self.base_url}/api/embeddings",
-            json={"model": self.model, "prompt": text}
-        )
+        embeddings = await self.embed_texts([text])
+        return embeddings[0]
+    
+    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for multiple texts"""
+        if not texts:
+            return []
+        
+        if self._batch_supported is not False:
+            batches = [
+                texts[i:i + self.batch_size]
+                for i in range(0, len(texts), self.batch_size)
+            ]
+            try:
+                results = []
+                if self._batch_supported is None:
+                    # Probe the endpoint with the first batch before fanning out
+                    results.append(await self._embed_batch(batches.pop(0)))
+                    self._batch_supported = True
+                results.extend(await asyncio.gather(*(self._embed_batch(b) for b in batches)))
+                return [embedding for batch in results for embedding in batch]
+            except _BatchEndpointUnavailable:
+                self._batch_supported = False
+                logger.warning("ollama_batch_embed_unavailable", base_url=self.base_url)
+        
+        return list(await asyncio.gather(*(self._embed_single(t) for t in texts)))
+    
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts with one /api/embed request"""
+        async with self._semaphore:
+            response = await self.client.post(
+                f"{self.base_url}/api/embed",
+                json={"model": self.model, "input": texts},
+            )
+        # Only a probe may switch batching off; later errors are real failures
+        if self._batch_supported is None and self._endpoint_missing(response):
+            raise _BatchEndpointUnavailable()
         response.raise_for_status()
-        embedding = response.json()["embedding"]
         
-        if self._dimension is None:
-            self._dimension = len(embedding)
+        embeddings = response.json()["embeddings"]
+        if len(embeddings) != len(texts):
+            raise ValueError(
+                f"Ollama returned {len(embeddings)} embeddings for {len(texts)} inputs"
+            )
+        self._set_dimension(embeddings[0])
+        return embeddings
+    
+    @staticmethod
+    def _endpoint_missing(response) -> bool:
+        """
+        Whether /api/embed doesn't exist (Ollama before 0.3.4)
         
+        Ollama also answers 404 for a model that isn't pulled yet, with a
+        JSON {"error": "model ... not found"} body; that must not disable
+        batching, so it's left to raise_for_status.
+        """
+        if response.status_code == 405:
+            return True
+        if response.status_code != 404:
+            return False
+        try:
+            body = response.json()
+        except ValueError:
+            return True  # Plain-text "404 page not found" from the router
+        error = body.get("error", "") if isinstance(body, dict) else ""
+        return "model" not in str(error).lower()
+    
+    async def _embed_single(self, text: str) -> List[float]:
+        """Embed one text with the legacy /api/embeddings endpoint"""
+        async with self._semaphore:
+            response = await self.client.post(
+                f"{self.base_url}/api/embeddings",
+                json={"model": self.model, "prompt": text}
+            )
+        response.raise_for_status()
+        embedding = response.json()["embedding"]
+        self._set_dimension(embedding)
         return embedding
     
-    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts"""
-        # Ollama doesn't support batch embeddings, so we do it sequentially
-        embeddings = []
-        for text in texts:
-            embedding = await self.embed_text(text)
-            embeddings.append(embedding)
-        return embeddings
+    def _set_dimension(self, embedding: List[float]) -> None:
+        if self._dimension is None:
+            self._dimension = len(embedding)
     
     def get_dimension(self) -> int:
         if self._dimension is None:
@@ -211,11 +378,27 @@ class OllamaEmbeddingService(EmbeddingService):
         return self._dimension
 
 
+class _BatchEndpointUnavailable(Exception):
+    """The Ollama server does not provide /api/embed"""
+    pass
+
+
 def create_embedding_service(
     provider: str = "local",
     model: str = "BAAI/bge-m3",
     openai_api_key: Optional[str] = None,
     ollama_base_url: str = "http://localhost:11434",
+    cache_enabled: bool = False,
+    cache_memory_size: int = 10000,
+    cache_path: Optional[str] = None,
+    batch_size: int = 32,
+    max_concurrency: int = 4,
+    micro_batch_enabled: bool = False,
+    micro_batch_max_size: int = 32,
+    micro_batch_max_wait_ms: float = 5.0,
+    inference_workers: int = 1,
+    torch_threads: int = 0,
+    inference_process: bool = False,
 ) -> EmbeddingService:
     """
     Factory function to create embedding service
@@ -225,6 +408,17 @@ def create_embedding_service(
         model: Model name/path
         openai_api_key: OpenAI API key (required for openai provider)
         ollama_base_url: Ollama server URL
+        cache_enabled: Wrap the service in a content-addressed embedding cache
+        cache_memory_size: Max entries in the in-memory LRU tier
+        cache_path: SQLite file for the persistent tier (None = memory only)
+        batch_size: Texts per embedding request (ollama provider)
+        max_concurrency: Max concurrent embedding requests (ollama provider)
+        micro_batch_enabled: Coalesce concurrent embed_text calls into batches
+        micro_batch_max_size: Max texts per micro-batch
+        micro_batch_max_wait_ms: Max time a call waits for its batch to fill
+        inference_workers: Dedicated inference workers (local provider)
+        torch_threads: Torch intra-op threads per worker, 0 = cores / workers
+        inference_process: Run the model in worker processes (local provider)
     
     Returns:
         Configured EmbeddingService instance
@@ -232,16 +426,42 @@ def create_embedding_service(
     if provider == "openai":
         if not openai_api_key:
             raise ValueError("OpenAI API key required for openai embedding provider")
-        return OpenAIEmbeddingService(
+        service = OpenAIEmbeddingService(
             api_key=openai_api_key,
             model=model,
         )
     elif provider == "ollama":
-        return OllamaEmbeddingService(
+        service = OllamaEmbeddingService(
             base_url=ollama_base_url,
             model=model,
+            batch_size=batch_size,
+            max_concurrency=max_concurrency,
         )
     else:  # local
-        return LocalEmbeddingService(
+        service = LocalEmbeddingService(
             model_name=model,
+            inference_workers=inference_workers,
+            torch_threads=torch_threads,
+            use_process=inference_process,
+        )
+    
+    if cache_enabled:
+        from src.infrastructure.embedding.cache import CachedEmbeddingService
+        service = CachedEmbeddingService(
+            inner=service,
+            model=f"{provider}/{model}",
+            memory_size=cache_memory_size,
+            persistent_path=cache_path,
+        )
+        logger.info("embedding_cache_enabled", model=f"{provider}/{model}", path=cache_path)
+    
+    if micro_batch_enabled:
+        # Outermost, so each batch is deduplicated and looked up in the cache at once
+        from src.infrastructure.embedding.batcher import MicroBatchingEmbeddingService
+        service = MicroBatchingEmbeddingService(
+            inner=service,
+            max_batch_size=micro_batch_max_size,
+            max_wait_ms=micro_batch_max_wait_ms,
         )
+    
+    return service
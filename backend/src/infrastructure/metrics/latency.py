@@ -0,0 +1,97 @@
+"""
+Latency Metrics
+Fixed-bucket latency histograms with percentile estimates
+"""
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+import threading
+import time
+from contextlib import contextmanager
+
+# Bucket upper bounds in milliseconds (last bucket is +inf)
+DEFAULT_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """
+    Cumulative latency histogram
+    
+    Percentiles are estimated as the upper bound of the bucket containing
+    them, which is what Prometheus-style histograms report as well.
+    """
+    
+    def __init__(self, buckets_ms: tuple = DEFAULT_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._counts = [0] * (len(self.buckets_ms) + 1)
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+        self._lock = threading.Lock()
+    
+    def observe(self, duration_ms: float) -> None:
+        with self._lock:
+            self._counts[bisect_left(self.buckets_ms, duration_ms)] += 1
+            self._total_ms += duration_ms
+            self._max_ms = max(self._max_ms, duration_ms)
+    
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+    
+    def percentile(self, p: float) -> Optional[float]:
+        """Estimated p-th percentile (0-100) in milliseconds"""
+        with self._lock:
+            total = sum(self._counts)
+            if not total:
+                return None
+            rank = p / 100 * total
+            seen = 0
+            for i, n in enumerate(self._counts):
+                seen += n
+                if seen >= rank and n:
+                    return float(self.buckets_ms[i]) if i < len(self.buckets_ms) else self._max_ms
+            return self._max_ms
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get count, mean, max, percentiles and bucket counts"""
+        count = self.count
+        buckets: Dict[str, int] = {}
+        for bound, n in zip(list(self.buckets_ms) + ["+inf"], self._counts):
+            buckets[f"le_{bound}"] = n
+        return {
+            "count": count,
+            "mean_ms": round(self._total_ms / count, 2) if count else 0.0,
+            "max_ms": round(self._max_ms, 2),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": buckets,
+        }
+
+
+class LatencyRecorder:
+    """Named latency histograms (one per operation)"""
+    
+    def __init__(self, buckets_ms: tuple = DEFAULT_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self._histograms: Dict[str, LatencyHistogram] = {}
+    
+    def histogram(self, name: str) -> LatencyHistogram:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms.setdefault(name, LatencyHistogram(self.buckets_ms))
+        return histogram
+    
+    @contextmanager
+    def measure(self, name: str):
+        """Record the duration of the wrapped block under name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histogram(name).observe((time.perf_counter() - start) * 1000)
+    
+    def names(self) -> List[str]:
+        return sorted(self._histograms)
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: self._histograms[name].snapshot() for name in self.names()}
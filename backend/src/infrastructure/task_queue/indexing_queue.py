@@ -0,0 +1,326 @@
+"""
+Indexing Queue
+Background execution of document indexing (summary, tagging, chunking, embedding)
+
+Backends:
+- asyncio: in-process worker pool with a bounded queue (default)
+- arq: Redis-backed queue consumed by a separate worker process (see worker.py)
+
+Durability comes from the `indexing_jobs` outbox table, which is written in the
+same transaction as the document; the queue only carries document IDs.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+import asyncio
+import time
+
+import structlog
+
+logger = structlog.get_logger()
+
+IndexingHandler = Callable[[str], Awaitable[Any]]
+
+
+class IndexingQueueFullError(Exception):
+    """Raised when the indexing queue cannot accept more work (backpressure)"""
+    pass
+
+
+class IndexingQueue(ABC):
+    """Abstract indexing job queue"""
+    
+    @abstractmethod
+    async def start(self) -> None:
+        """Start the queue (workers or broker connection)"""
+        pass
+    
+    @abstractmethod
+    async def stop(self, timeout: float = 30.0) -> None:
+        """Stop the queue, letting in-flight jobs finish up to timeout seconds"""
+        pass
+    
+    @abstractmethod
+    async def enqueue(self, doc_id: str) -> None:
+        """Enqueue a document for indexing"""
+        pass
+    
+    @abstractmethod
+    def is_full(self) -> bool:
+        """Whether new work would currently be rejected"""
+        pass
+    
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue statistics"""
+        pass
+    
+    async def enqueue_many(self, doc_ids: List[str]) -> int:
+        """
+        Enqueue several documents, stopping at the first rejection
+        
+        Returns:
+            Number of documents enqueued
+        """
+        enqueued = 0
+        for doc_id in doc_ids:
+            try:
+                await self.enqueue(doc_id)
+            except IndexingQueueFullError:
+                logger.warning("indexing_queue_full", remaining=len(doc_ids) - enqueued)
+                break
+            enqueued += 1
+        return enqueued
+    
+    async def recover(self, doc_ids: List[str]) -> int:
+        """
+        Re-enqueue jobs found in the outbox, skipping ones already queued or running
+        
+        Returns:
+            Number of documents enqueued
+        """
+        return await self.enqueue_many(doc_ids)
+
+
+class AsyncioIndexingQueue(IndexingQueue):
+    """
+    In-process indexing queue backed by asyncio tasks
+    
+    Features:
+    - Fixed worker pool (concurrency)
+    - Bounded queue with enqueue timeout (backpressure)
+    - Coalescing: a document already waiting is not queued twice, and a
+      document enqueued while running is re-indexed once afterwards
+    """
+    
+    def __init__(
+        self,
+        handler: IndexingHandler,
+        concurrency: int = 2,
+        max_size: int = 100,
+        enqueue_timeout: float = 5.0,
+    ):
+        self.handler = handler
+        self.concurrency = max(1, concurrency)
+        self.max_size = max_size
+        self.enqueue_timeout = enqueue_timeout
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._queued: Set[str] = set()
+        self._running: Set[str] = set()
+        self._rerun: Set[str] = set()
+        self._stopping = False
+        
+        self.processed = 0
+        self.failed = 0
+    
+    async def start(self) -> None:
+        if self._workers:
+            return
+        self._stopping = False
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"indexing-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        logger.info(
+            "indexing_queue_started",
+            backend="asyncio",
+            concurrency=self.concurrency,
+            max_size=self.max_size,
+        )
+    
+    async def stop(self, timeout: float = 30.0) -> None:
+        if not self._workers:
+            return
+        
+        # Queued jobs are left in the outbox and re-enqueued on next start
+        self._stopping = True
+        deadline = time.monotonic() + timeout
+        while self._running and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        
+        self._workers = []
+        self._queue = None
+        self._queued.clear()
+        logger.info("indexing_queue_stopped", abandoned=len(self._running))
+        self._running.clear()
+    
+    async def enqueue(self, doc_id: str) -> None:
+        if self._queue is None:
+            raise RuntimeError("Indexing queue is not started")
+        
+        if doc_id in self._queued:
+            return
+        if doc_id in self._running:
+            self._rerun.add(doc_id)
+            return
+        
+        self._queued.add(doc_id)
+        try:
+            await asyncio.wait_for(self._queue.put(doc_id), timeout=self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            self._queued.discard(doc_id)
+            raise IndexingQueueFullError(
+                f"Indexing queue is full ({self.max_size} jobs), retry later"
+            )
+    
+    async def recover(self, doc_ids: List[str]) -> int:
+        # A running job still has its outbox entry; don't schedule a re-run for it
+        active = self._queued | self._running
+        return await self.enqueue_many([d for d in doc_ids if d not in active])
+    
+    def is_full(self) -> bool:
+        return self._queue is not None and self._queue.full()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "asyncio",
+            "concurrency": self.concurrency,
+            "max_size": self.max_size,
+            "queued": len(self._queued),
+            "running": len(self._running),
+            "processed": self.processed,
+            "failed": self.failed,
+        }
+    
+    async def _worker(self, worker_id: int) -> None:
+        """Worker loop: take a document ID and run the handler"""
+        while not self._stopping:
+            doc_id = await self._queue.get()
+            self._queued.discard(doc_id)
+            if self._stopping:
+                break
+            
+            self._running.add(doc_id)
+            try:
+                # Re-run while the document was enqueued again during indexing
+                while True:
+                    self._rerun.discard(doc_id)
+                    await self._run_job(worker_id, doc_id)
+                    if doc_id not in self._rerun or self._stopping:
+                        break
+            finally:
+                self._running.discard(doc_id)
+                self._queue.task_done()
+    
+    async def _run_job(self, worker_id: int, doc_id: str) -> None:
+        start = time.perf_counter()
+        try:
+            await self.handler(doc_id)
+            self.processed += 1
+            logger.info(
+                "indexing_job_completed",
+                doc_id=doc_id,
+                worker=worker_id,
+                duration_ms=round((time.perf_counter() - start) * 1000, 1),
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.error("indexing_job_failed", doc_id=doc_id, worker=worker_id, error=str(e))
+
+
+class ArqIndexingQueue(IndexingQueue):
+    """
+    Redis-backed indexing queue using arq
+    
+    Jobs are executed by a separate worker process:
+        arq worker.WorkerSettings
+    
+    A document has one job at a time (job ID per document), so outbox
+    sweeps don't pile up duplicates. An edit made while its job runs is
+    picked up by the next sweep, since its newer outbox entry survives.
+    """
+    
+    JOB_NAME = "index_document_job"
+    
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379",
+        queue_name: str = "arq:indexing",
+    ):
+        self.redis_url = redis_url
+        self.queue_name = queue_name
+        self._pool = None
+        self.enqueued = 0
+    
+    async def start(self) -> None:
+        if self._pool is not None:
+            return
+        try:
+            from arq import create_pool
+            from arq.connections import RedisSettings
+        except ImportError as e:
+            raise RuntimeError("arq indexing backend requires the 'arq' package") from e
+        
+        self._pool = await create_pool(
+            RedisSettings.from_dsn(self.redis_url),
+            default_queue_name=self.queue_name,
+        )
+        logger.info("indexing_queue_started", backend="arq", queue=self.queue_name)
+    
+    async def stop(self, timeout: float = 30.0) -> None:
+        if self._pool is not None:
+            await self._pool.aclose()
+            self._pool = None
+    
+    async def enqueue(self, doc_id: str) -> None:
+        if self._pool is None:
+            raise RuntimeError("Indexing queue is not started")
+        job = await self._pool.enqueue_job(self.JOB_NAME, doc_id, _job_id=f"index:{doc_id}")
+        if job is not None:
+            self.enqueued += 1
+    
+    def is_full(self) -> bool:
+        return False
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "arq",
+            "queue_name": self.queue_name,
+            "enqueued": self.enqueued,
+        }
+
+
+def create_indexing_queue(
+    backend: str = "asyncio",
+    handler: Optional[IndexingHandler] = None,
+    concurrency: int = 2,
+    max_size: int = 100,
+    enqueue_timeout: float = 5.0,
+    redis_url: str = "redis://localhost:6379",
+    queue_name: str = "arq:indexing",
+) -> Optional[IndexingQueue]:
+    """
+    Factory function to create the indexing queue
+    
+    Args:
+        backend: "inline" (no queue), "asyncio", or "arq"
+        handler: Async callable indexing one document (asyncio backend)
+        concurrency: Number of concurrent indexing workers
+        max_size: Maximum queued jobs before enqueue blocks
+        enqueue_timeout: Seconds to wait for queue space before rejecting
+        redis_url: Redis URL (arq backend)
+        queue_name: Redis queue name (arq backend)
+    
+    Returns:
+        IndexingQueue, or None when indexing runs inline
+    """
+    if backend == "inline":
+        return None
+    if backend == "arq":
+        return ArqIndexingQueue(redis_url=redis_url, queue_name=queue_name)
+    if handler is None:
+        raise ValueError("handler required for asyncio indexing queue")
+    return AsyncioIndexingQueue(
+        handler=handler,
+        concurrency=concurrency,
+        max_size=max_size,
+        enqueue_timeout=enqueue_timeout,
+    )
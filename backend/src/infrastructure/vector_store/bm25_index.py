@@ -0,0 +1,179 @@
+"""
+BM25 Keyword Index
+Persistent inverted index over chunk text for hybrid search
+
+Backed by SQLite FTS5, which stores the inverted index on disk and ranks
+matches with BM25. Text is tokenized before indexing so mixed Chinese and
+English notes are searchable:
+- Other word runs (any script: Latin with accents, Cyrillic, Greek, digits)
+  become lowercase word tokens
+- CJK runs become overlapping character bigrams (single characters kept
+  for one-character runs), the usual dictionary-free CJK indexing scheme
+"""
+from typing import Dict, List, Optional, Tuple
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"  # Kana, CJK, Hangul
+_TOKEN_RE = re.compile(
+    rf"([{_CJK}]+)"      # CJK runs (bigrams)
+    rf"|[^\W{_CJK}]+"    # Word runs in any other script
+)
+
+# Bump when tokenize() changes; older indexes are cleared and rebuilt
+TOKENIZER_VERSION = 2
+
+
+def tokenize(text: str) -> List[str]:
+    """Tokenize mixed CJK/other-script text into index terms"""
+    tokens = []
+    for match in _TOKEN_RE.finditer(unicodedata.normalize("NFKC", text).lower()):
+        run = match.group()
+        if match.group(1) is None or len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+class BM25Index:
+    """
+    Persistent BM25 inverted index (SQLite FTS5)
+    
+    chunk_map holds chunk_id -> rowid (and document_id for bulk deletes);
+    chunk_fts holds the tokenized text under the same rowid.
+    """
+    
+    _BATCH = 500  # Stay under SQLite's bound-parameter limit
+    
+    def __init__(self, path: str = "./data/bm25_index.db"):
+        self.path = path
+        db_dir = os.path.dirname(path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS chunk_map (
+                rid INTEGER PRIMARY KEY AUTOINCREMENT,
+                chunk_id TEXT NOT NULL UNIQUE,
+                document_id TEXT
+            );
+            CREATE INDEX IF NOT EXISTS ix_chunk_map_document_id ON chunk_map (document_id);
+            CREATE VIRTUAL TABLE IF NOT EXISTS chunk_fts USING fts5(tokens, tokenize='unicode61');
+            """
+        )
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != TOKENIZER_VERSION:
+            # Terms from another tokenizer wouldn't match queries; the vector
+            # store's sync_keyword_index refills the empty index
+            self._conn.execute("DELETE FROM chunk_map")
+            self._conn.execute("DELETE FROM chunk_fts")
+            self._conn.execute(f"PRAGMA user_version = {TOKENIZER_VERSION}")
+        self._conn.commit()
+    
+    def add(
+        self,
+        ids: List[str],
+        documents: List[str],
+        document_ids: Optional[List[Optional[str]]] = None,
+    ) -> None:
+        """Index chunks (existing chunk IDs are replaced)"""
+        if not ids:
+            return
+        document_ids = document_ids or [None] * len(ids)
+        
+        with self._lock, self._conn:
+            self._delete_chunks(ids)
+            for chunk_id, text, document_id in zip(ids, documents, document_ids):
+                cursor = self._conn.execute(
+                    "INSERT INTO chunk_map (chunk_id, document_id) VALUES (?, ?)",
+                    (chunk_id, document_id),
+                )
+                self._conn.execute(
+                    "INSERT INTO chunk_fts (rowid, tokens) VALUES (?, ?)",
+                    (cursor.lastrowid, " ".join(tokenize(text))),
+                )
+    
+    def delete_by_ids(self, ids: List[str]) -> None:
+        """Remove chunks from the index"""
+        if ids:
+            with self._lock, self._conn:
+                self._delete_chunks(ids)
+    
+    def delete_by_document(self, doc_id: str) -> None:
+        """Remove all chunks of a document from the index"""
+        with self._lock, self._conn:
+            rids = [
+                row[0] for row in self._conn.execute(
+                    "SELECT rid FROM chunk_map WHERE document_id = ?", (doc_id,)
+                )
+            ]
+            self._delete_rids(rids)
+    
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Find chunks matching any query term, best BM25 score first
+        
+        Returns:
+            List of (chunk_id, score); higher scores are better
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        match = " OR ".join(f'"{term}"' for term in terms)
+        
+        with self._lock:
+            # Top-k is selected inside FTS5 (rank = bm25) before joining IDs
+            rows = self._conn.execute(
+                "SELECT m.chunk_id, f.rank FROM ("
+                "SELECT rowid, rank FROM chunk_fts WHERE chunk_fts MATCH ? "
+                "ORDER BY rank LIMIT ?"
+                ") f JOIN chunk_map m ON m.rid = f.rowid ORDER BY f.rank",
+                (match, top_k),
+            ).fetchall()
+        # FTS5 bm25() is negated so that ascending order is best first
+        return [(chunk_id, -rank) for chunk_id, rank in rows]
+    
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM chunk_map").fetchone()[0]
+    
+    def clear(self) -> None:
+        """Remove everything from the index"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM chunk_map")
+            self._conn.execute("DELETE FROM chunk_fts")
+    
+    def get_stats(self) -> Dict[str, int]:
+        return {"chunks": self.count()}
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+    
+    def _delete_chunks(self, ids: List[str]) -> None:
+        """Delete chunks by ID (caller holds the lock and transaction)"""
+        rids = []
+        for i in range(0, len(ids), self._BATCH):
+            batch = ids[i:i + self._BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rids.extend(
+                row[0] for row in self._conn.execute(
+                    f"SELECT rid FROM chunk_map WHERE chunk_id IN ({placeholders})", batch
+                )
+            )
+        self._delete_rids(rids)
+    
+    def _delete_rids(self, rids: List[int]) -> None:
+        for i in range(0, len(rids), self._BATCH):
+            batch = rids[i:i + self._BATCH]
+            placeholders = ",".join("?" * len(batch))
+            self._conn.execute(f"DELETE FROM chunk_fts WHERE rowid IN ({placeholders})", batch)
+            self._conn.execute(f"DELETE FROM chunk_map WHERE rid IN ({placeholders})", batch)
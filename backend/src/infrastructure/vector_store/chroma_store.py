@@ -1,17 +1,31 @@
 """
 Vector Store Service
 Chroma-based vector storage for semantic search
-Supports hybrid search (vector + keyword)
+Supports hybrid search (vector + BM25 keyword index, fused with RRF)
 """
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Dict, Any, TypeVar, Union
+import asyncio
+import json
 import os
 import structlog
 
+import numpy as np
+
 import chromadb
 from chromadb.config import Settings as ChromaSettings
 
+from src.infrastructure.metrics.latency import LatencyRecorder
+from src.infrastructure.vector_store.bm25_index import BM25Index
+
 logger = structlog.get_logger()
 
+# Embeddings may be passed as lists or as float32 NumPy arrays (no conversion)
+Embeddings = Union[List[List[float]], np.ndarray]
+Embedding = Union[List[float], np.ndarray]
+
+T = TypeVar("T")
+
 
 class ChromaVectorStore:
     """
@@ -20,28 +34,52 @@ class ChromaVectorStore:
     Features:
     - Persistent storage
     - Metadata filtering
-    - Hybrid search (semantic + keyword via metadata)
+    - Hybrid search (semantic + BM25 keyword index, reciprocal rank fusion)
+    
+    Chroma calls are blocking, so they run on a dedicated bounded executor
+    instead of the event loop. Reads run concurrently; writes are serialized
+    among themselves but do not block reads. Per-operation latency
+    histograms are reported by get_collection_stats.
     """
     
     def __init__(
         self,
         persist_directory: str = "./data/chroma",
         collection_name: str = "knowledge_base",
+        keyword_index: Optional[BM25Index] = None,
+        rrf_k: int = 60,
+        executor_workers: int = 4,
+        host: Optional[str] = None,
+        port: int = 8000,
     ):
         self.persist_directory = persist_directory
         self.collection_name = collection_name
+        self.keyword_index = keyword_index
+        self.rrf_k = rrf_k
         
-        # Ensure directory exists
-        os.makedirs(persist_directory, exist_ok=True)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, executor_workers),
+            thread_name_prefix="vector-store",
+        )
+        self._write_lock = asyncio.Lock()
+        self.latency = LatencyRecorder()
         
-        # Initialize Chroma client with persistence
-        self.client = chromadb.PersistentClient(
-            path=persist_directory,
-            settings=ChromaSettings(
-                anonymized_telemetry=False,
-                allow_reset=True,
-            )
+        chroma_settings = ChromaSettings(
+            anonymized_telemetry=False,
+            allow_reset=True,
         )
+        if host:
+            # Client/server mode: safe to share between processes (API and workers)
+            self.client = chromadb.HttpClient(host=host, port=port, settings=chroma_settings)
+        else:
+            # Ensure directory exists
+            os.makedirs(persist_directory, exist_ok=True)
+            
+            # Embedded client with persistence (one process only)
+            self.client = chromadb.PersistentClient(
+                path=persist_directory,
+                settings=chroma_settings,
+            )
         
         # Get or create collection
         self.collection = self.client.get_or_create_collection(
@@ -51,7 +89,8 @@ class ChromaVectorStore:
         
         logger.info(
             "chroma_initialized",
-            persist_dir=persist_directory,
+            persist_dir=None if host else persist_directory,
+            host=host,
             collection=collection_name,
             count=self.collection.count()
         )
@@ -59,7 +98,7 @@ class ChromaVectorStore:
     async def add_documents(
         self,
         ids: List[str],
-        embeddings: List[List[float]],
+        embeddings: Embeddings,
         documents: List[str],
         metadatas: Optional[List[Dict[str, Any]]] = None,
     ) -> None:
@@ -68,7 +107,7 @@ class ChromaVectorStore:
         
         Args:
             ids: Unique identifiers for each document
-            embeddings: Pre-computed embeddings
+            embeddings: Pre-computed embeddings (list of vectors or 2-D array)
             documents: Original text content
             metadatas: Optional metadata for each document
         """
@@ -79,7 +118,50 @@ class ChromaVectorStore:
         if metadatas is None:
             metadatas = [{}] * len(ids)
         
-        # Clean metadata (Chroma doesn't support None values)
+        def add():
+            self.collection.add(
+                ids=ids,
+                embeddings=embeddings,
+                documents=documents,
+                metadatas=self._clean_metadatas(metadatas),
+            )
+            if self.keyword_index is not None:
+                self.keyword_index.add(
+                    ids=ids,
+                    documents=documents,
+                    document_ids=[meta.get("document_id") for meta in metadatas],
+                )
+        
+        await self._run("add", add, write=True)
+        
+        logger.info("added_documents_to_chroma", count=len(ids))
+    
+    async def update_metadata(
+        self,
+        ids: List[str],
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Update metadata of existing vectors without re-embedding
+        
+        Args:
+            ids: Identifiers of stored documents
+            metadatas: Replacement metadata for each document
+        """
+        if not ids:
+            return
+        
+        await self._run(
+            "update",
+            lambda: self.collection.update(ids=ids, metadatas=self._clean_metadatas(metadatas)),
+            write=True,
+        )
+        
+        logger.info("updated_chroma_metadata", count=len(ids))
+    
+    @staticmethod
+    def _clean_metadatas(metadatas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Clean metadata (Chroma doesn't support None values)"""
         clean_metadatas = []
         for meta in metadatas:
             clean_meta = {}
@@ -87,24 +169,15 @@ class ChromaVectorStore:
                 if v is not None:
                     # Convert complex types to strings
                     if isinstance(v, (list, dict)):
-                        import json
                         clean_meta[k] = json.dumps(v)
                     else:
                         clean_meta[k] = v
             clean_metadatas.append(clean_meta)
-        
-        self.collection.add(
-            ids=ids,
-            embeddings=embeddings,
-            documents=documents,
-            metadatas=clean_metadatas,
-        )
-        
-        logger.info("added_documents_to_chroma", count=len(ids))
+        return clean_metadatas
     
     async def search(
         self,
-        query_embedding: List[float],
+        query_embedding: Embedding,
         top_k: int = 5,
         filters: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
@@ -121,12 +194,17 @@ class ChromaVectorStore:
         """
         where = filters if filters else None
         
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
+        if isinstance(query_embedding, np.ndarray):
+            query_embeddings = query_embedding.reshape(1, -1)
+        else:
+            query_embeddings = [query_embedding]
+        
+        results = await self._run("query", lambda: self.collection.query(
+            query_embeddings=query_embeddings,
             n_results=top_k,
             where=where,
             include=["documents", "metadatas", "distances"]
-        )
+        ))
         
         # Format results
         formatted = []
@@ -144,34 +222,93 @@ class ChromaVectorStore:
     async def hybrid_search(
         self,
         query: str,
-        query_embedding: List[float],
+        query_embedding: Embedding,
         top_k: int = 5,
         filters: Optional[Dict[str, Any]] = None,
-        semantic_weight: float = 0.7,
+        semantic_weight: Optional[float] = None,
     ) -> List[Dict[str, Any]]:
         """
         Hybrid search combining semantic and keyword matching
         
-        Note: True hybrid search requires BM25 index. This implementation
-        uses Chroma's built-in keyword search capabilities.
+        Vector hits and BM25 keyword hits are retrieved independently and
+        fused with weighted reciprocal rank fusion, so exact keyword matches
+        outside the semantic candidates are still found. Without a keyword
+        index, semantic hits are re-ranked by query term overlap.
         
         Args:
             query: Text query for keyword matching
             query_embedding: Query vector for semantic matching
             top_k: Number of results
             filters: Metadata filters
-            semantic_weight: Weight for semantic vs keyword (0-1)
+            semantic_weight: Weight for semantic vs keyword (0-1), defaults to
+                0.5 with RRF (standard fusion) and 0.7 without a keyword index
         
         Returns:
             Combined and re-ranked results
         """
-        # Get semantic results
-        semantic_results = await self.search(
-            query_embedding=query_embedding,
-            top_k=top_k * 2,  # Get more results for re-ranking
-            filters=filters,
+        if self.keyword_index is None:
+            semantic_results = await self.search(
+                query_embedding=query_embedding,
+                top_k=top_k * 2,  # Get more results for re-ranking
+                filters=filters,
+            )
+            weight = 0.7 if semantic_weight is None else semantic_weight
+            return self._keyword_boost(query, semantic_results, top_k, weight)
+        
+        if semantic_weight is None:
+            semantic_weight = 0.5
+        
+        # Run both retrievers concurrently
+        semantic_results, keyword_hits = await asyncio.gather(
+            self.search(
+                query_embedding=query_embedding,
+                top_k=top_k * 2,
+                filters=filters,
+            ),
+            self._run("keyword_search", lambda: self.keyword_index.search(query, top_k=top_k * 2)),
         )
         
+        fused: Dict[str, Dict[str, Any]] = {}
+        for rank, result in enumerate(semantic_results, start=1):
+            fused[result["id"]] = {
+                **result,
+                "semantic_score": result["score"],
+                "keyword_score": None,
+                "rrf": semantic_weight / (self.rrf_k + rank),
+            }
+        
+        # Content and metadata for keyword-only hits
+        keyword_only = [chunk_id for chunk_id, _ in keyword_hits if chunk_id not in fused]
+        fetched = {r["id"]: r for r in await self.get_by_ids(keyword_only)} if keyword_only else {}
+        
+        for rank, (chunk_id, bm25_score) in enumerate(keyword_hits, start=1):
+            entry = fused.get(chunk_id)
+            if entry is None:
+                record = fetched.get(chunk_id)
+                if record is None or not self._matches_filters(record["metadata"], filters):
+                    continue
+                entry = fused[chunk_id] = {**record, "semantic_score": None, "rrf": 0.0}
+            entry["keyword_score"] = bm25_score
+            entry["rrf"] += (1 - semantic_weight) / (self.rrf_k + rank)
+        
+        # Normalize so a first-place hit in both lists scores 1.0
+        best = 1 / (self.rrf_k + 1)
+        results = []
+        for entry in fused.values():
+            entry["score"] = entry.pop("rrf") / best
+            results.append(entry)
+        
+        results.sort(key=lambda x: x["score"], reverse=True)
+        return results[:top_k]
+    
+    @staticmethod
+    def _keyword_boost(
+        query: str,
+        semantic_results: List[Dict[str, Any]],
+        top_k: int,
+        semantic_weight: float,
+    ) -> List[Dict[str, Any]]:
+        """Re-rank semantic hits by query term overlap (no keyword index)"""
         # Simple keyword boost: increase score if query terms appear in content
         query_terms = set(query.lower().split())
         
@@ -191,30 +328,74 @@ class ChromaVectorStore:
         
         return semantic_results[:top_k]
     
+    @classmethod
+    def _matches_filters(cls, metadata: Dict[str, Any], filters: Optional[Dict[str, Any]]) -> bool:
+        """Evaluate a Chroma where clause against metadata (for keyword-only hits)"""
+        if not filters:
+            return True
+        for key, condition in filters.items():
+            if key == "$and":
+                if not all(cls._matches_filters(metadata, f) for f in condition):
+                    return False
+            elif key == "$or":
+                if not any(cls._matches_filters(metadata, f) for f in condition):
+                    return False
+            elif isinstance(condition, dict):
+                value = metadata.get(key)
+                for op, expected in condition.items():
+                    if op == "$eq":
+                        ok = value == expected
+                    elif op == "$ne":
+                        ok = value != expected
+                    elif op == "$in":
+                        ok = value in expected
+                    elif op == "$nin":
+                        ok = value not in expected
+                    else:
+                        return False  # Unsupported operator: keep semantic hits only
+                    if not ok:
+                        return False
+            elif metadata.get(key) != condition:
+                return False
+        return True
+    
     async def delete_by_document(self, doc_id: str) -> None:
         """Delete all vectors associated with a document"""
-        # Get all chunk IDs for this document
-        results = self.collection.get(
-            where={"document_id": doc_id},
-            include=[]
-        )
+        def delete() -> List[str]:
+            # Get all chunk IDs for this document
+            results = self.collection.get(
+                where={"document_id": doc_id},
+                include=[]
+            )
+            if results["ids"]:
+                self.collection.delete(ids=results["ids"])
+            if self.keyword_index is not None:
+                self.keyword_index.delete_by_document(doc_id)
+            return results["ids"]
         
-        if results["ids"]:
-            self.collection.delete(ids=results["ids"])
-            logger.info("deleted_document_vectors", doc_id=doc_id, count=len(results["ids"]))
+        deleted = await self._run("delete", delete, write=True)
+        if deleted:
+            logger.info("deleted_document_vectors", doc_id=doc_id, count=len(deleted))
     
     async def delete_by_ids(self, ids: List[str]) -> None:
         """Delete vectors by their IDs"""
-        if ids:
+        if not ids:
+            return
+        
+        def delete():
             self.collection.delete(ids=ids)
-            logger.info("deleted_vectors_by_ids", count=len(ids))
+            if self.keyword_index is not None:
+                self.keyword_index.delete_by_ids(ids)
+        
+        await self._run("delete", delete, write=True)
+        logger.info("deleted_vectors_by_ids", count=len(ids))
     
     async def get_by_ids(self, ids: List[str]) -> List[Dict[str, Any]]:
         """Get documents by their IDs"""
-        results = self.collection.get(
+        results = await self._run("get", lambda: self.collection.get(
             ids=ids,
             include=["documents", "metadatas"]
-        )
+        ))
         
         formatted = []
         if results["ids"]:
@@ -231,26 +412,107 @@ class ChromaVectorStore:
         """Get collection statistics"""
         return {
             "name": self.collection_name,
-            "count": self.collection.count(),
+            "count": await self._run("count", self.collection.count),
             "persist_directory": self.persist_directory,
+            "keyword_index": self.keyword_index.get_stats() if self.keyword_index else None,
+            "latency": self.latency.snapshot(),
         }
     
+    async def sync_keyword_index(self, batch_size: int = 1000) -> int:
+        """
+        Rebuild the keyword index from Chroma if they are out of sync
+        (e.g. first start after enabling it)
+        
+        Returns:
+            Number of chunks indexed
+        """
+        if self.keyword_index is None:
+            return 0
+        
+        def rebuild() -> int:
+            total = self.collection.count()
+            if self.keyword_index.count() == total:
+                return 0
+            
+            self.keyword_index.clear()
+            indexed = 0
+            for offset in range(0, total, batch_size):
+                results = self.collection.get(
+                    limit=batch_size,
+                    offset=offset,
+                    include=["documents", "metadatas"],
+                )
+                self.keyword_index.add(
+                    ids=results["ids"],
+                    documents=results["documents"],
+                    document_ids=[(m or {}).get("document_id") for m in results["metadatas"]],
+                )
+                indexed += len(results["ids"])
+            return indexed
+        
+        indexed = await self._run("sync_keyword_index", rebuild, write=True)
+        if indexed:
+            logger.info("keyword_index_rebuilt", count=indexed)
+        return indexed
+    
     async def reset(self) -> None:
         """Reset the collection (delete all data)"""
-        self.client.delete_collection(self.collection_name)
-        self.collection = self.client.get_or_create_collection(
-            name=self.collection_name,
-            metadata={"hnsw:space": "cosine"}
-        )
+        def reset():
+            self.client.delete_collection(self.collection_name)
+            self.collection = self.client.get_or_create_collection(
+                name=self.collection_name,
+                metadata={"hnsw:space": "cosine"}
+            )
+            if self.keyword_index is not None:
+                self.keyword_index.clear()
+        
+        await self._run("reset", reset, write=True)
         logger.warning("collection_reset", collection=self.collection_name)
+    
+    def shutdown(self) -> None:
+        """Stop the executor and close the keyword index (call on app shutdown)"""
+        self._executor.shutdown(wait=True)
+        if self.keyword_index is not None:
+            self.keyword_index.close()
+    
+    async def _run(self, operation: str, fn: Callable[[], T], write: bool = False) -> T:
+        """Run a blocking call on the store executor, recording its latency"""
+        loop = asyncio.get_running_loop()
+        with self.latency.measure(operation):
+            if write:
+                async with self._write_lock:
+                    return await loop.run_in_executor(self._executor, fn)
+            return await loop.run_in_executor(self._executor, fn)
 
 
 def create_vector_store(
     persist_directory: str = "./data/chroma",
     collection_name: str = "knowledge_base",
+    keyword_index_path: Optional[str] = None,
+    rrf_k: int = 60,
+    executor_workers: int = 4,
+    host: Optional[str] = None,
+    port: int = 8000,
 ) -> ChromaVectorStore:
-    """Factory function to create vector store"""
+    """
+    Factory function to create vector store
+    
+    Args:
+        persist_directory: Chroma data directory
+        collection_name: Chroma collection name
+        keyword_index_path: SQLite file for the BM25 keyword index (None = disabled)
+        rrf_k: Reciprocal rank fusion constant for hybrid search
+        executor_workers: Threads for blocking Chroma calls
+        host: Chroma server host (None = embedded PersistentClient)
+        port: Chroma server port
+    """
+    keyword_index = BM25Index(keyword_index_path) if keyword_index_path else None
     return ChromaVectorStore(
         persist_directory=persist_directory,
         collection_name=collection_name,
+        keyword_index=keyword_index,
+        rrf_k=rrf_k,
+        executor_workers=executor_workers,
+        host=host,
+        port=port,
     )
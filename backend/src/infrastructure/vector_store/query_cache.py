@@ -0,0 +1,180 @@
+"""
+Retrieval Result Cache
+Caches context retrieval results across requests
+
+Lookups go through two tiers:
+- exact: normalized query text, top_k and filters
+- near-duplicate (optional): cosine similarity between query embeddings,
+  for the same top_k and filters
+
+Every index write bumps a generation counter, which empties the cache and
+stops in-flight retrievals from storing results computed against the old
+index. Entries also expire after a TTL, and the least recently used are
+evicted beyond max_size.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import time
+
+import numpy as np
+import structlog
+
+from src.infrastructure.embedding.cache import normalize_text
+
+logger = structlog.get_logger()
+
+CacheKey = Tuple[str, int, str]
+
+
+@dataclass
+class _CachedResult:
+    results: List[Dict[str, Any]]
+    embedding: Optional[np.ndarray]  # Unit-length query embedding
+    expires_at: float
+
+
+class QueryResultCache:
+    """In-process LRU cache of retrieval results with generation invalidation"""
+    
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl_seconds: float = 300.0,
+        similarity_threshold: float = 0.0,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.generation = 0
+        self._entries: "OrderedDict[CacheKey, _CachedResult]" = OrderedDict()
+        
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+    
+    @staticmethod
+    def make_key(query: str, top_k: int, filters: Optional[Dict[str, Any]] = None) -> CacheKey:
+        return (normalize_text(query), top_k, json.dumps(filters, sort_keys=True, default=str))
+    
+    @staticmethod
+    def _copy(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Callers add keys to result dicts (e.g. search enrichment)
+        return [dict(r) for r in results]
+    
+    def get(self, key: CacheKey) -> Optional[List[Dict[str, Any]]]:
+        """Exact-match lookup (no miss is counted; see get_similar)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        self.exact_hits += 1
+        return self._copy(entry.results)
+    
+    def get_similar(
+        self, key: CacheKey, query_embedding: List[float]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Near-duplicate lookup by query embedding, after an exact miss
+        Counts a miss when nothing is close enough (or the tier is off)
+        """
+        if self.similarity_threshold <= 0:
+            self.misses += 1
+            return None
+        
+        now = time.monotonic()
+        candidates = [
+            (k, e) for k, e in self._entries.items()
+            if k[1:] == key[1:] and e.embedding is not None and e.expires_at > now
+        ]
+        if candidates:
+            query = self._unit(query_embedding)
+            scores = np.stack([e.embedding for _, e in candidates]) @ query
+            best = int(np.argmax(scores))
+            if scores[best] >= self.similarity_threshold:
+                best_key, entry = candidates[best]
+                self._entries.move_to_end(best_key)
+                self.similar_hits += 1
+                return self._copy(entry.results)
+        
+        self.misses += 1
+        return None
+    
+    def put(
+        self,
+        key: CacheKey,
+        results: List[Dict[str, Any]],
+        query_embedding: Optional[List[float]],
+        generation: int,
+    ) -> None:
+        """Store results computed at generation (dropped if the index changed since)"""
+        if generation != self.generation:
+            return
+        embedding = None
+        if query_embedding is not None and self.similarity_threshold > 0:
+            embedding = self._unit(query_embedding)
+        self._entries[key] = _CachedResult(
+            results=self._copy(results),
+            embedding=embedding,
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def bump(self) -> None:
+        """Invalidate everything after an index write"""
+        self.generation += 1
+        if self._entries:
+            self.invalidations += 1
+            logger.debug("query_cache_invalidated", generation=self.generation)
+        self._entries.clear()
+    
+    @staticmethod
+    def _unit(vector: List[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters"""
+        hits = self.exact_hits + self.similar_hits
+        lookups = hits + self.misses
+        return {
+            "enabled": True,
+            "entries": len(self._entries),
+            "generation": self.generation,
+            "exact_hits": self.exact_hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+def create_query_cache(
+    max_size: int = 1000,
+    ttl_seconds: float = 300.0,
+    similarity_threshold: float = 0.0,
+) -> QueryResultCache:
+    """
+    Factory function to create the retrieval result cache
+    
+    Args:
+        max_size: Max cached queries (LRU eviction)
+        ttl_seconds: Entry lifetime
+        similarity_threshold: Cosine similarity for near-duplicate hits (0 = exact only)
+    """
+    return QueryResultCache(
+        max_size=max_size,
+        ttl_seconds=ttl_seconds,
+        similarity_threshold=similarity_threshold,
+    )
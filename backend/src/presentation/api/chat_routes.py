@@ -4,7 +4,7 @@ Endpoints for conversational AI with RAG
 """
 import json
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.responses import StreamingResponse
 from sse_starlette.sse import EventSourceResponse
 
@@ -21,6 +21,7 @@ from src.presentation.schemas.api_schemas import (
     ErrorResponse,
 )
 from src.presentation.api.dependencies import get_chat_use_case
+from src.presentation.api.pagination import NEXT_CURSOR_HEADER, decode_cursor, next_cursor
 from src.application.use_cases.chat_use_case import ChatUseCase
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
@@ -73,15 +74,22 @@ async def create_conversation(
 async def list_conversations(
     skip: int = 0,
     limit: int = 20,
+    cursor: Optional[str] = None,
     use_case: ChatUseCase = Depends(get_chat_use_case),
 ):
     """
     List all conversations
+    
+    Newest first; follow `next_cursor` for the next page.
     """
-    convs = await use_case.list_conversations(skip=skip, limit=limit)
+    convs = await use_case.list_conversations(
+        skip=skip, limit=limit + 1, after=decode_cursor(cursor)
+    )
+    cursor_out = next_cursor(convs, limit)
     return ConversationListResponse(
         conversations=[_conv_to_response(c) for c in convs],
         total=len(convs),
+        next_cursor=cursor_out,
     )
 
 
@@ -132,13 +140,21 @@ async def delete_conversation(
 )
 async def get_messages(
     conv_id: str,
+    response: Response,
     limit: int = 50,
+    cursor: Optional[str] = None,
     use_case: ChatUseCase = Depends(get_chat_use_case),
 ):
     """
     Get messages in a conversation
+    
+    Oldest first. When more remain, the `X-Next-Cursor` response header
+    holds the cursor for the next page (the body stays a plain list).
     """
-    messages = await use_case.get_messages(conv_id, limit=limit)
+    messages = await use_case.get_messages(conv_id, limit=limit + 1, after=decode_cursor(cursor))
+    cursor_out = next_cursor(messages, limit, key="created_at")
+    if cursor_out:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_out
     return [_msg_to_response(m) for m in messages]
 
 
@@ -164,12 +180,7 @@ async def send_message(
         )
     
     try:
-        # Get context for response
-        context = []
-        if request.use_rag:
-            context = await use_case.retrieve_context(request.message)
-        
-        msg = await use_case.chat(
+        result = await use_case.chat(
             conversation_id=conv_id,
             user_message=request.message,
             use_rag=request.use_rag,
@@ -177,8 +188,8 @@ async def send_message(
         )
         
         return ChatResponse(
-            message=_msg_to_response(msg),
-            context_used=context,
+            message=_msg_to_response(result.message),
+            context_used=result.context,
         )
     except ValueError as e:
         raise HTTPException(
@@ -294,12 +305,7 @@ async def quick_ask(
     conv = await use_case.create_conversation(title="Quick Question")
     
     try:
-        # Get context for response
-        context = []
-        if request.use_rag:
-            context = await use_case.retrieve_context(request.message)
-        
-        msg = await use_case.chat(
+        result = await use_case.chat(
             conversation_id=conv.id,
             user_message=request.message,
             use_rag=request.use_rag,
@@ -307,8 +313,8 @@ async def quick_ask(
         )
         
         return ChatResponse(
-            message=_msg_to_response(msg),
-            context_used=context,
+            message=_msg_to_response(result.message),
+            context_used=result.context,
         )
     except Exception as e:
         # Clean up on error
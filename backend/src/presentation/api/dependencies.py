@@ -2,29 +2,37 @@
 FastAPI Dependency Injection
 Provides use cases and services as dependencies
 """
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 from functools import lru_cache
+import asyncio
+
+import structlog
 
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config.settings import Settings, get_settings
-from src.infrastructure.database.connection import get_session
+from src.infrastructure.database.connection import get_session, get_db_manager
 from src.infrastructure.database.repositories import (
     SQLAlchemyDocumentRepository,
     SQLAlchemyChunkRepository,
     SQLAlchemyTagRepository,
+    SQLAlchemyIndexingJobRepository,
     SQLAlchemyConversationRepository,
     SQLAlchemyMessageRepository,
 )
 from src.infrastructure.llm.service import LLMService, create_llm_service
 from src.infrastructure.embedding.service import EmbeddingService, create_embedding_service
 from src.infrastructure.vector_store.chroma_store import ChromaVectorStore, create_vector_store
+from src.infrastructure.vector_store.query_cache import QueryResultCache, create_query_cache
 from src.infrastructure.document_processing.processor import DocumentProcessor, create_document_processor
 from src.infrastructure.vault.service import VaultService
+from src.infrastructure.task_queue.indexing_queue import IndexingQueue, create_indexing_queue
 from src.application.use_cases.document_use_case import DocumentUseCase
 from src.application.use_cases.chat_use_case import ChatUseCase
 
+logger = structlog.get_logger()
+
 
 # ============== Cached Service Instances ==============
 
@@ -52,6 +60,17 @@ def get_embedding_service() -> EmbeddingService:
         model=settings.embedding_model,
         openai_api_key=settings.openai_api_key,
         ollama_base_url=settings.ollama_base_url,
+        cache_enabled=settings.embedding_cache_enabled,
+        cache_memory_size=settings.embedding_cache_memory_size,
+        cache_path=settings.embedding_cache_path or None,
+        batch_size=settings.ollama_embedding_batch_size,
+        max_concurrency=settings.ollama_embedding_concurrency,
+        micro_batch_enabled=settings.embedding_micro_batch_enabled,
+        micro_batch_max_size=settings.embedding_micro_batch_max_size,
+        micro_batch_max_wait_ms=settings.embedding_micro_batch_max_wait_ms,
+        inference_workers=settings.embedding_inference_workers,
+        torch_threads=settings.embedding_torch_threads,
+        inference_process=settings.embedding_inference_process,
     )
 
 
@@ -62,6 +81,25 @@ def get_vector_store() -> ChromaVectorStore:
     return create_vector_store(
         persist_directory=settings.chroma_persist_directory,
         collection_name=settings.chroma_collection_name,
+        keyword_index_path=settings.bm25_index_path or None,
+        rrf_k=settings.hybrid_rrf_k,
+        executor_workers=settings.vector_store_workers,
+        host=settings.chroma_host,
+        port=settings.chroma_port,
+    )
+
+
+@lru_cache()
+def get_query_cache() -> Optional[QueryResultCache]:
+    """Get cached retrieval result cache (None when disabled)"""
+    settings = get_settings()
+    # Index writes made by a separate arq worker process can't invalidate it
+    if not settings.query_cache_enabled or settings.indexing_queue_backend == "arq":
+        return None
+    return create_query_cache(
+        max_size=settings.query_cache_max_size,
+        ttl_seconds=settings.query_cache_ttl_seconds,
+        similarity_threshold=settings.query_cache_similarity_threshold,
     )
 
 
@@ -71,7 +109,7 @@ def get_document_processor() -> DocumentProcessor:
     settings = get_settings()
     
     if settings.semantic_chunking_enabled:
-        # Get embedding service for semantic chunking
+        # Sentence embeddings go through the cached service as float32 arrays
         embedding_service = get_embedding_service()
         return create_document_processor(
             chunk_size=settings.chunk_size,
@@ -79,7 +117,9 @@ def get_document_processor() -> DocumentProcessor:
             semantic_enabled=True,
             similarity_threshold=settings.semantic_similarity_threshold,
             min_chunk_size=settings.semantic_min_chunk_size,
-            embedding_function=embedding_service.embed_texts,
+            embedding_function=embedding_service.embed_texts_array,
+            section_concurrency=settings.semantic_section_concurrency,
+            sentences_per_call=settings.semantic_sentences_per_call,
         )
     else:
         return create_document_processor(
@@ -88,13 +128,29 @@ def get_document_processor() -> DocumentProcessor:
         )
 
 
+@lru_cache()
+def get_indexing_queue() -> Optional[IndexingQueue]:
+    """Get cached indexing queue (None when indexing runs inline)"""
+    settings = get_settings()
+    return create_indexing_queue(
+        backend=settings.indexing_queue_backend,
+        handler=run_indexing_job,
+        concurrency=settings.indexing_concurrency,
+        max_size=settings.indexing_queue_max_size,
+        enqueue_timeout=settings.indexing_enqueue_timeout,
+        redis_url=settings.redis_url,
+        queue_name=settings.indexing_queue_name,
+    )
+
+
 # ============== Use Case Dependencies ==============
 
-async def get_document_use_case(
-    session: AsyncSession = Depends(get_session),
-) -> AsyncGenerator[DocumentUseCase, None]:
+def build_document_use_case(
+    session: AsyncSession,
+    indexing_queue: Optional[IndexingQueue] = None,
+) -> DocumentUseCase:
     """
-    Provide DocumentUseCase with all dependencies injected
+    Build DocumentUseCase on a session with all services injected
     """
     settings = get_settings()
     
@@ -102,6 +158,7 @@ async def get_document_use_case(
     document_repo = SQLAlchemyDocumentRepository(session)
     chunk_repo = SQLAlchemyChunkRepository(session)
     tag_repo = SQLAlchemyTagRepository(session)
+    indexing_job_repo = SQLAlchemyIndexingJobRepository(session)
     
     # Get cached services
     embedding_service = get_embedding_service()
@@ -120,9 +177,78 @@ async def get_document_use_case(
         vault_service=VaultService(vault_path=settings.vault_path),  # Obsidian-style .md files
         enable_auto_tagging=settings.enable_auto_tagging,
         enable_summarization=settings.enable_summarization,
+        indexing_job_repo=indexing_job_repo,
+        indexing_queue=indexing_queue,
+        incremental_indexing=settings.incremental_indexing,
+        embed_batch_size=settings.indexing_embed_batch_size,
+        parent_child_chunking=settings.parent_child_retrieval,
+        parent_chunk_size=settings.parent_chunk_size,
+        child_chunk_size=settings.child_chunk_size,
+        query_cache=get_query_cache(),
+        session=session,
     )
     
-    yield use_case
+    return use_case
+
+
+async def get_document_use_case(
+    session: AsyncSession = Depends(get_session),
+) -> AsyncGenerator[DocumentUseCase, None]:
+    """
+    Provide DocumentUseCase with all dependencies injected
+    """
+    use_case = build_document_use_case(session, indexing_queue=get_indexing_queue())
+    
+    try:
+        yield use_case
+        
+        # Hand indexing jobs to the queue (and clear cached retrievals) only
+        # once the request's writes are committed
+        if use_case.pending_index_jobs or use_case.query_cache_stale:
+            await session.commit()
+            await use_case.dispatch_pending_indexing()
+    finally:
+        # After commit; on error other sessions never saw the rolled-back rows
+        use_case.invalidate_query_cache()
+
+
+async def run_indexing_job(doc_id: str) -> None:
+    """
+    Indexing queue handler
+    Indexes one document in its own session, outside any request
+    (process_indexing_job commits it in short stages)
+    """
+    async with get_db_manager().session() as session:
+        use_case = build_document_use_case(session)
+        await use_case.process_indexing_job(doc_id)
+
+
+async def sweep_indexing_outbox(indexing_queue: IndexingQueue) -> int:
+    """
+    Enqueue outbox jobs the queue doesn't hold yet
+    
+    Recovers jobs left by the last run, and jobs dropped while the queue
+    was full. Returns the number of documents enqueued.
+    """
+    if indexing_queue.is_full():
+        return 0
+    async with get_db_manager().session() as session:
+        pending = await SQLAlchemyIndexingJobRepository(session).get_pending(
+            limit=get_settings().indexing_queue_max_size,
+        )
+    return await indexing_queue.recover(pending)
+
+
+async def run_outbox_sweeper(indexing_queue: IndexingQueue, interval: float) -> None:
+    """Sweep the indexing outbox every interval seconds (runs until cancelled)"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            swept = await sweep_indexing_outbox(indexing_queue)
+            if swept:
+                logger.info("indexing_outbox_swept", count=swept)
+        except Exception as e:
+            logger.error("indexing_outbox_sweep_failed", error=str(e), exc_info=True)
 
 
 async def get_chat_use_case(
@@ -137,6 +263,7 @@ async def get_chat_use_case(
     conversation_repo = SQLAlchemyConversationRepository(session)
     message_repo = SQLAlchemyMessageRepository(session)
     document_repo = SQLAlchemyDocumentRepository(session)
+    chunk_repo = SQLAlchemyChunkRepository(session)
     
     # Get cached services
     embedding_service = get_embedding_service()
@@ -152,6 +279,11 @@ async def get_chat_use_case(
         llm_service=llm_service,
         enable_streaming=settings.enable_streaming,
         enable_hybrid_search=settings.enable_hybrid_search,
+        max_conversation_history=settings.max_conversation_history,
+        history_token_budget=settings.history_token_budget,
+        chunk_repo=chunk_repo,
+        parent_child_retrieval=settings.parent_child_retrieval,
+        query_cache=get_query_cache(),
     )
     
     yield use_case
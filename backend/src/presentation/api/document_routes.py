@@ -2,28 +2,102 @@
 Document API Routes
 RESTful endpoints for document management
 """
-from typing import Optional
+from typing import Optional, Tuple
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 import aiofiles
 import os
 import uuid
 
+from config.settings import get_settings
 from src.infrastructure.database.connection import get_session
 from src.presentation.schemas.api_schemas import (
     DocumentCreate,
     DocumentUpdate,
     DocumentResponse,
     DocumentListResponse,
+    DocumentSummaryResponse,
+    DocumentStatusResponse,
     LinkedDocumentsResponse,
     ErrorResponse,
 )
 from src.presentation.api.dependencies import get_document_use_case
+from src.presentation.api.pagination import decode_cursor, next_cursor
 from src.application.use_cases.document_use_case import DocumentUseCase
 from src.domain.entities.document import DocumentType
+from src.infrastructure.task_queue.indexing_queue import IndexingQueueFullError
 
 router = APIRouter(prefix="/documents", tags=["Documents"])
 
+UPLOAD_BLOCK_SIZE = 1024 * 1024  # Bytes read per block when saving uploads
+
+# Fields list routes can return (all by default); content is never one of them
+SUMMARY_FIELDS = tuple(DocumentSummaryResponse.model_fields)
+
+
+def _queue_full_exception(e: IndexingQueueFullError) -> HTTPException:
+    """Map indexing backpressure to 503 with a retry hint"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(e),
+        headers={"Retry-After": "5"},
+    )
+
+
+def _file_too_large_exception(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit",
+    )
+
+
+async def _save_upload(file: UploadFile, file_path: str, max_bytes: int) -> int:
+    """
+    Stream an upload to disk in fixed-size blocks
+    
+    The size limit is checked per block, so an oversized file is rejected
+    without being held in memory. Returns the number of bytes written.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise _file_too_large_exception(max_bytes)
+    
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    size = 0
+    try:
+        async with aiofiles.open(file_path, "wb") as f:
+            while block := await file.read(UPLOAD_BLOCK_SIZE):
+                size += len(block)
+                if size > max_bytes:
+                    raise _file_too_large_exception(max_bytes)
+                await f.write(block)
+    except BaseException:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+    return size
+
+
+def _parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """Parse a comma-separated fields= selector (id is always included)"""
+    if not fields:
+        return SUMMARY_FIELDS
+    selected = tuple(dict.fromkeys(
+        ["id"] + [f.strip() for f in fields.split(",") if f.strip()]
+    ))
+    unknown = [f for f in selected if f not in SUMMARY_FIELDS]
+    if unknown:
+        hint = " (content is only returned by GET /documents/{id})" if "content" in unknown else ""
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}{hint}",
+        )
+    return selected
+
+
+def _doc_to_summary_response(doc, fields: Tuple[str, ...]) -> DocumentSummaryResponse:
+    """Convert a DocumentSummary to a list item with only the selected fields"""
+    return DocumentSummaryResponse(**{f: getattr(doc, f) for f in fields})
+
 
 def _doc_to_response(doc) -> DocumentResponse:
     """Convert domain entity to response schema"""
@@ -59,7 +133,8 @@ async def create_document(
     """
     Create a new document
     
-    Creates a new document and optionally indexes it for RAG search.
+    Creates a new document and optionally queues it for indexing for RAG search.
+    Poll `GET /documents/{id}/status` to follow indexing progress.
     """
     try:
         doc = await use_case.create_document(
@@ -70,6 +145,8 @@ async def create_document(
             auto_index=request.auto_index,
         )
         return _doc_to_response(doc)
+    except IndexingQueueFullError as e:
+        raise _queue_full_exception(e)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -80,46 +157,63 @@ async def create_document(
 @router.get(
     "",
     response_model=DocumentListResponse,
+    response_model_exclude_unset=True,
 )
 async def list_documents(
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    fields: Optional[str] = None,
     use_case: DocumentUseCase = Depends(get_document_use_case),
 ):
     """
     List all documents
     
-    Returns paginated list of documents sorted by update time.
+    Returns documents sorted by update time, newest first. Follow
+    `next_cursor` to page; unlike `skip`, a cursor costs the same on
+    every page. Set `include_total` to also count all documents.
+    
+    Items carry every field except `content` (use `GET /documents/{id}`
+    for the body); pass a comma-separated `fields` list (e.g.
+    `id,title,tags`) to pick fewer.
     """
-    docs = await use_case.list_documents(skip=skip, limit=limit)
-    total = await use_case.document_repo.count()
+    selected = _parse_fields(fields)
+    after = decode_cursor(cursor)
+    docs = await use_case.list_documents(skip=skip, limit=limit + 1, after=after)
+    cursor_out = next_cursor(docs, limit)
+    total = await use_case.document_repo.count() if include_total else None
     
     return DocumentListResponse(
-        documents=[_doc_to_response(d) for d in docs],
+        documents=[_doc_to_summary_response(d, selected) for d in docs],
         total=total,
         skip=skip,
         limit=limit,
+        next_cursor=cursor_out,
     )
 
 
 @router.get(
     "/search",
     response_model=DocumentListResponse,
+    response_model_exclude_unset=True,
 )
 async def search_documents(
     q: str,
     limit: int = 10,
+    fields: Optional[str] = None,
     use_case: DocumentUseCase = Depends(get_document_use_case),
 ):
     """
     Search documents by title
     
-    Simple text search on document titles.
+    Simple text search on document titles. `fields` works as in the list endpoint.
     """
+    selected = _parse_fields(fields)
     docs = await use_case.search_documents(query=q, limit=limit)
     
     return DocumentListResponse(
-        documents=[_doc_to_response(d) for d in docs],
+        documents=[_doc_to_summary_response(d, selected) for d in docs],
         total=len(docs),
         skip=0,
         limit=limit,
@@ -129,19 +223,24 @@ async def search_documents(
 @router.get(
     "/by-tag/{tag}",
     response_model=DocumentListResponse,
+    response_model_exclude_unset=True,
 )
 async def get_documents_by_tag(
     tag: str,
     limit: int = 50,
+    fields: Optional[str] = None,
     use_case: DocumentUseCase = Depends(get_document_use_case),
 ):
     """
     Get documents by tag
+    
+    `fields` works as in the list endpoint.
     """
+    selected = _parse_fields(fields)
     docs = await use_case.get_documents_by_tag(tag=tag, limit=limit)
     
     return DocumentListResponse(
-        documents=[_doc_to_response(d) for d in docs],
+        documents=[_doc_to_summary_response(d, selected) for d in docs],
         total=len(docs),
         skip=0,
         limit=limit,
@@ -193,6 +292,8 @@ async def update_document(
             reindex=request.reindex,
         )
         return _doc_to_response(doc)
+    except IndexingQueueFullError as e:
+        raise _queue_full_exception(e)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -247,6 +348,30 @@ async def index_document(
     return _doc_to_response(doc)
 
 
+@router.get(
+    "/{doc_id}/status",
+    response_model=DocumentStatusResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_document_status(
+    doc_id: str,
+    use_case: DocumentUseCase = Depends(get_document_use_case),
+):
+    """
+    Get indexing status of a document
+    
+    Status moves pending → processing → indexed (or failed);
+    `queued` is true while an indexing job is waiting or running.
+    """
+    result = await use_case.get_indexing_status(doc_id)
+    if not result:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Document {doc_id} not found",
+        )
+    return DocumentStatusResponse(**result)
+
+
 @router.get(
     "/{doc_id}/links",
     response_model=LinkedDocumentsResponse,
@@ -313,44 +438,55 @@ async def upload_document(
     
     doc_type = type_map[ext]
     
-    # Save file temporarily for PDF/DOCX
-    content = ""
-    file_path = None
+    # Stream the upload to disk in blocks (size limit enforced while reading)
+    max_bytes = get_settings().max_file_size_mb * 1024 * 1024
+    file_path = f"./data/uploads/{uuid.uuid4()}.{ext}"
+    file_size = await _save_upload(file, file_path, max_bytes)
     
     if ext in ["pdf", "docx"]:
-        # Save to temp file
-        file_path = f"./data/uploads/{uuid.uuid4()}.{ext}"
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        
-        async with aiofiles.open(file_path, "wb") as f:
-            file_content = await file.read()
-            await f.write(file_content)
-        
-        # Parse content
-        if ext == "pdf":
-            content = FileParser.parse_pdf(file_path)
-        else:
-            content = FileParser.parse_docx(file_path)
+        # Parse page by page in the process pool; the file stays on disk
+        try:
+            content = await FileParser.parse_file(file_path, ext)
+        except Exception as e:
+            os.remove(file_path)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Could not parse {ext} file: {e}",
+            )
     else:
-        # Read text directly
-        file_content = await file.read()
-        content = file_content.decode("utf-8")
+        # Text files are kept only as the document content
+        try:
+            async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
+                content = await f.read()
+        except UnicodeDecodeError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Text files must be UTF-8 encoded",
+            )
+        finally:
+            os.remove(file_path)
+        file_path = None
     
     # Extract title from filename
     title = filename.rsplit(".", 1)[0]
     
     # Create document
-    doc = await use_case.create_document(
-        title=title,
-        content=content,
-        doc_type=doc_type,
-        auto_index=True,
-    )
+    try:
+        doc = await use_case.create_document(
+            title=title,
+            content=content,
+            doc_type=doc_type,
+            auto_index=True,
+        )
+    except IndexingQueueFullError as e:
+        if file_path:
+            os.remove(file_path)
+        raise _queue_full_exception(e)
     
     # Update file path if saved
     if file_path:
         doc.file_path = file_path
-        doc.file_size = os.path.getsize(file_path)
+        doc.file_size = file_size
         await use_case.document_repo.update(doc)
     
     return _doc_to_response(doc)
@@ -0,0 +1,46 @@
+"""
+Keyset Pagination Cursors
+Opaque cursors over the (timestamp, id) sort key used by list endpoints
+"""
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+
+# Response header carrying the cursor on listings that return a bare JSON array
+# (exposed through CORS in main.py so cross-origin clients can read it)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(timestamp: datetime, item_id: str) -> str:
+    """Encode the sort key of the last item on a page"""
+    raw = f"{timestamp.isoformat()}|{item_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, str]]:
+    """Decode a cursor from a query string (400 if it was tampered with)"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, item_id = raw.split("|", 1)
+        return datetime.fromisoformat(timestamp), item_id
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+
+
+def next_cursor(items: list, limit: int, key: str = "updated_at") -> Optional[str]:
+    """
+    Cursor for the page after items, fetched with limit + 1
+    Trims the extra item in place; None when this was the last page
+    """
+    if len(items) <= limit:
+        return None
+    del items[limit:]
+    last = items[-1]
+    return encode_cursor(getattr(last, key), last.id)
@@ -15,10 +15,16 @@ from src.presentation.schemas.api_schemas import (
     TagListResponse,
     TagResponse,
 )
+from src.infrastructure.embedding.cache import CachedEmbeddingService
+from src.infrastructure.embedding.batcher import MicroBatchingEmbeddingService
+from src.infrastructure.embedding.service import LocalEmbeddingService
 from src.presentation.api.dependencies import (
     get_document_use_case,
+    get_embedding_service,
     get_llm_service,
     get_vector_store,
+    get_indexing_queue,
+    get_query_cache,
 )
 from src.application.use_cases.document_use_case import DocumentUseCase
 
@@ -57,12 +63,37 @@ async def health_check(
         "status": "configured",
     }
     
+    # Indexing queue
+    indexing_queue = get_indexing_queue()
+    queue_stats = indexing_queue.get_stats() if indexing_queue else {"backend": "inline"}
+    
+    # Embedding cache, micro-batcher and local inference executor
+    cache_stats = {"enabled": False}
+    batcher_stats = {"enabled": False}
+    inference_stats = {}
+    layer = get_embedding_service()
+    while layer is not None:
+        if isinstance(layer, CachedEmbeddingService):
+            cache_stats = layer.get_stats()
+        elif isinstance(layer, MicroBatchingEmbeddingService):
+            batcher_stats = layer.get_stats()
+        elif isinstance(layer, LocalEmbeddingService):
+            inference_stats = layer.get_stats()
+        layer = getattr(layer, "inner", None)
+    
+    query_cache = get_query_cache()
+    
     return HealthResponse(
         status="healthy" if db_status == "healthy" else "degraded",
         version=settings.app_version,
         database=db_status,
         vector_store=vector_stats,
         llm=llm_status,
+        indexing_queue=queue_stats,
+        embedding_cache=cache_stats,
+        embedding_batcher=batcher_stats,
+        embedding_inference=inference_stats,
+        query_cache=query_cache.get_stats() if query_cache is not None else {"enabled": False},
     )
 
 
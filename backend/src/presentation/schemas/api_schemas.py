@@ -66,12 +66,42 @@ class DocumentResponse(BaseModel):
         from_attributes = True
 
 
+class DocumentSummaryResponse(BaseModel):
+    """
+    Response schema for a document in a list (no content; GET /documents/{id} has the body)
+    Fields not picked with the fields= selector are omitted from the JSON
+    """
+    id: str
+    title: Optional[str] = None
+    doc_type: Optional[DocumentTypeSchema] = None
+    status: Optional[DocumentStatusSchema] = None
+    file_path: Optional[str] = None
+    file_size: Optional[int] = None
+    word_count: Optional[int] = None
+    outgoing_links: Optional[List[str]] = None
+    incoming_links: Optional[List[str]] = None
+    tags: Optional[List[str]] = None
+    summary: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    indexed_at: Optional[datetime] = None
+
+
 class DocumentListResponse(BaseModel):
     """Response schema for document list"""
-    documents: List[DocumentResponse]
-    total: int
+    documents: List[DocumentSummaryResponse]
+    total: Optional[int] = None  # Only counted when include_total=true
     skip: int
     limit: int
+    next_cursor: Optional[str] = None  # Pass as cursor for the next page
+
+
+class DocumentStatusResponse(BaseModel):
+    """Response schema for document indexing status"""
+    id: str
+    status: DocumentStatusSchema
+    queued: bool = False
+    indexed_at: Optional[datetime] = None
 
 
 class LinkedDocumentsResponse(BaseModel):
@@ -102,6 +132,7 @@ class ConversationListResponse(BaseModel):
     """Response schema for conversation list"""
     conversations: List[ConversationResponse]
     total: int
+    next_cursor: Optional[str] = None
 
 
 class MessageResponse(BaseModel):
@@ -195,6 +226,11 @@ class HealthResponse(BaseModel):
     database: str
     vector_store: Dict[str, Any]
     llm: Dict[str, Any]
+    indexing_queue: Dict[str, Any] = {}
+    embedding_cache: Dict[str, Any] = {}
+    embedding_batcher: Dict[str, Any] = {}
+    embedding_inference: Dict[str, Any] = {}
+    query_cache: Dict[str, Any] = {}
 
 
 # ============== Error Schemas ==============
@@ -0,0 +1,92 @@
+"""
+Unit Tests for the BM25 Keyword Index
+Tests tokenization, index sync and hybrid fusion
+"""
+import numpy as np
+import pytest
+from src.infrastructure.vector_store.bm25_index import BM25Index, tokenize
+from src.infrastructure.vector_store.chroma_store import ChromaVectorStore
+
+
+def test_tokenize_mixed_cjk_and_latin():
+    """Test CJK runs become bigrams and Latin words stay whole"""
+    assert tokenize("RAG检索增强 with BM25") == ["rag", "检索", "索增", "增强", "with", "bm25"]
+    assert tokenize("中 文") == ["中", "文"]
+
+
+def test_tokenize_keeps_non_ascii_words():
+    """Test accented Latin and Cyrillic words stay whole"""
+    assert tokenize("café Müller Привет über") == ["café", "müller", "привет", "über"]
+    assert tokenize("Ελλάδα x_1 東京タワー") == ["ελλάδα", "x_1", "東京", "京タ", "タワ", "ワー"]
+
+
+class TestBM25Index:
+    """Test BM25Index"""
+    
+    def test_search_ranks_by_bm25(self, tmp_path):
+        """Test chunks with more query term matches rank first"""
+        index = BM25Index(str(tmp_path / "bm25.db"))
+        index.add(
+            ids=["a", "b", "c"],
+            documents=["向量数据库 Chroma", "BM25 关键词检索 BM25", "关键词"],
+            document_ids=["d1", "d1", "d2"],
+        )
+        
+        hits = index.search("BM25 关键词")
+        
+        assert [chunk_id for chunk_id, _ in hits] == ["b", "c"]
+        assert hits[0][1] > hits[1][1]
+    
+    def test_delete_and_replace(self, tmp_path):
+        """Test deletes by ID and document, and re-adding replaces"""
+        path = str(tmp_path / "bm25.db")
+        index = BM25Index(path)
+        index.add(["a", "b", "c"], ["alpha", "beta", "gamma"], ["d1", "d1", "d2"])
+        index.add(["c"], ["delta"], ["d2"])
+        index.delete_by_document("d1")
+        
+        reopened = BM25Index(path)
+        assert reopened.count() == 1
+        assert reopened.search("alpha beta gamma") == []
+        assert [c for c, _ in reopened.search("delta")] == ["c"]
+    
+    def test_exact_terms_in_other_scripts(self, tmp_path):
+        """Test accented and Cyrillic words match, and old-tokenizer indexes are cleared"""
+        path = str(tmp_path / "bm25.db")
+        index = BM25Index(path)
+        index.add(["a", "b"], ["Привет, мир", "Café Müller"], ["d1", "d2"])
+        
+        assert [chunk_id for chunk_id, _ in index.search("привет")] == ["a"]
+        assert [chunk_id for chunk_id, _ in index.search("MÜLLER")] == ["b"]
+        
+        index._conn.execute("PRAGMA user_version = 1")
+        index._conn.commit()
+        assert BM25Index(path).count() == 0
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_finds_keyword_match_outside_semantic_hits(tmp_path):
+    """Test RRF fusion surfaces exact keyword matches the vector search misses"""
+    store = ChromaVectorStore(
+        str(tmp_path / "chroma"),
+        "test_hybrid",
+        keyword_index=BM25Index(str(tmp_path / "bm25.db")),
+    )
+    near = np.array([[1.0, 0.0, 0.0]] * 4 + [[0.0, 0.0, 1.0]], dtype=np.float32)
+    near[:4, 1] = np.linspace(0.0, 0.3, 4)
+    documents = ["general note one", "general note two", "general note three",
+                 "general note four", "error code ZX-9000 排查"]
+    await store.add_documents(
+        ids=[f"c{i}" for i in range(5)],
+        embeddings=near,
+        documents=documents,
+        metadatas=[{"document_id": f"d{i}"} for i in range(5)],
+    )
+    
+    results = await store.hybrid_search("ZX 9000 排查", np.array([1.0, 0.0, 0.0]), top_k=2)
+    
+    assert "c4" in [r["id"] for r in results]
+    assert results[0]["score"] <= 1.0
+    
+    await store.delete_by_ids(["c4"])
+    assert store.keyword_index.search("9000") == []
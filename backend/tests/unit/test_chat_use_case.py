@@ -0,0 +1,134 @@
+"""
+Unit Tests for Chat Use Case
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from src.domain.entities.document import Conversation, DocumentChunk, Message
+from src.application.use_cases.chat_use_case import ChatUseCase
+
+
+@pytest.fixture
+def mock_deps():
+    """Create mock dependencies"""
+    return {
+        "conversation_repo": AsyncMock(),
+        "message_repo": AsyncMock(),
+        "document_repo": AsyncMock(),
+        "chunk_repo": AsyncMock(),
+        "embedding_service": AsyncMock(),
+        "vector_store": AsyncMock(),
+        "llm_service": AsyncMock(),
+    }
+
+
+@pytest.fixture
+def chat_use_case(mock_deps):
+    """Create ChatUseCase with mocks"""
+    return ChatUseCase(**mock_deps, parent_child_retrieval=True)
+
+
+@pytest.mark.asyncio
+async def test_retrieve_context_expands_children_to_parents(chat_use_case, mock_deps):
+    """Test child hits are replaced by de-duplicated parents from one lookup"""
+    # Arrange
+    mock_deps["embedding_service"].embed_text.return_value = [0.1, 0.2]
+    mock_deps["vector_store"].hybrid_search.return_value = [
+        {"id": "c1", "content": "child 1", "score": 0.9, "metadata": {"parent_id": "p1"}},
+        {"id": "c2", "content": "child 2", "score": 0.8, "metadata": {"parent_id": "p1"}},
+        {"id": "flat", "content": "flat chunk", "score": 0.7, "metadata": {}},
+        {"id": "c3", "content": "child 3", "score": 0.6, "metadata": {"parent_id": "p2"}},
+    ]
+    mock_deps["chunk_repo"].get_by_ids.return_value = [
+        DocumentChunk(id="p1", document_id="d", content="parent one", chunk_index=0),
+        DocumentChunk(id="p2", document_id="d", content="parent two", chunk_index=1),
+    ]
+    
+    # Act
+    results = await chat_use_case.retrieve_context("question", top_k=2)
+    
+    # Assert
+    assert mock_deps["vector_store"].hybrid_search.call_args.kwargs["top_k"] == 6
+    mock_deps["chunk_repo"].get_by_ids.assert_called_once_with(["p1", "p2"])
+    assert [r["id"] for r in results] == ["p1", "flat"]
+    assert results[0]["content"] == "parent one"
+    assert results[0]["score"] == 0.9
+    assert results[0]["metadata"]["matched_chunk_id"] == "c1"
+
+
+@pytest.mark.asyncio
+async def test_chat_sends_newest_history_within_token_budget(mock_deps):
+    """Test the prompt gets the latest messages that fit the budget, not the oldest"""
+    # Arrange
+    use_case = ChatUseCase(**mock_deps, max_conversation_history=10, history_token_budget=25)
+    mock_deps["conversation_repo"].get_by_id.return_value = Conversation(id="c", title="Chat")
+    saved = []
+    mock_deps["message_repo"].create.side_effect = lambda m: saved.append(m) or m
+    mock_deps["message_repo"].get_recent.side_effect = lambda conv_id, limit: [
+        Message(id=f"m{i}", conversation_id="c", content=f"message {i:02d}") for i in range(8)
+    ][-limit:] + saved[:1]
+    mock_deps["llm_service"].count_tokens = MagicMock(side_effect=lambda text, model=None: len(text))
+    mock_deps["llm_service"].complete.return_value = MagicMock(content="answer")
+    
+    # Act
+    await use_case.chat("c", "question", use_rag=False)
+    
+    # Assert
+    prompt = mock_deps["llm_service"].complete.call_args.args[0]
+    assert [m.content for m in prompt[1:]] == ["message 06", "message 07", "question"]
+    mock_deps["message_repo"].get_recent.assert_called_once_with("c", limit=11)
+
+
+@pytest.mark.asyncio
+async def test_chat_returns_context_and_memoizes_retrieval(mock_deps):
+    """Test chat hands back its context and a repeated search is not re-run"""
+    # Arrange
+    use_case = ChatUseCase(**mock_deps)
+    mock_deps["conversation_repo"].get_by_id.return_value = Conversation(id="c", title="Chat")
+    mock_deps["message_repo"].create.side_effect = lambda m: m
+    mock_deps["message_repo"].get_recent.return_value = []
+    mock_deps["embedding_service"].embed_text.return_value = [0.1, 0.2]
+    mock_deps["vector_store"].hybrid_search.return_value = [
+        {"id": "k1", "content": "known fact", "score": 0.9, "metadata": {}},
+    ]
+    mock_deps["llm_service"].answer_with_context.return_value = "answer"
+    
+    # Act
+    result = await use_case.chat("c", "question")
+    again = await use_case.retrieve_context("question", top_k=use_case.max_context_chunks)
+    
+    # Assert
+    assert result.message.content == "answer"
+    assert result.message.retrieved_chunks == ["k1"]
+    assert [r["id"] for r in result.context] == ["k1"] == [r["id"] for r in again]
+    mock_deps["embedding_service"].embed_text.assert_called_once()
+    mock_deps["vector_store"].hybrid_search.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_semantic_search_enriches_with_one_projected_lookup(chat_use_case, mock_deps):
+    """Test results are enriched from a single id/title/tags query"""
+    # Arrange
+    chat_use_case.parent_child_retrieval = False
+    mock_deps["embedding_service"].embed_text.return_value = [0.1, 0.2]
+    mock_deps["vector_store"].hybrid_search.return_value = [
+        {"id": "c1", "content": "a", "metadata": {"document_id": "d1"}},
+        {"id": "c2", "content": "b", "metadata": {"document_id": "d1"}},
+        {"id": "c3", "content": "c", "metadata": {"document_id": "gone"}},
+    ]
+    mock_deps["document_repo"].get_fields_by_ids.return_value = {
+        "d1": {"id": "d1", "title": "Doc", "tags": None},
+    }
+    
+    # Act
+    results = await chat_use_case.semantic_search("q", top_k=3)
+    
+    # Assert
+    mock_deps["document_repo"].get_fields_by_ids.assert_called_once_with(
+        ["d1", "gone"], ("id", "title", "tags")
+    )
+    mock_deps["document_repo"].get_by_id.assert_not_called()
+    assert [r.get("document") for r in results] == [
+        {"id": "d1", "title": "Doc", "tags": []},
+        {"id": "d1", "title": "Doc", "tags": []},
+        None,
+    ]
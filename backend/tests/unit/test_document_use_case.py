@@ -1,10 +1,20 @@
 """
 Unit Tests for Document Use Case
 """
+import numpy as np
 import pytest
 from unittest.mock import AsyncMock, MagicMock
-from src.domain.entities.document import Document, DocumentType, DocumentStatus
+from src.domain.entities.document import Document, DocumentChunk, DocumentType, DocumentStatus
 from src.application.use_cases.document_use_case import DocumentUseCase
+from src.infrastructure.database.connection import DatabaseManager
+from src.infrastructure.database.repositories import (
+    SQLAlchemyChunkRepository,
+    SQLAlchemyDocumentRepository,
+    SQLAlchemyIndexingJobRepository,
+    SQLAlchemyTagRepository,
+)
+from src.infrastructure.document_processing.processor import TextChunk
+from src.infrastructure.vector_store.query_cache import QueryResultCache
 
 
 @pytest.fixture
@@ -99,3 +109,255 @@ async def test_delete_document(document_use_case, mock_deps):
     assert result is True
     mock_deps["vector_store"].delete_by_document.assert_called_once()
     mock_deps["chunk_repo"].delete_by_document.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_create_document_defers_indexing_to_queue(mock_deps):
+    """Test creation writes an outbox job and dispatches it after commit"""
+    # Arrange
+    mock_deps["document_processor"].extract_wiki_links.return_value = []
+    mock_deps["document_processor"].extract_tags_from_content.return_value = []
+    mock_deps["document_processor"].count_words.return_value = 10
+    mock_deps["document_repo"].create.return_value = Document(
+        id="test-id",
+        title="Test Doc",
+        content="Test content",
+    )
+    indexing_job_repo = AsyncMock()
+    indexing_queue = AsyncMock()
+    indexing_queue.is_full = MagicMock(return_value=False)
+    
+    use_case = DocumentUseCase(
+        **mock_deps,
+        enable_auto_tagging=False,
+        enable_summarization=False,
+        indexing_job_repo=indexing_job_repo,
+        indexing_queue=indexing_queue,
+    )
+    
+    # Act
+    doc = await use_case.create_document(title="Test Doc", content="Test content")
+    
+    # Assert: nothing is indexed or enqueued inside the request transaction
+    assert doc.status == DocumentStatus.PENDING
+    indexing_job_repo.add.assert_called_once_with("test-id")
+    mock_deps["embedding_service"].embed_texts_array.assert_not_called()
+    indexing_queue.enqueue_many.assert_not_called()
+    
+    await use_case.dispatch_pending_indexing()
+    indexing_queue.enqueue_many.assert_called_once_with(["test-id"])
+    assert use_case.pending_index_jobs == []
+
+
+@pytest.mark.asyncio
+async def test_index_document_only_embeds_changed_chunks(document_use_case, mock_deps):
+    """Test re-indexing diffs chunks and keeps IDs of unchanged ones"""
+    # Arrange
+    document = Document(id="doc", title="Doc", content="A\n\nB\n\nC", tags=["t"])
+    mock_deps["document_repo"].get_by_id.return_value = document
+    mock_deps["chunk_repo"].get_by_document.return_value = [
+        DocumentChunk(id="chunk-a", document_id="doc", content="A", chunk_index=0),
+        DocumentChunk(id="chunk-b", document_id="doc", content="B", chunk_index=1),
+        DocumentChunk(id="chunk-c", document_id="doc", content="C", chunk_index=2),
+    ]
+    mock_deps["document_processor"].chunk_text_async = AsyncMock(return_value=[
+        TextChunk(content="A", start_char=0, end_char=1, chunk_index=0),
+        TextChunk(content="X", start_char=3, end_char=4, chunk_index=1),
+        TextChunk(content="C", start_char=6, end_char=7, chunk_index=2),
+    ])
+    mock_deps["vector_store"].get_by_ids.return_value = [
+        {"id": cid, "content": "", "metadata": {
+            "document_id": "doc", "document_title": "Doc", "chunk_index": idx, "tags": "t",
+        }}
+        for cid, idx in [("chunk-a", 0), ("chunk-c", 2)]
+    ]
+    mock_deps["embedding_service"].embed_texts_array.return_value = np.array([[0.1, 0.2]], dtype=np.float32)
+    
+    # Act
+    result = await document_use_case.index_document("doc")
+    
+    # Assert
+    assert result is True
+    mock_deps["embedding_service"].embed_texts_array.assert_called_once_with(["X"])
+    mock_deps["chunk_repo"].delete_by_ids.assert_called_once_with(["chunk-b"])
+    mock_deps["vector_store"].delete_by_ids.assert_called_once_with(["chunk-b"])
+    mock_deps["chunk_repo"].delete_by_document.assert_not_called()
+    added = mock_deps["chunk_repo"].create_many.call_args[0][0]
+    assert [c.content for c in added] == ["X"]
+    assert mock_deps["vector_store"].add_documents.call_args.kwargs["ids"] == [added[0].id]
+    mock_deps["vector_store"].update_metadata.assert_not_called()
+    assert document.status == DocumentStatus.INDEXED
+
+
+@pytest.mark.asyncio
+async def test_index_document_embeds_in_batches(document_use_case, mock_deps):
+    """Test new chunks are embedded and stored batch by batch"""
+    # Arrange
+    document_use_case.embed_batch_size = 2
+    document = Document(id="doc", title="Doc", content="text")
+    mock_deps["document_repo"].get_by_id.return_value = document
+    mock_deps["chunk_repo"].get_by_document.return_value = []
+    mock_deps["document_processor"].chunk_text_async = AsyncMock(return_value=[
+        TextChunk(content=str(i), start_char=i, end_char=i + 1, chunk_index=i)
+        for i in range(5)
+    ])
+    mock_deps["embedding_service"].embed_texts_array.side_effect = [
+        np.zeros((2, 2), dtype=np.float32),
+        RuntimeError("embedding failed"),
+    ]
+    
+    # Act
+    with pytest.raises(RuntimeError):
+        await document_use_case.index_document("doc")
+    
+    # Assert: the stored first batch is rolled back and nothing reaches the DB
+    assert mock_deps["embedding_service"].embed_texts_array.call_count == 2
+    stored = mock_deps["vector_store"].add_documents.call_args.kwargs["ids"]
+    assert len(stored) == 2
+    mock_deps["vector_store"].delete_by_ids.assert_called_once_with(stored)
+    mock_deps["chunk_repo"].create_many.assert_not_called()
+    assert document.status == DocumentStatus.FAILED
+
+
+@pytest.mark.asyncio
+async def test_index_document_parent_child_embeds_only_children(document_use_case, mock_deps):
+    """Test small-to-big indexing stores parents in the DB and embeds children"""
+    # Arrange
+    document_use_case.parent_child_chunking = True
+    document = Document(id="doc", title="Doc", content="P1 text\n\nP2 text")
+    mock_deps["document_repo"].get_by_id.return_value = document
+    # A flat chunk from a previous index matches the first parent's content
+    mock_deps["chunk_repo"].get_by_document.return_value = [
+        DocumentChunk(id="flat", document_id="doc", content="P1 text", chunk_index=0),
+    ]
+    mock_deps["document_processor"].chunk_with_parents.return_value = (
+        [
+            TextChunk(content="P1 text", start_char=0, end_char=7, chunk_index=0),
+            TextChunk(content="P2 text", start_char=9, end_char=16, chunk_index=1),
+        ],
+        [
+            TextChunk(content="P1", start_char=0, end_char=2, chunk_index=0, metadata={"parent_index": 0}),
+            TextChunk(content="text", start_char=3, end_char=7, chunk_index=1, metadata={"parent_index": 0}),
+            TextChunk(content="P2 text", start_char=9, end_char=16, chunk_index=2, metadata={"parent_index": 1}),
+        ],
+    )
+    mock_deps["vector_store"].get_by_ids.return_value = [{"id": "flat", "content": "", "metadata": {}}]
+    mock_deps["embedding_service"].embed_texts_array.return_value = np.zeros((3, 2), dtype=np.float32)
+    
+    # Act
+    await document_use_case.index_document("doc")
+    
+    # Assert
+    mock_deps["embedding_service"].embed_texts_array.assert_called_once_with(["P1", "text", "P2 text"])
+    added = mock_deps["chunk_repo"].create_many.call_args[0][0]
+    parent_2, *children = added
+    assert parent_2.content == "P2 text" and parent_2.parent_chunk_id is None
+    assert [c.parent_chunk_id for c in children] == ["flat", "flat", parent_2.id]
+    metadatas = mock_deps["vector_store"].add_documents.call_args.kwargs["metadatas"]
+    assert [m["parent_id"] for m in metadatas] == ["flat", "flat", parent_2.id]
+    # The reused flat chunk is a parent now, so its vector is dropped
+    mock_deps["vector_store"].delete_by_ids.assert_called_once_with(["flat"])
+
+
+@pytest.mark.asyncio
+async def test_indexing_job_commits_in_stages(tmp_path, mock_deps):
+    """Test a job commits PROCESSING before embedding and records failures"""
+    db = DatabaseManager(f"sqlite+aiosqlite:///{tmp_path / 'kb.db'}")
+    await db.create_tables()
+    async with db.session() as session:
+        await SQLAlchemyDocumentRepository(session).create(Document(id="doc", title="Doc", content="A"))
+        await SQLAlchemyIndexingJobRepository(session).add("doc")
+    
+    seen = []
+    
+    async def embed(texts):
+        # Another connection sees the committed status while embedding runs
+        async with db.session() as other:
+            seen.append((await SQLAlchemyDocumentRepository(other).get_by_id("doc")).status)
+        return np.zeros((len(texts), 2), dtype=np.float32)
+    
+    mock_deps["embedding_service"].embed_texts_array.side_effect = embed
+    mock_deps["document_processor"].chunk_text_async = AsyncMock(return_value=[
+        TextChunk(content="A", start_char=0, end_char=1, chunk_index=0),
+    ])
+    
+    async def run_job():
+        async with db.session() as session:
+            deps = dict(
+                mock_deps,
+                document_repo=SQLAlchemyDocumentRepository(session),
+                chunk_repo=SQLAlchemyChunkRepository(session),
+                tag_repo=SQLAlchemyTagRepository(session),
+            )
+            use_case = DocumentUseCase(
+                **deps,
+                enable_auto_tagging=False,
+                enable_summarization=False,
+                indexing_job_repo=SQLAlchemyIndexingJobRepository(session),
+                session=session,
+            )
+            return await use_case.process_indexing_job("doc")
+    
+    async def status():
+        async with db.session() as session:
+            doc = await SQLAlchemyDocumentRepository(session).get_by_id("doc")
+            chunks = await SQLAlchemyChunkRepository(session).get_by_document("doc")
+            queued = await SQLAlchemyIndexingJobRepository(session).exists("doc")
+            return doc.status, len(chunks), queued
+    
+    assert await run_job() is True
+    assert seen == [DocumentStatus.PROCESSING]
+    assert await status() == (DocumentStatus.INDEXED, 1, False)
+    
+    # A failed final stage is rolled back, its new vectors dropped, and FAILED committed
+    async with db.session() as session:
+        await SQLAlchemyIndexingJobRepository(session).add("doc")
+    mock_deps["document_processor"].chunk_text_async.return_value = [
+        TextChunk(content="B", start_char=0, end_char=1, chunk_index=0),
+    ]
+    mock_deps["vector_store"].delete_by_ids.side_effect = [RuntimeError("boom"), None]
+    
+    assert await run_job() is False
+    assert await status() == (DocumentStatus.FAILED, 1, False)
+    embedded = mock_deps["vector_store"].add_documents.call_args.kwargs["ids"]
+    mock_deps["vector_store"].delete_by_ids.assert_called_with(embedded)
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_indexing_job_failure_keeps_outbox_entry_when_unrecorded(mock_deps):
+    """Test a job whose failure can't be recorded rolls back and skips complete()"""
+    session = MagicMock()
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    indexing_job_repo = AsyncMock()
+    mock_deps["document_repo"].get_by_id.side_effect = RuntimeError("database is locked")
+    use_case = DocumentUseCase(
+        **mock_deps,
+        enable_auto_tagging=False,
+        enable_summarization=False,
+        indexing_job_repo=indexing_job_repo,
+        session=session,
+    )
+    
+    assert await use_case.process_indexing_job("doc") is False
+    assert session.rollback.await_count == 2
+    indexing_job_repo.complete.assert_not_called()
+    session.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_delete_defers_query_cache_invalidation(document_use_case, mock_deps):
+    """Test cached retrievals are dropped only when invalidated after commit"""
+    cache = QueryResultCache()
+    key = cache.make_key("query", 5)
+    cache.put(key, [{"id": "chunk"}], None, cache.generation)
+    document_use_case.query_cache = cache
+    mock_deps["document_repo"].get_by_id.return_value = Document(id="doc", title="Doc", content="x")
+    
+    await document_use_case.delete_document("doc")
+    assert cache.generation == 0 and document_use_case.query_cache_stale
+    
+    document_use_case.invalidate_query_cache()
+    assert cache.generation == 1 and cache.get(key) is None
+    assert not document_use_case.query_cache_stale
@@ -0,0 +1,72 @@
+"""
+Unit Tests for the Embedding Micro-Batcher
+Tests coalescing of concurrent embed_text calls
+"""
+import asyncio
+
+import pytest
+from src.infrastructure.embedding.service import EmbeddingService
+from src.infrastructure.embedding.batcher import MicroBatchingEmbeddingService
+
+
+class RecordingEmbeddingService(EmbeddingService):
+    """Fake embedding service that records each batch it receives"""
+    
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+    
+    async def embed_text(self, text):
+        return (await self.embed_texts([text]))[0]
+    
+    async def embed_texts(self, texts):
+        self.batches.append(list(texts))
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        return [[float(len(t)), 0.0] for t in texts]
+    
+    def get_dimension(self):
+        return 2
+
+
+class TestMicroBatchingEmbeddingService:
+    """Test MicroBatchingEmbeddingService"""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_batch(self):
+        """Test concurrent queries are embedded with one call"""
+        inner = RecordingEmbeddingService()
+        service = MicroBatchingEmbeddingService(inner, max_batch_size=32, max_wait_ms=5)
+        queries = [f"query {'x' * i}" for i in range(10)]
+        
+        results = await asyncio.gather(*(service.embed_text(q) for q in queries))
+        
+        assert len(inner.batches) == 1
+        assert results == [[float(len(q)), 0.0] for q in queries]
+        assert service.get_stats()["avg_batch_size"] == 10
+    
+    @pytest.mark.asyncio
+    async def test_flushes_at_max_batch_size(self):
+        """Test a full batch is sent without waiting for the timer"""
+        inner = RecordingEmbeddingService()
+        service = MicroBatchingEmbeddingService(inner, max_batch_size=4, max_wait_ms=10000)
+        
+        await asyncio.wait_for(
+            asyncio.gather(*(service.embed_text(str(i)) for i in range(8))),
+            timeout=1.0,
+        )
+        
+        assert [len(b) for b in inner.batches] == [4, 4]
+    
+    @pytest.mark.asyncio
+    async def test_batch_failure_reaches_every_caller(self):
+        """Test an error from the wrapped service is raised to all callers"""
+        service = MicroBatchingEmbeddingService(RecordingEmbeddingService(fail=True))
+        
+        results = await asyncio.gather(
+            service.embed_text("a"),
+            service.embed_text("b"),
+            return_exceptions=True,
+        )
+        
+        assert all(isinstance(r, RuntimeError) for r in results)
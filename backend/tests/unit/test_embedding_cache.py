@@ -0,0 +1,122 @@
+"""
+Unit Tests for the Embedding Cache
+Tests content-addressed caching in front of EmbeddingService
+"""
+import threading
+
+import numpy as np
+import pytest
+from src.infrastructure.embedding.service import EmbeddingService
+from src.infrastructure.embedding.cache import (
+    CachedEmbeddingService,
+    make_cache_key,
+)
+
+
+class CountingEmbeddingService(EmbeddingService):
+    """Fake embedding service that records every text it embeds"""
+    
+    def __init__(self):
+        self.calls = []
+    
+    async def embed_text(self, text):
+        return (await self.embed_texts([text]))[0]
+    
+    async def embed_texts(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0, 0.5] for t in texts]
+    
+    def get_dimension(self):
+        return 3
+    
+    @property
+    def embedded(self):
+        return [t for call in self.calls for t in call]
+
+
+class TestCachedEmbeddingService:
+    """Test CachedEmbeddingService"""
+    
+    @pytest.mark.asyncio
+    async def test_repeated_texts_hit_memory(self):
+        """Test only unseen texts reach the wrapped service"""
+        inner = CountingEmbeddingService()
+        service = CachedEmbeddingService(inner, model="test/model")
+        
+        first = await service.embed_texts(["alpha", "beta"])
+        second = await service.embed_texts(["alpha", "beta", "gamma"])
+        
+        assert second[:2] == first
+        assert inner.embedded == ["alpha", "beta", "gamma"]
+        stats = service.get_stats()
+        assert stats["memory_hits"] == 2
+        assert stats["misses"] == 3
+    
+    @pytest.mark.asyncio
+    async def test_duplicates_in_batch_embedded_once(self):
+        """Test identical chunks in one batch are embedded once"""
+        inner = CountingEmbeddingService()
+        service = CachedEmbeddingService(inner, model="test/model")
+        
+        result = await service.embed_texts(["same text", "same  text\n", "other"])
+        
+        assert inner.embedded == ["same text", "other"]
+        assert result[0] == result[1]
+    
+    @pytest.mark.asyncio
+    async def test_persistent_tier_survives_restart(self, tmp_path):
+        """Test embeddings are reused from SQLite by a fresh instance"""
+        path = str(tmp_path / "cache.db")
+        first = CachedEmbeddingService(CountingEmbeddingService(), model="m", persistent_path=path)
+        expected = await first.embed_texts(["persisted"])
+        
+        inner = CountingEmbeddingService()
+        second = CachedEmbeddingService(inner, model="m", persistent_path=path)
+        result = await second.embed_texts(["persisted"])
+        
+        assert result == expected
+        assert inner.embedded == []
+        assert second.get_stats()["persistent_hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """Test the memory tier is bounded"""
+        inner = CountingEmbeddingService()
+        service = CachedEmbeddingService(inner, model="m", memory_size=2)
+        
+        await service.embed_texts(["a", "b", "c"])
+        await service.embed_texts(["a"])
+        
+        assert inner.embedded == ["a", "b", "c", "a"]
+    
+    @pytest.mark.asyncio
+    async def test_array_path(self):
+        """Test embed_texts_array returns a float32 matrix matching embed_texts"""
+        inner = CountingEmbeddingService()
+        service = CachedEmbeddingService(inner, model="m")
+        
+        listed = await service.embed_texts(["one", "three"])
+        array = await service.embed_texts_array(["one", "three", "seventeen"])
+        
+        assert array.dtype == np.float32 and array.flags["C_CONTIGUOUS"]
+        assert array.shape == (3, 3)
+        assert array[:2].tolist() == listed
+        assert inner.embedded == ["one", "three", "seventeen"]
+    
+    @pytest.mark.asyncio
+    async def test_cached_rows_own_their_data(self, tmp_path):
+        """Test memory entries don't pin the batch matrix and SQLite runs on its own thread"""
+        service = CachedEmbeddingService(
+            CountingEmbeddingService(), model="m", persistent_path=str(tmp_path / "cache.db")
+        )
+        await service.embed_texts_array(["one", "three"])
+        
+        assert all(vector.base is None for vector in service.memory._data.values())
+        assert any(t.name.startswith("embedding-cache") for t in threading.enumerate())
+        service.shutdown()
+
+
+def test_cache_key_is_model_scoped():
+    """Test the same text under different models gets different keys"""
+    assert make_cache_key("m1", "text") != make_cache_key("m2", "text")
+    assert make_cache_key("m1", " text ") == make_cache_key("m1", "text")
@@ -0,0 +1,67 @@
+"""
+Unit Tests for File Upload Handling
+Tests streaming upload to disk and process-pool parsing
+"""
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from src.infrastructure.document_processing.processor import FileParser
+from src.presentation.api.document_routes import _save_upload
+
+
+@pytest.mark.asyncio
+async def test_save_upload_streams_to_disk(tmp_path):
+    """Test the upload is written completely in blocks"""
+    data = b"x" * (3 * 1024 * 1024 + 17)
+    path = tmp_path / "uploads" / "file.txt"
+    
+    size = await _save_upload(UploadFile(io.BytesIO(data)), str(path), max_bytes=10 * 1024 * 1024)
+    
+    assert size == len(data)
+    assert path.read_bytes() == data
+
+
+@pytest.mark.asyncio
+async def test_save_upload_rejects_oversized_file(tmp_path):
+    """Test the size limit applies while streaming and leaves no partial file"""
+    path = tmp_path / "file.pdf"
+    upload = UploadFile(io.BytesIO(b"x" * (2 * 1024 * 1024 + 1)))
+    
+    with pytest.raises(HTTPException) as exc_info:
+        await _save_upload(upload, str(path), max_bytes=2 * 1024 * 1024)
+    
+    assert exc_info.value.status_code == 413
+    assert not path.exists()
+
+
+@pytest.mark.asyncio
+async def test_parse_docx_in_process_pool(tmp_path):
+    """Test DOCX paragraphs are parsed off the event loop in order"""
+    docx = pytest.importorskip("docx")
+    path = str(tmp_path / "notes.docx")
+    document = docx.Document()
+    for text in ["First paragraph", "", "第二段", "Third"]:
+        document.add_paragraph(text)
+    document.save(path)
+    
+    paragraphs = [p async for p in FileParser.iter_pages(path, "docx")]
+    
+    assert paragraphs == ["First paragraph", "第二段", "Third"]
+    assert await FileParser.parse_file(path, "docx") == "First paragraph\n\n第二段\n\nThird"
+
+
+@pytest.mark.asyncio
+async def test_parse_pdf_page_ranges(tmp_path):
+    """Test multi-range PDFs are parsed across pool tasks"""
+    pypdf = pytest.importorskip("pypdf")
+    path = str(tmp_path / "blank.pdf")
+    writer = pypdf.PdfWriter()
+    for _ in range(FileParser.PAGES_PER_TASK * 2 + 1):
+        writer.add_blank_page(width=200, height=200)
+    with open(path, "wb") as f:
+        writer.write(f)
+    
+    assert FileParser.count_pdf_pages(path) == FileParser.PAGES_PER_TASK * 2 + 1
+    assert await FileParser.parse_file(path, "pdf") == ""
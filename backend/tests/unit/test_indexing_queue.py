@@ -0,0 +1,155 @@
+"""
+Unit Tests for the Indexing Queue
+Tests the in-process asyncio worker pool
+"""
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+from config.settings import Settings
+from src.infrastructure.task_queue.indexing_queue import (
+    AsyncioIndexingQueue,
+    IndexingQueueFullError,
+    create_indexing_queue,
+)
+
+
+class TestAsyncioIndexingQueue:
+    """Test AsyncioIndexingQueue"""
+    
+    @pytest.mark.asyncio
+    async def test_processes_jobs(self):
+        """Test enqueued documents are handled by workers"""
+        handled = []
+        
+        async def handler(doc_id):
+            handled.append(doc_id)
+        
+        queue = AsyncioIndexingQueue(handler, concurrency=2)
+        await queue.start()
+        await queue.enqueue_many(["a", "b", "c"])
+        await queue._queue.join()
+        await queue.stop()
+        
+        assert sorted(handled) == ["a", "b", "c"]
+        assert queue.get_stats()["processed"] == 3
+    
+    @pytest.mark.asyncio
+    async def test_coalesces_duplicates(self):
+        """Test a document waiting in the queue is not queued twice"""
+        release = asyncio.Event()
+        handled = []
+        
+        async def handler(doc_id):
+            await release.wait()
+            handled.append(doc_id)
+        
+        queue = AsyncioIndexingQueue(handler, concurrency=1)
+        await queue.start()
+        await queue.enqueue("busy")
+        await asyncio.sleep(0)  # Let the worker pick up "busy"
+        await queue.enqueue("doc")
+        await queue.enqueue("doc")
+        release.set()
+        await queue._queue.join()
+        await queue.stop()
+        
+        assert handled == ["busy", "doc"]
+    
+    @pytest.mark.asyncio
+    async def test_reruns_document_enqueued_while_running(self):
+        """Test a document updated during indexing is indexed again"""
+        started = asyncio.Event()
+        release = asyncio.Event()
+        handled = []
+        
+        async def handler(doc_id):
+            started.set()
+            await release.wait()
+            handled.append(doc_id)
+        
+        queue = AsyncioIndexingQueue(handler, concurrency=1)
+        await queue.start()
+        await queue.enqueue("doc")
+        await started.wait()
+        await queue.enqueue("doc")
+        release.set()
+        await queue._queue.join()
+        await queue.stop()
+        
+        assert handled == ["doc", "doc"]
+    
+    @pytest.mark.asyncio
+    async def test_recover_skips_running_documents(self):
+        """Test an outbox sweep doesn't re-run a document that is still indexing"""
+        started = asyncio.Event()
+        release = asyncio.Event()
+        handled = []
+        
+        async def handler(doc_id):
+            started.set()
+            await release.wait()
+            handled.append(doc_id)
+        
+        queue = AsyncioIndexingQueue(handler, concurrency=1)
+        await queue.start()
+        await queue.enqueue("doc")
+        await started.wait()
+        assert await queue.recover(["doc", "other"]) == 1
+        release.set()
+        await queue._queue.join()
+        await queue.stop()
+        
+        assert handled == ["doc", "other"]
+    
+    @pytest.mark.asyncio
+    async def test_backpressure(self):
+        """Test enqueue is rejected once the queue stays full"""
+        release = asyncio.Event()
+        
+        async def handler(doc_id):
+            await release.wait()
+        
+        queue = AsyncioIndexingQueue(handler, concurrency=1, max_size=1, enqueue_timeout=0.05)
+        await queue.start()
+        await queue.enqueue("running")
+        await asyncio.sleep(0)
+        await queue.enqueue("waiting")
+        
+        assert queue.is_full()
+        with pytest.raises(IndexingQueueFullError):
+            await queue.enqueue("rejected")
+        
+        release.set()
+        await queue.stop()
+    
+    @pytest.mark.asyncio
+    async def test_handler_failure_does_not_stop_worker(self):
+        """Test a failing job is counted and the worker keeps going"""
+        handled = []
+        
+        async def handler(doc_id):
+            if doc_id == "bad":
+                raise RuntimeError("boom")
+            handled.append(doc_id)
+        
+        queue = AsyncioIndexingQueue(handler, concurrency=1)
+        await queue.start()
+        await queue.enqueue_many(["bad", "good"])
+        await queue._queue.join()
+        await queue.stop()
+        
+        assert handled == ["good"]
+        assert queue.get_stats()["failed"] == 1
+
+
+def test_create_inline_queue():
+    """Test inline backend disables the queue"""
+    assert create_indexing_queue(backend="inline") is None
+
+
+def test_arq_backend_requires_chroma_server():
+    """Test arq is rejected with the embedded (single-process) Chroma store"""
+    with pytest.raises(ValidationError, match="CHROMA_HOST"):
+        Settings(indexing_queue_backend="arq", chroma_host=None)
+    assert Settings(indexing_queue_backend="arq", chroma_host="chroma").chroma_port == 8000
@@ -0,0 +1,63 @@
+"""
+Unit Tests for the Inference Executor
+Tests the dedicated embedding inference pool and its metrics
+"""
+import asyncio
+import threading
+
+import pytest
+from src.infrastructure.embedding.executor import InferenceExecutor
+from src.infrastructure.embedding.service import LocalEmbeddingService
+
+
+class TestInferenceExecutor:
+    """Test InferenceExecutor"""
+    
+    @pytest.mark.asyncio
+    async def test_bounded_workers_and_queue_depth(self):
+        """Test calls beyond max_workers wait in the queue"""
+        executor = InferenceExecutor(max_workers=2)
+        release = threading.Event()
+        
+        tasks = [asyncio.create_task(executor.run(release.wait, 5)) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        
+        stats = executor.get_stats()
+        assert stats["in_flight"] == 5
+        assert stats["queue_depth"] == 3
+        
+        release.set()
+        await asyncio.gather(*tasks)
+        assert executor.get_stats()["completed"] == 5
+        assert executor.get_stats()["queue_depth"] == 0
+        executor.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_process_mode(self):
+        """Test calls run in a separate worker process"""
+        executor = InferenceExecutor(max_workers=1, use_process=True)
+        
+        result = await executor.run(len, ["a", "b", "c"])
+        
+        assert result == 3
+        assert executor.get_stats()["mode"] == "process"
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_local_embedding_uses_dedicated_executor():
+    """Test LocalEmbeddingService encodes on its own named threads"""
+    service = LocalEmbeddingService(inference_workers=1, torch_threads=1)
+    threads = []
+    
+    def fake_encode(texts):
+        threads.append(threading.current_thread().name)
+        return [[1.0, 0.0] for _ in texts]
+    
+    service._encode_sync = fake_encode
+    result = await service.embed_texts(["a", "b"])
+    
+    assert result == [[1.0, 0.0], [1.0, 0.0]]
+    assert threads[0].startswith("embedding-inference")
+    assert service.get_stats()["completed"] == 1
+    service.shutdown()
@@ -0,0 +1,131 @@
+"""
+Unit Tests for OllamaEmbeddingService
+Runs against a local stub of the Ollama HTTP API
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from src.infrastructure.embedding.service import OllamaEmbeddingService
+
+
+class StubOllamaServer:
+    """Stub Ollama server with a fixed per-request latency"""
+    
+    def __init__(self, latency: float = 0.0, batch_endpoint: bool = True, model_pulled: bool = True):
+        self.latency = latency
+        self.model_pulled = model_pulled
+        self.requests = {"embed": 0, "embeddings": 0}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        
+        routes = [Route("/api/embeddings", self.embeddings, methods=["POST"])]
+        if batch_endpoint:
+            routes.append(Route("/api/embed", self.embed, methods=["POST"]))
+        self.app = Starlette(routes=routes)
+    
+    @staticmethod
+    def vector(text):
+        return [float(len(text)), 1.0, 0.0]
+    
+    async def _handle(self, endpoint):
+        self.requests[endpoint] += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+    
+    async def embed(self, request):
+        body = await request.json()
+        if not self.model_pulled:
+            return JSONResponse(
+                {"error": f'model "{body["model"]}" not found, try pulling it first'},
+                status_code=404,
+            )
+        await self._handle("embed")
+        return JSONResponse({"embeddings": [self.vector(t) for t in body["input"]]})
+    
+    async def embeddings(self, request):
+        body = await request.json()
+        await self._handle("embeddings")
+        return JSONResponse({"embedding": self.vector(body["prompt"])})
+
+
+def make_service(server, **kwargs):
+    service = OllamaEmbeddingService(base_url="http://ollama-stub", **kwargs)
+    service.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app))
+    return service
+
+
+class TestOllamaEmbeddingService:
+    """Test OllamaEmbeddingService batching"""
+    
+    @pytest.mark.asyncio
+    async def test_batches_texts(self):
+        """Test texts are sent in batch_size groups to /api/embed"""
+        server = StubOllamaServer()
+        service = make_service(server, batch_size=16)
+        texts = [f"chunk {i}" * (i % 5 + 1) for i in range(100)]
+        
+        result = await service.embed_texts(texts)
+        
+        assert result == [server.vector(t) for t in texts]
+        assert server.requests == {"embed": 7, "embeddings": 0}
+        assert service.get_dimension() == 3
+    
+    @pytest.mark.asyncio
+    async def test_falls_back_to_single_prompt_endpoint(self):
+        """Test bounded-concurrency fallback when /api/embed is missing"""
+        server = StubOllamaServer(latency=0.01, batch_endpoint=False)
+        service = make_service(server, max_concurrency=3)
+        texts = [f"text {i}" for i in range(12)]
+        
+        result = await service.embed_texts(texts)
+        await service.embed_texts(["again"])
+        
+        assert result == [server.vector(t) for t in texts]
+        assert server.requests["embeddings"] == 13
+        assert server.requests["embed"] == 0  # Only the first call probes (404 not counted)
+        assert server.max_in_flight <= 3
+    
+    @pytest.mark.asyncio
+    async def test_missing_model_does_not_disable_batching(self):
+        """Test a model-not-found 404 is raised and batching stays on once pulled"""
+        server = StubOllamaServer(model_pulled=False)
+        service = make_service(server)
+        
+        with pytest.raises(httpx.HTTPStatusError):
+            await service.embed_texts(["early"])
+        
+        server.model_pulled = True
+        result = await service.embed_texts(["late"])
+        
+        assert result == [server.vector("late")]
+        assert server.requests == {"embed": 1, "embeddings": 0}
+    
+    @pytest.mark.asyncio
+    async def test_batching_beats_serial_requests(self):
+        """Test throughput gain over one request per chunk"""
+        texts = [f"chunk {i}" for i in range(40)]
+        
+        serial_server = StubOllamaServer(latency=0.01, batch_endpoint=False)
+        serial = make_service(serial_server, max_concurrency=1)
+        start = time.perf_counter()
+        await serial.embed_texts(texts)
+        serial_time = time.perf_counter() - start
+        
+        batch_server = StubOllamaServer(latency=0.01)
+        batched = make_service(batch_server, batch_size=32)
+        start = time.perf_counter()
+        await batched.embed_texts(texts)
+        batched_time = time.perf_counter() - start
+        
+        assert batch_server.requests["embed"] == 2
+        assert batched_time < serial_time / 5
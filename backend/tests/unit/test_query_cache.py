@@ -0,0 +1,67 @@
+"""
+Unit Tests for the Retrieval Result Cache
+Tests exact and near-duplicate hits, invalidation, TTL and eviction
+"""
+from unittest.mock import AsyncMock
+
+import pytest
+from src.application.use_cases.chat_use_case import ChatUseCase
+from src.infrastructure.vector_store.query_cache import QueryResultCache
+
+
+def test_generation_bump_invalidates_and_rejects_in_flight_results():
+    """Test a bump clears entries and drops results computed before it"""
+    cache = QueryResultCache()
+    key = cache.make_key("What is  RAG?", 5)
+    generation = cache.generation
+    cache.put(key, [{"id": "a"}], None, generation)
+    
+    assert cache.get(cache.make_key("What is RAG?", 5)) == [{"id": "a"}]
+    assert cache.get(cache.make_key("What is RAG?", 3)) is None
+    
+    cache.bump()
+    cache.put(key, [{"id": "stale"}], None, generation)
+    
+    assert cache.get(key) is None
+    assert cache.get_stats()["invalidations"] == 1
+
+
+def test_ttl_size_limit_and_similarity_tier(monkeypatch):
+    """Test entries expire, LRU evicts beyond max_size and near-duplicates hit"""
+    now = [1000.0]
+    monkeypatch.setattr("src.infrastructure.vector_store.query_cache.time.monotonic", lambda: now[0])
+    cache = QueryResultCache(max_size=2, ttl_seconds=10, similarity_threshold=0.95)
+    for i, vector in enumerate(([1.0, 0.0], [0.0, 1.0], [1.0, 1.0])):
+        cache.put(cache.make_key(f"q{i}", 5), [{"id": f"r{i}"}], vector, cache.generation)
+    
+    assert len(cache) == 2
+    assert cache.get(cache.make_key("q0", 5)) is None
+    assert cache.get_similar(cache.make_key("other", 5), [0.01, 1.0]) == [{"id": "r1"}]
+    assert cache.get_similar(cache.make_key("other", 5), [1.0, 0.0]) is None
+    
+    now[0] += 11
+    assert cache.get(cache.make_key("q2", 5)) is None
+    stats = cache.get_stats()
+    assert (stats["similar_hits"], stats["misses"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_repeated_search_across_requests_skips_embedding_and_search():
+    """Test a second request reuses cached results until the index changes"""
+    cache = QueryResultCache()
+    deps = {name: AsyncMock() for name in (
+        "conversation_repo", "message_repo", "document_repo",
+        "embedding_service", "vector_store", "llm_service",
+    )}
+    deps["embedding_service"].embed_text.return_value = [0.1, 0.2]
+    deps["vector_store"].hybrid_search.return_value = [{"id": "a", "content": "x", "metadata": {}}]
+    
+    first = await ChatUseCase(**deps, query_cache=cache).semantic_search("q", include_documents=False)
+    second = await ChatUseCase(**deps, query_cache=cache).semantic_search("q", include_documents=False)
+    cache.bump()
+    await ChatUseCase(**deps, query_cache=cache).semantic_search("q", include_documents=False)
+    
+    assert first == second
+    assert deps["embedding_service"].embed_text.call_count == 2
+    assert deps["vector_store"].hybrid_search.call_count == 2
+    assert cache.get_stats()["exact_hits"] == 1
@@ -0,0 +1,169 @@
+"""
+Unit Tests for SQLAlchemy Repositories
+Run against an in-memory SQLite database
+"""
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from src.domain.entities.document import Document, Message, Tag
+from src.infrastructure.database.models import Base, ConversationModel
+from src.infrastructure.database.repositories import (
+    SQLAlchemyDocumentRepository, SQLAlchemyMessageRepository, SQLAlchemyTagRepository
+)
+from src.presentation.api.document_routes import SUMMARY_FIELDS, _parse_fields
+from src.presentation.api.pagination import decode_cursor, next_cursor
+
+
+@pytest_asyncio.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_tag_update_counts_upserts_in_bulk(session):
+    """Test increments create or bump tags and decrements clamp at zero"""
+    repo = SQLAlchemyTagRepository(session)
+    await repo.create(Tag(name="python", document_count=2))
+    await repo.create(Tag(name="draft", document_count=1))
+    
+    await repo.update_counts({"Python": 1, "rust": 1, "RUST": 1, "draft": -3, "missing": -1})
+    
+    counts = {t.name: t.document_count for t in await repo.get_all()}
+    assert counts == {"draft": 0, "python": 3, "rust": 2}
+
+
+@pytest.mark.asyncio
+async def test_links_and_tags_query_association_tables(session):
+    """Test backlinks are derived from document_links and tags filter via document_tags"""
+    repo = SQLAlchemyDocumentRepository(session)
+    for doc_id, title in (("a", "Alpha"), ("b", "Beta")):
+        await repo.create(Document(id=doc_id, title=title, content="", tags=["wiki"]))
+    source = await repo.create(Document(
+        id="s", title="Source", content="", tags=["draft"],
+        outgoing_links=["Beta", "Alpha", "Later"],
+    ))
+    
+    assert {d.id for d in await repo.get_by_titles(["Alpha", "Nope"])} == {"a"}
+    assert {d.id for d in await repo.get_by_ids(["b", "zzz"])} == {"b"}
+    assert (await repo.get_by_id("a")).incoming_links == ["s"]
+    
+    links = await repo.get_linked_documents("s")
+    assert [d.id for d in links["outgoing"]] == ["b", "a"]
+    
+    # A note created after the link picks up the backlink without rewrites
+    later = await repo.create(Document(id="l", title="Later", content=""))
+    assert later.incoming_links == ["s"]
+    
+    source.outgoing_links = ["Alpha"]
+    source.tags = ["wiki"]
+    await repo.update(source)
+    assert (await repo.get_by_id("b")).incoming_links == []
+    assert {d.id for d in await repo.get_by_tag("wiki")} == {"a", "b", "s"}
+    assert await repo.get_by_tag("draft") == []
+    
+    await repo.delete("s")
+    assert (await repo.get_by_id("a")).incoming_links == []
+
+
+@pytest.mark.asyncio
+async def test_keyset_pagination_walks_ties_without_gaps(session):
+    """Test cursor pages cover every document once, even with equal timestamps"""
+    repo = SQLAlchemyDocumentRepository(session)
+    stamp = datetime(2026, 1, 1)
+    for i in range(7):
+        await repo.create(Document(
+            id=f"d{i}", title=f"Doc {i}", content="",
+            updated_at=stamp + timedelta(days=i // 3),
+        ))
+    
+    seen, after = [], None
+    while True:
+        page = await repo.get_all(limit=3 + 1, after=after)
+        cursor = next_cursor(page, 3)
+        seen.extend(d.id for d in page)
+        if not cursor:
+            break
+        after = decode_cursor(cursor)
+    
+    assert seen == ["d6", "d5", "d4", "d3", "d2", "d1", "d0"]
+    with pytest.raises(HTTPException):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_message_get_recent_returns_newest_in_order(session):
+    """Test get_recent reads the newest messages and returns them oldest first"""
+    session.add(ConversationModel(id="c", title="Chat"))
+    repo = SQLAlchemyMessageRepository(session)
+    for i in range(5):
+        await repo.create(Message(
+            id=f"m{i}", conversation_id="c", content=str(i),
+            created_at=datetime(2026, 1, 1) + timedelta(minutes=i),
+        ))
+    
+    assert [m.id for m in await repo.get_recent("c", limit=2)] == ["m3", "m4"]
+
+
+@pytest.mark.asyncio
+async def test_get_fields_by_ids_projects_requested_columns(session):
+    """Test projections return only the named columns and reject unknown ones"""
+    repo = SQLAlchemyDocumentRepository(session)
+    await repo.create(Document(id="a", title="Alpha", content="x" * 10000, tags=["t"]))
+    
+    rows = await repo.get_fields_by_ids(["a", "missing"], ("title", "tags"))
+    
+    assert rows == {"a": {"title": "Alpha", "tags": ["t"]}}
+    with pytest.raises(ValueError):
+        await repo.get_fields_by_ids(["a"], ("title", "password"))
+
+
+@pytest.mark.asyncio
+async def test_summaries_skip_content_column(session):
+    """Test list/search/tag summaries never select document content"""
+    repo = SQLAlchemyDocumentRepository(session)
+    await repo.create(Document(id="a", title="Alpha", content="x" * 1000, tags=["t"]))
+    await repo.create(Document(id="b", title="Beta", content="[[Alpha]]", outgoing_links=["Alpha"]))
+    await session.commit()
+    session.expunge_all()
+    
+    statements = []
+    
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+    
+    engine = session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        listed = await repo.get_summaries()
+        found = await repo.search_summaries("alp")
+        tagged = await repo.get_summaries_by_tag("t")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    
+    assert [d.id for d in listed] == ["b", "a"]
+    assert [d.id for d in found] == [d.id for d in tagged] == ["a"]
+    assert found[0].incoming_links == ["b"] and found[0].tags == ["t"]
+    assert not hasattr(found[0], "content")
+    assert all("documents.content" not in s for s in statements)
+    
+    full = await repo.get_by_id("a")
+    assert full.content == "x" * 1000
+
+
+def test_list_fields_never_include_content():
+    """Test fields= picks summary fields only; the body stays on GET /documents/{id}"""
+    assert "content" not in SUMMARY_FIELDS
+    assert _parse_fields(None) == SUMMARY_FIELDS
+    assert _parse_fields("title, tags,title") == ("id", "title", "tags")
+    with pytest.raises(HTTPException) as error:
+        _parse_fields("id,title,content")
+    assert error.value.status_code == 400 and "GET /documents/{id}" in error.value.detail
@@ -2,6 +2,9 @@
 Unit Tests for Semantic Document Processor
 Tests Markdown preprocessing and semantic chunking
 """
+import asyncio
+
+import numpy as np
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from src.infrastructure.document_processing.processor import (
@@ -10,6 +13,8 @@ from src.infrastructure.document_processing.processor import (
     MarkdownPreprocessor,
     TextChunk,
     create_document_processor,
+    semantic_breakpoints,
+    split_spans,
 )
 
 
@@ -89,6 +94,104 @@ Content B.
         assert sections[0]["start_char"] == 0
         assert sections[1]["start_char"] > 0
 
+    
+    def test_headers_in_fenced_code_ignored(self):
+        """Test # comments inside fenced code blocks don't start sections"""
+        content = """# Setup
+Run this:
+
+```bash
+# install deps
+pip install -r requirements.txt
+```
+
+~~~~python
+# not a header either
+~~~~
+
+## Next
+Done.
+"""
+        sections = MarkdownPreprocessor.split_by_headers(content)
+        
+        assert [s["title"] for s in sections] == ["Setup", "Next"]
+        assert "# install deps" in sections[0]["content"]
+    
+    def test_sections_are_exact_views(self):
+        """Test sections tile the content and slice it exactly"""
+        content = "Preamble line.\n\n# One\nBody one.\n#hashtag stays\n## Two  \nBody two."
+        sections = MarkdownPreprocessor.split_by_headers(content)
+        
+        assert [s["title"] for s in sections] == ["", "One", "Two"]
+        for section in sections:
+            assert content[section["start_char"]:section["end_char"]] == section["content"]
+        assert "".join(s["content"] for s in sections) == content
+
+
+class TestDocumentProcessorOffsets:
+    """Test recursive chunking keeps exact character offsets"""
+    
+    def test_offsets_match_content_with_repeated_prefixes(self):
+        """Test chunks starting with the same 50+ characters get their own offsets"""
+        processor = DocumentProcessor(chunk_size=120, chunk_overlap=20, min_chunk_size=10)
+        header = "Repeated boilerplate line that opens every paragraph here. "
+        text = "\n\n".join(header + f"Paragraph {i} body." for i in range(20))
+        
+        chunks = processor.chunk_text(text)
+        
+        assert len(chunks) == 20
+        for chunk in chunks:
+            assert text[chunk.start_char:chunk.end_char] == chunk.content
+        starts = [c.start_char for c in chunks]
+        assert starts == sorted(set(starts))
+        assert chunks[-1].end_char == len(text)
+    
+    def test_overlap_is_previous_tail(self):
+        """Test overlap extends each chunk back into the previous chunk"""
+        processor = DocumentProcessor(chunk_size=50, chunk_overlap=10, min_chunk_size=10)
+        text = " ".join(f"word{i:03d}" for i in range(100))
+        
+        chunks = processor.chunk_text(text)
+        
+        for prev, chunk in zip(chunks, chunks[1:]):
+            assert chunk.start_char == prev.end_char - 10
+            assert text[chunk.start_char:chunk.end_char] == chunk.content
+            assert len(chunk.content) <= 50 + 10 + 1
+    
+    def test_chunks_do_not_straddle_headers(self):
+        """Test the recursive chunker splits on Markdown sections first"""
+        processor = DocumentProcessor(chunk_size=200, chunk_overlap=20, min_chunk_size=10)
+        text = "# A\nshort a.\n\n# B\nshort b.\n\n```\n# code\n```\n"
+        
+        chunks = processor.chunk_text(text)
+        
+        assert [c.metadata["section_title"] for c in chunks] == ["A", "B"]
+        assert chunks[1].content.startswith("# B")
+        assert "# code" in chunks[1].content
+    
+    def test_parent_child_offsets(self):
+        """Test child offsets point into the original text"""
+        processor = DocumentProcessor(min_chunk_size=10)
+        text = "\n".join(f"Line {i}: the same words again and again." for i in range(200))
+        
+        parents, children = processor.chunk_with_parents(text, parent_chunk_size=800, child_chunk_size=200)
+        
+        assert "".join(p.content for p in parents).replace("\n", "") == text.replace("\n", "")
+        for child in children:
+            assert text[child.start_char:child.end_char] == child.content
+
+
+def test_split_spans_falls_through_separator_levels():
+    """Test oversized pieces recurse to finer separators, then characters"""
+    text = "alpha beta gamma\n\n" + "x" * 25 + "\n\n   \n\ndelta"
+    
+    spans = split_spans(text, chunk_size=10)
+    
+    assert [text[s:e] for s, e in spans] == [
+        "alpha beta", "gamma", "x" * 10, "x" * 10, "x" * 5, "delta",
+    ]
+    assert split_spans("aaaa bbbb", 3, separators=(" ",)) == [(0, 4), (5, 9)]
+
 
 class TestSemanticDocumentProcessor:
     """Test SemanticDocumentProcessor"""
@@ -101,17 +204,14 @@ class TestSemanticDocumentProcessor:
             return [[0.1, 0.2, 0.3] for _ in texts]
         return embed
     
-    def test_fallback_to_recursive_split(self, mock_embedding_fn):
-        """Test that processor falls back when SemanticChunker unavailable"""
+    def test_fallback_to_recursive_split(self):
+        """Test that processor falls back when embedding fails"""
         processor = SemanticDocumentProcessor(
-            embedding_function=mock_embedding_fn,
+            embedding_function=AsyncMock(side_effect=RuntimeError("model down")),
             similarity_threshold=0.5,
             min_chunk_size=50,
         )
         
-        # Force chunker to be None (simulating import failure)
-        processor._semantic_chunker = None
-        
         content = "This is a test. " * 20  # Make it long enough
         chunks = processor.chunk_text(content)
         
@@ -146,8 +246,6 @@ class TestSemanticDocumentProcessor:
             embedding_function=mock_embedding_fn,
             min_chunk_size=10,
         )
-        # Force fallback
-        processor._semantic_chunker = None
         
         content = """# Introduction
 This is the intro section.
@@ -159,6 +257,107 @@ This describes the methods.
         
         # Should have chunks with section metadata
         assert len(chunks) >= 2
+        assert [c.metadata["section_title"] for c in chunks] == ["Introduction", "Methods"]
+    
+    def test_one_batched_embedding_call_per_document(self):
+        """Test every sentence of every section is embedded in a single call"""
+        calls = []
+        
+        async def embed(texts):
+            calls.append(list(texts))
+            # Sentences about cats and dogs point in different directions
+            return np.array([[t.count("cat"), t.count("dog"), 0.1] for t in texts], dtype=np.float32)
+        
+        processor = SemanticDocumentProcessor(embedding_function=embed, min_chunk_size=40)
+        cats = " ".join(f"The cat number {i} sleeps all day." for i in range(6))
+        dogs = " ".join(f"A dog named Rex{i} runs outside." for i in range(6))
+        text = f"# Pets\n{cats} {dogs}\n\n# More\n{dogs} {cats}\n"
+        
+        chunks = processor.chunk_text(text)
+        
+        assert len(calls) == 1
+        assert len(calls[0]) == 26  # header line + 12 sentences, per section
+        for chunk in chunks:
+            assert text[chunk.start_char:chunk.end_char] == chunk.content
+        pets = [c.content for c in chunks if c.metadata["section_title"] == "Pets"]
+        assert any("cat" in c and "dog" not in c for c in pets)
+        assert any("dog" in c and "cat" not in c for c in pets)
+    
+    @pytest.mark.asyncio
+    async def test_async_matches_sync(self, mock_embedding_fn):
+        """Test chunk_text_async produces the same chunks as chunk_text"""
+        processor = SemanticDocumentProcessor(embedding_function=mock_embedding_fn, min_chunk_size=20)
+        text = "# A\n" + "One sentence here. " * 10 + "\n# B\n" + "Another one there. " * 10
+        
+        sync_chunks = await asyncio.to_thread(processor.chunk_text, text)
+        async_chunks = await processor.chunk_text_async(text)
+        
+        assert async_chunks == sync_chunks
+        assert [c.chunk_index for c in async_chunks] == list(range(len(async_chunks)))
+    
+    @pytest.mark.asyncio
+    async def test_sync_refuses_running_loop(self, mock_embedding_fn):
+        """Test chunk_text raises instead of blocking a running event loop"""
+        processor = SemanticDocumentProcessor(embedding_function=mock_embedding_fn, min_chunk_size=20)
+        
+        with pytest.raises(RuntimeError, match="chunk_text_async"):
+            processor.chunk_text("One sentence here. " * 10)
+
+    
+    @pytest.mark.asyncio
+    async def test_async_sections_concurrent_and_ordered(self):
+        """Test batches overlap under the semaphore yet chunks stay in document order"""
+        active = 0
+        peak = 0
+        
+        async def embed(texts):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            # Earlier sections finish last
+            await asyncio.sleep(0.05 / (1 + int(texts[0][3:texts[0].index("\n")])))
+            active -= 1
+            return np.ones((len(texts), 3), dtype=np.float32)
+        
+        processor = SemanticDocumentProcessor(
+            embedding_function=embed,
+            min_chunk_size=20,
+            section_concurrency=3,
+            sentences_per_call=4,
+        )
+        text = "".join(f"# S{i}\nSection {i} first line.\nSection {i} second line.\n" for i in range(10))
+        
+        chunks = await processor.chunk_text_async(text)
+        
+        assert peak == 3
+        assert [c.metadata["section_title"] for c in chunks] == [f"S{i}" for i in range(10)]
+        assert [c.chunk_index for c in chunks] == list(range(10))
+        assert [c.start_char for c in chunks] == sorted(c.start_char for c in chunks)
+    
+    @pytest.mark.asyncio
+    async def test_async_batch_failure_falls_back(self):
+        """Test one failing batch falls back to recursive split for the document"""
+        async def embed(texts):
+            if "S3" in texts[0]:
+                raise RuntimeError("model down")
+            return np.ones((len(texts), 3), dtype=np.float32)
+        
+        processor = SemanticDocumentProcessor(
+            embedding_function=embed, min_chunk_size=20, sentences_per_call=3,
+        )
+        text = "".join(f"# S{i}\nSection {i} first line.\nSection {i} second line.\n" for i in range(5))
+        
+        chunks = await processor.chunk_text_async(text)
+        
+        assert [c.metadata["section_title"] for c in chunks] == [f"S{i}" for i in range(5)]
+        assert all(text[c.start_char:c.end_char] == c.content for c in chunks)
+
+def test_semantic_breakpoints_vectorized():
+    """Test breaks fall where adjacent cosine distance exceeds the percentile"""
+    embeddings = np.array([[1, 0], [1, 0.1], [0, 1], [0.1, 1], [1, 0]], dtype=np.float32)
+    
+    assert semantic_breakpoints(embeddings, 50).tolist() == [1, 3]
+    assert semantic_breakpoints(embeddings[:1], 50).tolist() == []
 
 
 class TestCreateDocumentProcessor:
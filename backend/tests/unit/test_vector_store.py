@@ -0,0 +1,61 @@
+"""
+Unit Tests for ChromaVectorStore
+Tests that blocking Chroma calls run off the event loop
+"""
+import asyncio
+import time
+
+import numpy as np
+import pytest
+from src.infrastructure.metrics.latency import LatencyHistogram
+from src.infrastructure.vector_store.chroma_store import ChromaVectorStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ChromaVectorStore(str(tmp_path / "chroma"), "test_offload")
+    yield store
+    store.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_slow_write_does_not_block_event_loop(store):
+    """Test the loop keeps ticking and reads complete during a slow write"""
+    await store.add_documents(["a"], np.array([[1.0, 0.0]]), ["alpha"], [{"document_id": "d"}])
+    original_add = store.collection.add
+    
+    def slow_add(**kwargs):
+        time.sleep(0.3)
+        original_add(**kwargs)
+    
+    store.collection.add = slow_add
+    write = asyncio.create_task(
+        store.add_documents(["b"], np.array([[0.0, 1.0]]), ["beta"], [{"document_id": "d"}])
+    )
+    await asyncio.sleep(0.01)
+    
+    start = time.perf_counter()
+    results = await store.search(np.array([1.0, 0.0]), top_k=1)
+    read_time = time.perf_counter() - start
+    
+    assert results[0]["id"] == "a"
+    assert read_time < 0.2
+    assert not write.done()
+    await write
+    
+    latency = (await store.get_collection_stats())["latency"]
+    assert latency["add"]["count"] == 2
+    assert latency["add"]["max_ms"] >= 300
+    assert latency["query"]["count"] == 1
+
+
+def test_histogram_percentiles():
+    """Test percentile estimates use bucket upper bounds"""
+    histogram = LatencyHistogram(buckets_ms=(10, 100, 1000))
+    for value in [5] * 98 + [50, 5000]:
+        histogram.observe(value)
+    
+    assert histogram.percentile(50) == 10
+    assert histogram.percentile(99) == 100
+    assert histogram.percentile(100) == 5000
+    assert histogram.snapshot()["buckets"]["le_+inf"] == 1
@@ -0,0 +1,62 @@
+"""
+Knowledge Assistant - Indexing Worker
+
+arq worker for the Redis-backed indexing queue
+(INDEXING_QUEUE_BACKEND=arq). The worker and the API share the vector
+store through a Chroma server (CHROMA_HOST); settings reject arq with the
+embedded store.
+
+Usage:
+    arq worker.WorkerSettings
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from arq.connections import RedisSettings
+import structlog
+
+from config.settings import get_settings
+from src.infrastructure.database.connection import init_db, get_db_manager
+from src.presentation.api.dependencies import run_indexing_job
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+
+async def startup(ctx: dict) -> None:
+    """Initialize database for the worker process"""
+    db = init_db(settings.database_url)
+    await db.create_tables()
+    logger.info("indexing_worker_started", queue=settings.indexing_queue_name)
+
+
+async def shutdown(ctx: dict) -> None:
+    """Release worker resources"""
+    from src.presentation.api.dependencies import get_embedding_service, get_vector_store
+    get_embedding_service().shutdown()
+    get_vector_store().shutdown()
+    
+    from src.infrastructure.document_processing.processor import shutdown_executors
+    shutdown_executors()
+    
+    await get_db_manager().close()
+    logger.info("indexing_worker_stopped")
+
+
+async def index_document_job(ctx: dict, doc_id: str) -> None:
+    """Index one document (name matches ArqIndexingQueue.JOB_NAME)"""
+    await run_indexing_job(doc_id)
+
+
+class WorkerSettings:
+    """arq worker configuration"""
+    functions = [index_document_job]
+    on_startup = startup
+    on_shutdown = shutdown
+    redis_settings = RedisSettings.from_dsn(settings.redis_url)
+    queue_name = settings.indexing_queue_name
+    max_jobs = settings.indexing_concurrency
+    keep_result = 0
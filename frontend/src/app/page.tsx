@@ -33,7 +33,7 @@ export default function Home() {
     setIsAnalyzingGraph(true);
     try {
       const notesSummary = notes
-        .map((n) => `ID: ${n.id} | Title: ${n.title} | Content Snippet: ${n.content.slice(0, 100)}...`)
+        .map((n) => `ID: ${n.id} | Title: ${n.title} | Content Snippet: ${(n.content || n.summary || '').slice(0, 100)}...`)
         .join('\n');
       const links = await aiApi.analyzeGraph(notesSummary);
       setAiLinks(links.map((l) => ({ ...l, type: 'ai' as const })));
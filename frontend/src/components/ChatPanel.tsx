@@ -22,7 +22,7 @@ export const ChatPanel: React.FC = () => {
         const relevantNotes = notes
             .map((note) => {
                 let score = 0;
-                const noteText = (note.title + '\n' + note.content + '\n' + note.tags.join(' ')).toLowerCase();
+                const noteText = (note.title + '\n' + (note.content || note.summary || '') + '\n' + note.tags.join(' ')).toLowerCase();
 
                 // Strong match
                 if (query.includes(note.title.toLowerCase()) || note.title.toLowerCase().includes(query)) {
@@ -59,7 +59,7 @@ export const ChatPanel: React.FC = () => {
         // Build context
         const sources = relevantNotes.map((n) => n.title);
         const contextText = relevantNotes
-            .map((n) => `Title: ${n.title}\nContent: ${n.content}\nTags: ${n.tags.join(', ')}`)
+            .map((n) => `Title: ${n.title}\nContent: ${n.content || n.summary || ''}\nTags: ${n.tags.join(', ')}`)
             .join('\n\n---\n\n');
 
         try {
@@ -551,8 +551,9 @@ export const NoteEditor: React.FC = () => {
                             <textarea
                                 value={note.content}
                                 onChange={(e) => handleContentChange(e.target.value)}
+                                readOnly={note.contentLoaded === false}
                                 className="w-full h-full resize-none outline-none text-lg text-slate-700 leading-relaxed font-mono p-1"
-                                placeholder="开始输入内容... (支持 Markdown)"
+                                placeholder={note.contentLoaded === false ? '加载中...' : '开始输入内容... (支持 Markdown)'}
                             />
                             {note.content.length > 20 && (
                                 <button
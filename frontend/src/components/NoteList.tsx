@@ -54,7 +54,7 @@ export const NoteList: React.FC = () => {
                             )}
                         </div>
                         <p className="text-xs text-slate-400 mb-2 line-clamp-2">
-                            {note.content ? note.content.replace(/[#*`]/g, '') : '无内容...'}
+                            {note.content || note.summary ? (note.content || note.summary || '').replace(/[#*`]/g, '') : '无内容...'}
                         </p>
                         <div className="flex flex-wrap gap-1">
                             {note.tags.map((tag) => (
@@ -30,6 +30,9 @@ export interface Document {
     indexed_at?: string;
 }
 
+// List/search item: no content, and only the fields picked with `fields`
+export type DocumentSummary = Pick<Document, 'id'> & Partial<Omit<Document, 'id' | 'content'>>;
+
 export interface DocumentCreate {
     title: string;
     content: string;
@@ -87,8 +90,9 @@ export interface Tag {
 
 // Document API
 export const documentApi = {
-    list: async (skip = 0, limit = 50): Promise<{ documents: Document[]; total: number }> => {
-        const response = await apiClient.get('/api/documents', { params: { skip, limit } });
+    /** Lists never include content (use get); fields picks a subset, e.g. 'id,title,tags' */
+    list: async (skip = 0, limit = 50, fields?: string): Promise<{ documents: DocumentSummary[]; total?: number | null; next_cursor?: string | null }> => {
+        const response = await apiClient.get('/api/documents', { params: { skip, limit, fields } });
         return response.data;
     },
 
@@ -111,7 +115,7 @@ export const documentApi = {
         await apiClient.delete(`/api/documents/${id}`);
     },
 
-    search: async (query: string, limit = 10): Promise<{ documents: Document[] }> => {
+    search: async (query: string, limit = 10): Promise<{ documents: DocumentSummary[] }> => {
         const response = await apiClient.get('/api/documents/search', { params: { q: query, limit } });
         return response.data;
     },
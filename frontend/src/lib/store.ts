@@ -9,6 +9,9 @@ export interface Note {
     tags: string[];
     type: 'markdown' | 'pdf' | 'text';
     createdAt: string;
+    summary?: string;
+    // false for notes synced from a list (no body yet); see loadNoteContent
+    contentLoaded?: boolean;
 }
 
 // Chat message type
@@ -51,6 +54,7 @@ interface AppState {
 
     setNotes: (notes: Note[]) => void;
     setSelectedNoteId: (id: string | null) => void;
+    loadNoteContent: (id: string) => Promise<void>;
     setSearchQuery: (query: string) => void;
     setViewMode: (mode: 'edit' | 'preview') => void;
 
@@ -154,7 +158,30 @@ export const useAppStore = create<AppState>((set, get) => ({
     viewMode: 'edit',
 
     setNotes: (notes) => set({ notes }),
-    setSelectedNoteId: (id) => set({ selectedNoteId: id }),
+    setSelectedNoteId: (id) => {
+        set({ selectedNoteId: id });
+        if (id) {
+            get().loadNoteContent(id);
+        }
+    },
+
+    // Lists don't carry note bodies: fetch one when the note is opened
+    loadNoteContent: async (id) => {
+        const note = get().notes.find((n) => n.id === id);
+        if (!note || note.contentLoaded !== false) return;
+        try {
+            const doc = await documentApi.get(id);
+            set((state) => ({
+                notes: state.notes.map((n) =>
+                    n.id === id && n.contentLoaded === false
+                        ? { ...n, content: doc.content, summary: doc.summary, contentLoaded: true }
+                        : n
+                ),
+            }));
+        } catch (error) {
+            console.error('Failed to load note content:', error);
+        }
+    },
     setSearchQuery: (query) => set({ searchQuery: query }),
     setViewMode: (mode) => set({ viewMode: mode }),
 
@@ -311,7 +338,7 @@ export const useAppStore = create<AppState>((set, get) => ({
         return notes.filter(
             (note) =>
                 note.title.toLowerCase().includes(query) ||
-                note.content.toLowerCase().includes(query) ||
+                (note.content || note.summary || '').toLowerCase().includes(query) ||
                 note.tags.some((tag) => tag.toLowerCase().includes(query))
         );
     },
@@ -354,16 +381,26 @@ export const useAppStore = create<AppState>((set, get) => ({
     // Sync with backend
     syncNotesFromBackend: async () => {
         try {
-            const response = await documentApi.list(0, 100);
+            const response = await documentApi.list(0, 100, 'id,title,summary,tags,doc_type,created_at');
+            const loaded = new Map(
+                get().notes.filter((n) => n.contentLoaded !== false).map((n) => [n.id, n.content])
+            );
             const notes: Note[] = response.documents.map((doc) => ({
                 id: doc.id,
-                title: doc.title,
-                content: doc.content,
-                tags: doc.tags,
+                title: doc.title ?? '',
+                // Bodies are fetched per note (loadNoteContent); keep ones already loaded
+                content: loaded.get(doc.id) ?? '',
+                contentLoaded: loaded.has(doc.id),
+                summary: doc.summary,
+                tags: doc.tags ?? [],
                 type: doc.doc_type === 'pdf' ? 'pdf' : 'markdown',
-                createdAt: doc.created_at,
+                createdAt: doc.created_at ?? '',
             }));
             set({ notes });
+            const { selectedNoteId, loadNoteContent } = get();
+            if (selectedNoteId) {
+                loadNoteContent(selectedNoteId);
+            }
         } catch (error) {
             console.error('Failed to sync notes from backend:', error);
         }
@@ -376,7 +413,8 @@ export const useAppStore = create<AppState>((set, get) => ({
             if (existing) {
                 await documentApi.update(note.id, {
                     title: note.title,
-                    content: note.content,
+                    // Never overwrite the stored body with an unloaded placeholder
+                    ...(note.contentLoaded === false ? {} : { content: note.content }),
                     tags: note.tags,
                 });
             } else {
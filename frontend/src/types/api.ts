@@ -62,12 +62,17 @@ export const DocumentResponseSchema = z.object({
 });
 export type DocumentResponse = z.infer<typeof DocumentResponseSchema>;
 
+/** List/search item: never has content; only the requested fields are present */
+export const DocumentSummaryResponseSchema = DocumentResponseSchema.omit({ content: true }).partial().required({ id: true });
+export type DocumentSummaryResponse = z.infer<typeof DocumentSummaryResponseSchema>;
+
 /** Response schema for document list */
 export const DocumentListResponseSchema = z.object({
-    documents: z.array(DocumentResponseSchema),
-    total: z.number(),
+    documents: z.array(DocumentSummaryResponseSchema),
+    total: z.number().nullable().optional(),
     skip: z.number(),
     limit: z.number(),
+    next_cursor: z.string().nullable().optional(),
 });
 export type DocumentListResponse = z.infer<typeof DocumentListResponseSchema>;
 